@@ -0,0 +1,72 @@
+# alert_state.py — Deduplication of Telegram bet-signal alerts across scans.
+# Single Responsibility: decide which opportunities are worth alerting again.
+# Keyed by condition_id; a repeat is suppressed unless the price moved materially.
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from config import ALERT_PRICE_MOVE_THRESHOLD, ALERT_STATE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def _alert_key(opp: dict) -> str:
+    return opp.get("condition_id") or f"{opp.get('match')}|{opp.get('outcome')}"
+
+
+class AlertStateCache:
+    """condition_id -> (last alerted price, last alert time). Thread-safe."""
+
+    def __init__(self, move_threshold: float = ALERT_PRICE_MOVE_THRESHOLD,
+                 ttl: float = ALERT_STATE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._move_threshold = move_threshold
+        self._ttl = ttl
+        self._clock = clock
+        self._alerted: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter_new(self, opportunities: list[dict]) -> list[dict]:
+        """
+        Return the opportunities that deserve an alert (first sighting, or price
+        moved >= move_threshold since the last alert). Nothing is recorded here:
+        call mark_sent() with the ones Telegram actually delivered, so a failed
+        send is retried on the next scan instead of silencing the signal.
+        """
+        now = self._clock()
+        fresh = []
+        with self._lock:
+            self._prune(now)
+            for opp in opportunities:
+                key = _alert_key(opp)
+                price = float(opp.get("poly_prob") or 0.0)
+                previous = self._alerted.get(key)
+                if previous is not None and abs(price - previous[0]) < self._move_threshold:
+                    self.suppressed += 1
+                    continue
+                fresh.append(opp)
+        if len(fresh) < len(opportunities):
+            logger.info("Alerts: %d new, %d suppressed as repeats.", len(fresh), len(opportunities) - len(fresh))
+        return fresh
+
+    def mark_sent(self, opportunities: list[dict]) -> None:
+        """Record delivered alerts (price and time) as the baseline for repeats."""
+        now = self._clock()
+        with self._lock:
+            for opp in opportunities:
+                self._alerted[_alert_key(opp)] = (float(opp.get("poly_prob") or 0.0), now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._alerted.clear()
+
+    def _prune(self, now: float) -> None:
+        expired = [k for k, (_, ts) in self._alerted.items() if now - ts > self._ttl]
+        for k in expired:
+            del self._alerted[k]
+
+    def __len__(self) -> int:
+        return len(self._alerted)
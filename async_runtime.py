@@ -0,0 +1,440 @@
+# async_runtime.py — asyncio-native scheduler runtime (opt-in).
+# Single Responsibility: run discovery, one task per match session, the shared
+# scan loop, the dashboard, Telegram delivery and the health/metrics server as
+# cooperative tasks on one event loop, with pooled async HTTP (httpx).
+# Enable with MINUTEBID_RUNTIME=async (python scheduler.py) or `python async_runtime.py`.
+#
+# Business rules are shared with the threaded scheduler: ScheduleStore run
+# windows, scanner.filter_opportunities(), RiskManager, execution.py and the
+# dashboard renderer. Differences:
+#   - every match in its window has its own session task and RiskManager, so
+#     overlapping matches no longer wait for each other; a scan's opportunities
+#     are routed to the session of their match (no session = alert-only);
+#   - CLOB orders stay on the synchronous py-clob-client and run in worker
+#     threads (asyncio.to_thread → execution.py's bounded pool).
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlparse
+
+import bet_ledger
+import clock
+import execution
+import league_catalog
+import match_clock
+import memory_watchdog
+import polymarket_client
+import profiler
+import scanner
+import schedule_store
+import scheduler
+import shard_pool
+import state_store
+import telegram_client
+import trader
+from config import (
+    SCAN_INTERVAL_SLOW, MAX_BET_BUDGET_USD, BET_STAKE_USD, MAX_WALLET_BUDGET_USD,
+    SPORTS_WS_ENABLED, LEAGUE_CATALOG_ENABLED, MEMORY_WATCHDOG_ENABLED, BET_LEDGER_ENABLED,
+)
+from models import Opportunity, Run
+from risk_manager import RiskManager
+
+logger = logging.getLogger(__name__)
+
+_MAX_SLEEP_SLICE = 60  # Re-check the wall clock at least this often while waiting
+
+
+def _run_key(run: Run) -> tuple[str, str]:
+    return run.title, run.end_time.isoformat()
+
+
+async def sleep_until(deadline: datetime) -> None:
+    """Sleep until a wall-clock deadline, re-checking so clock jumps can't oversleep."""
+    while True:
+        remaining = (deadline - clock.now()).total_seconds()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, _MAX_SLEEP_SLICE))
+
+
+class AsyncRuntime:
+    """One event loop running every scheduler activity as a task."""
+
+    def __init__(self, discovery_interval: float = 3600, dashboard_interval: float = 600,
+                 repost_interval: float = 7200, scan_interval: float = SCAN_INTERVAL_SLOW,
+                 health_host: str = "0.0.0.0", health_port: int = 8000) -> None:
+        self.discovery_interval = discovery_interval
+        self.dashboard_interval = dashboard_interval
+        self.repost_interval = repost_interval
+        self.scan_interval = scan_interval
+        self.health_host = health_host
+        self.health_port = health_port
+        self.schedule = scheduler.new_schedule()
+        self.schedule.subscribe(self._on_schedule_change)
+        self.sessions: dict[tuple, dict] = {}          # Open sessions: key -> {"run", "risk", "moved"}
+        self._session_tasks: dict[tuple, asyncio.Task] = {}
+        self._restored_risk: dict[tuple, RiskManager] = {}
+        self.last_discovery_time = 0.0
+        self.metrics: Counter = Counter()
+        self.last_scan_ms: float | None = None
+        self.notifier = telegram_client.AsyncNotifier()
+        self.dashboard = None
+        self.health_server: asyncio.AbstractServer | None = None
+        self._stop: asyncio.Event | None = None
+        self._discover_now: asyncio.Event | None = None
+        self._sessions_changed: asyncio.Event | None = None
+        self._schedule_changed: asyncio.Event | None = None
+
+    @property
+    def runs(self) -> list[Run]:
+        return self.schedule.runs()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        """Run until stop() is called (or the task is cancelled)."""
+        self._stop = asyncio.Event()
+        self._discover_now = asyncio.Event()
+        self._sessions_changed = asyncio.Event()
+        self._schedule_changed = asyncio.Event()
+        self.notifier.install()
+        await self.start_health_server()
+        self._restore(state_store.load())
+        for run in self.schedule.runs():
+            self._start_session(run)
+
+        asyncio.create_task(asyncio.to_thread(scheduler._prewarm_trader), name="trader-prewarm")
+        if MEMORY_WATCHDOG_ENABLED:
+            scheduler._start_memory_watchdog()
+        if BET_LEDGER_ENABLED:
+            bet_ledger.start_reconciler()
+        if SPORTS_WS_ENABLED:
+            match_clock.start_feed()
+        if profiler.arm_from_env():
+            logger.info("Profiling armed from MINUTEBID_PROFILE.")
+        telegram_client.send_message("🤖 *Status Update:* Async Scheduler Started 🚀")
+
+        tasks = [
+            asyncio.create_task(self.notifier.run(), name="notifier"),
+            asyncio.create_task(self._discovery_loop(), name="discovery"),
+            asyncio.create_task(self._scan_loop(), name="scan"),
+            asyncio.create_task(self._dashboard_loop(), name="dashboard"),
+        ]
+        try:
+            await self._stop.wait()
+        finally:
+            for task in tasks + list(self._session_tasks.values()):
+                task.cancel()
+            await asyncio.gather(*tasks, *self._session_tasks.values(), return_exceptions=True)
+            self._persist()
+            try:
+                await asyncio.wait_for(self.notifier.drain(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("%d Telegram messages undelivered at shutdown.", self.notifier.pending)
+            self.notifier.uninstall()
+            await self.notifier.aclose()
+            await polymarket_client.aclose_async_client()
+            if self.health_server is not None:
+                self.health_server.close()
+                await self.health_server.wait_closed()
+            match_clock.stop_feed()
+            memory_watchdog.stop()
+            shard_pool.shutdown()
+            bet_ledger.shutdown()
+            logger.info("Async runtime exited.")
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+
+    # ------------------------------------------------------------------
+    # Discovery and per-match sessions
+    # ------------------------------------------------------------------
+
+    async def _discovery_loop(self) -> None:
+        while True:
+            wait = self.discovery_interval - (clock.time() - self.last_discovery_time)
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._discover_now.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+            self._discover_now.clear()
+            try:
+                await self.discover()
+            except Exception as e:
+                logger.error("Discovery failed: %s", e)
+                self.last_discovery_time = clock.time()  # Retry on the normal cadence
+
+    async def discover(self) -> None:
+        if LEAGUE_CATALOG_ENABLED:
+            try:
+                await asyncio.to_thread(league_catalog.refresh_if_stale)
+            except Exception as e:
+                logger.error("League catalog refresh failed: %s", e)
+        matches = await polymarket_client.aget_soccer_schedule()
+        changes = self.schedule.apply(matches)
+        self.last_discovery_time = clock.time()
+        self.metrics["discoveries"] += 1
+        logger.info("Discovery cycle complete. %d matches scheduled (%s).",
+                    len(self.schedule), schedule_store.summarize(changes))
+        self._persist()
+
+    def _on_schedule_change(self, changes: list) -> None:
+        """Start, reschedule or drop session tasks for the matches that changed, then wake the dashboard."""
+        for change in changes:
+            if change.kind in ("moved", "updated") and _run_key(change.previous) in self.sessions:
+                # Open session: same task, RiskManager and budget, now following the new window
+                self._rekey_session(change.previous, change.run)
+                continue
+            if change.kind in ("moved", "cancelled", "updated"):
+                old = change.previous or change.run
+                task = self._session_tasks.get(_run_key(old))
+                # An open session keeps running; only a task still waiting for its window is replaced
+                if task is not None and _run_key(old) not in self.sessions:
+                    task.cancel()
+                    self._session_tasks.pop(_run_key(old), None)
+            if change.kind in ("added", "moved", "updated"):
+                self._start_session(change.run)
+        if self._schedule_changed is not None:
+            self._schedule_changed.set()
+
+    def _rekey_session(self, old: Run, new: Run) -> None:
+        old_key, new_key = _run_key(old), _run_key(new)
+        session = self.sessions.pop(old_key)
+        session["run"] = new
+        self.sessions[new_key] = session
+        task = self._session_tasks.pop(old_key, None)
+        if task is not None:
+            self._session_tasks[new_key] = task
+        session["moved"].set()
+        logger.info("Open session for %s now ends %s.", new.title, new.end_time.isoformat())
+        self._persist()
+
+    def _start_session(self, run: Run) -> None:
+        key = _run_key(run)
+        if key not in self._session_tasks:
+            self._session_tasks[key] = asyncio.create_task(self._session(run), name=f"session:{run.title}")
+
+    async def _session(self, run: Run) -> None:
+        """Wait for the match window, hold a RiskManager through it, then close."""
+        session = {"run": run}
+        try:
+            await sleep_until(run.wakeup_time)
+            if clock.now() >= run.end_time:
+                return
+            key = _run_key(run)
+            risk = self._restored_risk.pop(key, None)
+            if risk is not None:
+                logger.info("!!! RESUMING session for match: %s (spent $%.2f, %d tokens placed)",
+                            run.title, risk.spent, risk.bets_placed)
+                telegram_client.send_status_update(f"Resuming session: {run.title} 🏟")
+            else:
+                logger.info("!!! WAKING UP for match: %s", run.title)
+                telegram_client.send_status_update(f"Waking up for: {run.title} 🏟")
+                risk = RiskManager(max_budget=MAX_BET_BUDGET_USD, stake_per_bet=BET_STAKE_USD,
+                                   ledger=scheduler._session_ledger(), session=bet_ledger.session_id(run),
+                                   wallet_budget=MAX_WALLET_BUDGET_USD)
+            session.update(risk=risk, moved=asyncio.Event())
+            self.sessions[key] = session
+            self.metrics["sessions"] += 1
+            self._sessions_changed.set()
+            self._persist()
+            await self._hold(session)
+            logger.info("Session finished for %s.", session["run"].title)
+        finally:
+            # session["run"] is the latest window if a kickoff move re-keyed this session
+            key = _run_key(session["run"])
+            self.sessions.pop(key, None)
+            self._session_tasks.pop(key, None)
+            self._sessions_changed.set()
+        self._discover_now.set()  # Re-run discovery after a session, as the threaded loop does
+
+    @staticmethod
+    async def _hold(session: dict) -> None:
+        """Sleep until the session's end_time, following kickoff moves (session["moved"])."""
+        while True:
+            remaining = (session["run"].end_time - clock.now()).total_seconds()
+            if remaining <= 0:
+                return
+            session["moved"].clear()
+            try:
+                await asyncio.wait_for(session["moved"].wait(), timeout=min(remaining, _MAX_SLEEP_SLICE))
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Shared scan loop
+    # ------------------------------------------------------------------
+
+    async def _scan_loop(self) -> None:
+        while True:
+            if not self.sessions:
+                self._sessions_changed.clear()
+                await self._sessions_changed.wait()
+                continue
+            try:
+                with profiler.scan():
+                    await self.scan_once()
+            except Exception as e:
+                logger.error("Error during scan session: %s", e)
+            self._persist()
+            await asyncio.sleep(self.scan_interval)
+
+    async def scan_once(self) -> list[str]:
+        """One scan: async Gamma fetch, filter, then per-session execution in worker threads."""
+        started = time.perf_counter()
+        pool = await asyncio.to_thread(shard_pool.get_pool)
+        if pool is not None:
+            opportunities = await asyncio.to_thread(pool.scan, match_clock.get_game_states())
+        else:
+            events, prices = await polymarket_client.aget_active_soccer_events()
+            opportunities = scanner.filter_opportunities(events, prices, match_clock.get_game_states())
+
+        betting_active = trader.is_credentials_configured()
+        by_title = {key[0]: session for key, session in self.sessions.items()}
+        groups: dict[str | None, list[Opportunity]] = {}
+        for opp in opportunities:
+            title = opp.match if opp.match in by_title else None
+            groups.setdefault(title, []).append(opp)
+
+        jobs = []
+        for title, opps in groups.items():
+            risk = by_title[title]["risk"] if title is not None and betting_active else None
+            jobs.append(asyncio.to_thread(execution.execute_opportunities, opps, risk))
+        results = [status for group in await asyncio.gather(*jobs) for status in group]
+
+        self.metrics["scans"] += 1
+        self.metrics.update(results)
+        self.last_scan_ms = round((time.perf_counter() - started) * 1000, 1)
+        return results
+
+    # ------------------------------------------------------------------
+    # Dashboard
+    # ------------------------------------------------------------------
+
+    async def _dashboard_loop(self) -> None:
+        self.dashboard = telegram_client.DashboardRenderer()
+        last_repost = 0.0
+        while True:
+            now_ts = clock.time()
+            force_new = now_ts - last_repost > self.repost_interval
+            try:
+                self.schedule.expire()
+                self._schedule_changed.clear()
+                await self.dashboard.apush(self.runs, self.notifier, force_new=force_new)
+                if force_new:
+                    last_repost = now_ts
+            except Exception as e:
+                logger.error("Dashboard update failed: %s", e)
+            try:
+                # Schedule changes push at once; otherwise refresh countdowns on the interval
+                await asyncio.wait_for(self._schedule_changed.wait(), timeout=self.dashboard_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Health / metrics server
+    # ------------------------------------------------------------------
+
+    async def start_health_server(self) -> None:
+        self.health_server = await asyncio.start_server(self._handle_http, self.health_host, self.health_port)
+        port = self.health_server.sockets[0].getsockname()[1]
+        self.health_port = port
+        logger.info("Health check server listening on port %d (asyncio)", port)
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=10)
+            while (await asyncio.wait_for(reader.readline(), timeout=10)) not in (b"\r\n", b"\n", b""):
+                pass  # Headers are not needed
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2:
+                return
+            method, target = parts[0].upper(), parts[1]
+            if urlparse(target).path == "/metrics" and method == "GET":
+                status, content_type, body = 200, "application/json", json.dumps(self.metrics_snapshot()).encode()
+            else:
+                status, content_type, body = scheduler.route_http("GET" if method == "HEAD" else method, target)
+            head = (f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n")
+            writer.write(head.encode("latin-1") + (b"" if method == "HEAD" else body))
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def metrics_snapshot(self) -> dict:
+        return {
+            "scheduled_runs": len(self.runs),
+            "session_tasks": len(self._session_tasks),
+            "open_sessions": [key[0] for key in self.sessions],
+            "last_scan_ms": self.last_scan_ms,
+            "counters": dict(self.metrics),
+            "notifier": {"pending": self.notifier.pending, "sent": self.notifier.sent,
+                         "failed": self.notifier.failed},
+            "tasks": len(asyncio.all_tasks()),
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence (same state_store snapshot, one entry per open session)
+    # ------------------------------------------------------------------
+
+    def _persist(self) -> None:
+        try:
+            state_store.save({
+                "last_discovery_time": self.last_discovery_time,
+                "runs": [state_store.encode_run(r) for r in self.runs],
+                "sessions": [{**state_store.encode_run(s["run"]), "risk": s["risk"].snapshot()}
+                             for s in self.sessions.values()],
+                "resolved_tokens": polymarket_client.resolved_tokens(),
+            })
+        except OSError as e:
+            logger.error("Could not save scheduler state: %s", e)
+
+    def _restore(self, state: dict | None) -> None:
+        """Reload the schedule and open sessions' RiskManagers (also reads the threaded loop's snapshot)."""
+        if not state:
+            return
+        sessions = state.get("sessions")
+        if sessions is None:
+            sessions = [state["session"]] if state.get("session") else []
+        try:
+            now = clock.now()
+            runs = [Run.from_dict(state_store.decode_run(r)) for r in state.get("runs", [])]
+            runs = sorted((r for r in runs if r.end_time > now), key=lambda r: r.wakeup_time)
+            restored_risk = {}
+            for session in sessions:
+                run = Run.from_dict(state_store.decode_run(session))
+                if run.end_time > now:
+                    restored_risk[_run_key(run)] = RiskManager.restore(session["risk"], ledger=scheduler._session_ledger())
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("State snapshot unusable, starting fresh: %s", e)
+            return
+        polymarket_client.seed_resolved_tokens(state.get("resolved_tokens", {}))
+        self.schedule.restore(runs, now)
+        self._restored_risk = restored_risk
+        if runs:
+            logger.info("Restored %d scheduled matches from state snapshot.", len(runs))
+
+
+def main() -> None:
+    """Entry point: run the async runtime until interrupted."""
+    runtime = AsyncRuntime()
+    try:
+        asyncio.run(runtime.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    import main as _main
+    _main.setup_logging()
+    main()
@@ -0,0 +1,25 @@
+# bench_harness.py — Shared plumbing for the offline simulation and benchmarks.
+# Single Responsibility: temporary module-attribute overrides that wire the bot
+# to stand-ins for a run (percentiles live in latency_stats.py).
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+
+@contextmanager
+def overrides(patches: Iterable[tuple[object, str, object]]) -> Iterator[None]:
+    """
+    Set each (target, name, value) attribute for the duration of the block and
+    restore the originals on exit (in reverse order, even on error).
+    The attribute must already exist — a typo fails loudly instead of adding one.
+    """
+    saved = []
+    try:
+        for target, name, value in patches:
+            original = getattr(target, name)
+            saved.append((target, name, original))
+            setattr(target, name, value)
+        yield
+    finally:
+        for target, name, original in reversed(saved):
+            setattr(target, name, original)
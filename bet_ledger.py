@@ -0,0 +1,481 @@
+# bet_ledger.py — Durable, queryable history of every bet attempt.
+# Single Responsibility: persist orders to an embedded SQLite (WAL) database off the
+# order hot path, answer indexed lookups (cross-session duplicate guard, "what did we
+# bet on today"), and fold in fills / resolutions pulled in batches by the Reconciler.
+# Run: `python bet_ledger.py [--since 2026-03-01] [--match "Arsenal"] [--reconcile]`
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import clock
+from config import (
+    BET_LEDGER_FILE,
+    BET_RECONCILE_SECONDS,
+    BET_RECONCILE_BATCH,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bets (
+    id            INTEGER PRIMARY KEY,
+    placed_at     TEXT NOT NULL,   -- UTC ISO-8601, sorts chronologically
+    session       TEXT,
+    wallet        TEXT,            -- order_router wallet name (NULL = single account)
+    match         TEXT NOT NULL,
+    outcome       TEXT,
+    minute        INTEGER,
+    condition_id  TEXT,
+    token_id      TEXT NOT NULL,
+    price         REAL,            -- Gamma bestAsk that triggered the signal
+    stake         REAL NOT NULL,
+    status        TEXT NOT NULL,   -- placed | failed
+    order_id      TEXT,
+    error         TEXT,
+    filled_shares REAL,
+    fill_price    REAL,
+    fill_status   TEXT,            -- order response status, then CLOB trade status
+    resolution    TEXT,            -- won | lost | split (NULL = market still open)
+    payout        REAL,
+    reconciled_at TEXT
+);
+CREATE INDEX IF NOT EXISTS bets_token ON bets(token_id, status);
+CREATE INDEX IF NOT EXISTS bets_condition ON bets(condition_id);
+CREATE INDEX IF NOT EXISTS bets_match ON bets(match, placed_at);
+CREATE INDEX IF NOT EXISTS bets_session ON bets(session);
+CREATE INDEX IF NOT EXISTS bets_wallet ON bets(wallet, placed_at);
+CREATE INDEX IF NOT EXISTS bets_open ON bets(status, resolution);
+CREATE INDEX IF NOT EXISTS bets_placed_at ON bets(placed_at);
+"""
+# user_version -> (column it adds, DDL); versions without an entry changed nothing to migrate
+_MIGRATIONS = {
+    2: ("wallet", "ALTER TABLE bets ADD COLUMN wallet TEXT"),  # Multi-wallet routing
+}
+_INSERT = """
+INSERT INTO bets (placed_at, session, wallet, match, outcome, minute, condition_id, token_id, price, stake,
+                  status, order_id, error, filled_shares, fill_price, fill_status)
+VALUES (:placed_at, :session, :wallet, :match, :outcome, :minute, :condition_id, :token_id, :price, :stake,
+        :status, :order_id, :error, :filled_shares, :fill_price, :fill_status)
+"""
+_APPLY_FILL = """
+UPDATE bets SET filled_shares = ?, fill_price = ?, fill_status = ?, reconciled_at = ?
+WHERE order_id = ?
+"""
+_APPLY_RESOLUTION = """
+UPDATE bets SET resolution = ?, payout = COALESCE(filled_shares, 0) * ?, reconciled_at = ?
+WHERE token_id = ? AND status = 'placed' AND resolution IS NULL
+"""
+_STOP = object()
+
+
+def session_id(run) -> str:
+    """Stable id for one match session (a models.Run): title plus end time."""
+    return f"{run.title} @ {run.end_time.astimezone(timezone.utc):%Y-%m-%dT%H:%MZ}"
+
+
+def _fill_from_response(response: dict | None) -> tuple[float | None, float | None]:
+    """(shares, avg price) from a CLOB / paper order response (makingAmount = USDC, takingAmount = shares)."""
+    try:
+        spent, shares = float(response["makingAmount"]), float(response["takingAmount"])
+    except (KeyError, TypeError, ValueError):
+        return None, None
+    return shares, (round(spent / shares, 6) if shares else None)
+
+
+class BetLedger:
+    """
+    SQLite ledger with a single writer thread. record() / apply_*() only enqueue;
+    the writer commits whatever is queued in one transaction. Reads use one
+    connection per thread and, thanks to WAL, never wait for the writer.
+    """
+
+    def __init__(self, path: str = BET_LEDGER_FILE) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: dict[str, int] = {}  # token_id -> placed bets queued but not yet committed
+        self._pending_lock = threading.Lock()
+        self.written = 0
+        self._migrate(self._connect())
+        self._writer = threading.Thread(target=self._write_loop, name="bet-ledger", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")  # Durable at each checkpoint; WAL survives a process crash
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Create the schema, or bring a ledger written by an older version up to date."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'bets'").fetchone()
+        if exists:
+            # user_version 0 = never stamped: apply whatever columns are missing
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(bets)")}
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                migration = _MIGRATIONS.get(target)
+                if migration is not None and migration[0] not in columns:
+                    conn.execute(migration[1])
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ------------------------------------------------------------------
+    # Writes (non-blocking)
+    # ------------------------------------------------------------------
+
+    def record(self, opp, token_id: str, stake: float, status: str, session: str | None = None,
+               wallet: str | None = None, response: dict | None = None, error: str | None = None) -> None:
+        """Queue one order attempt (status "placed" or "failed") for the writer thread."""
+        shares, fill_price = _fill_from_response(response)
+        row = {
+            "placed_at": clock.now().astimezone(timezone.utc).isoformat(),
+            "session": session,
+            "wallet": wallet,
+            "match": opp.get("match", ""),
+            "outcome": opp.get("outcome"),
+            "minute": opp.get("minute"),
+            "condition_id": opp.get("condition_id"),
+            "token_id": token_id,
+            "price": opp.get("poly_prob"),
+            "stake": stake,
+            "status": status,
+            "order_id": (response or {}).get("orderID") or None,
+            "error": error,
+            "filled_shares": shares,
+            "fill_price": fill_price,
+            "fill_status": (response or {}).get("status"),
+        }
+        if status == "placed":
+            with self._pending_lock:
+                self._pending[token_id] = self._pending.get(token_id, 0) + 1
+        self._queue.put((_INSERT, [row], token_id if status == "placed" else None))
+
+    def apply_fills(self, fills: dict[str, tuple[float, float | None, str]]) -> None:
+        """order_id -> (shares, avg price, CLOB trade status)."""
+        now = clock.now().astimezone(timezone.utc).isoformat()
+        rows = [(shares, price, status, now, order_id) for order_id, (shares, price, status) in fills.items()]
+        if rows:
+            self._queue.put((_APPLY_FILL, rows, None))
+
+    def apply_resolutions(self, settlements: dict[str, float]) -> None:
+        """token_id -> final price of that token (1.0 won, 0.0 lost, anything else a split)."""
+        now = clock.now().astimezone(timezone.utc).isoformat()
+        rows = [("won" if price >= 1 else "lost" if price <= 0 else "split", price, now, token_id)
+                for token_id, price in settlements.items()]
+        if rows:
+            self._queue.put((_APPLY_RESOLUTION, rows, None))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything queued so far is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [item for item in batch if isinstance(item, tuple)]
+            if writes:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for sql, rows, _token in writes:
+                        conn.executemany(sql, rows)
+                    conn.execute("COMMIT")
+                    self.written += sum(len(rows) for sql, rows, _ in writes if sql is _INSERT)
+                except sqlite3.Error as e:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    logger.error("Bet ledger write failed (%d batched writes lost): %s", len(writes), e)
+                with self._pending_lock:
+                    for _sql, _rows, token_id in writes:
+                        if token_id is not None:
+                            self._pending[token_id] -= 1
+                            if not self._pending[token_id]:
+                                del self._pending[token_id]
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is _STOP for item in batch):
+                conn.close()
+                return
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Commit everything queued, then stop the writer."""
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and threading.current_thread() is not self._writer:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def has_bet(self, token_id: str) -> bool:
+        """True if any session ever placed a bet on token_id (queued writes included)."""
+        with self._pending_lock:
+            if token_id in self._pending:
+                return True
+        row = self._connect().execute(
+            "SELECT 1 FROM bets WHERE token_id = ? AND status = 'placed' LIMIT 1", (token_id,)).fetchone()
+        return row is not None
+
+    def bets(self, since: datetime | None = None, match: str | None = None, session: str | None = None,
+             token_id: str | None = None, condition_id: str | None = None,
+             wallet: str | None = None) -> list[dict]:
+        """Bet attempts, oldest first. `match` is a case-insensitive substring."""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("placed_at >= ?")
+            params.append(since.astimezone(timezone.utc).isoformat())
+        for column, value in (("session", session), ("wallet", wallet), ("token_id", token_id),
+                              ("condition_id", condition_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if match is not None:
+            clauses.append("match LIKE ?")
+            params.append(f"%{match}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(f"SELECT * FROM bets {where} ORDER BY placed_at, id", params)
+        return [dict(r) for r in rows]
+
+    def open_bets(self) -> list[dict]:
+        """Placed bets whose market has not been settled yet."""
+        rows = self._connect().execute(
+            "SELECT * FROM bets WHERE status = 'placed' AND resolution IS NULL ORDER BY placed_at, id")
+        return [dict(r) for r in rows]
+
+    def summary(self, since: datetime | None = None) -> dict:
+        """Totals over bets placed since `since` (all time when None)."""
+        where, params = ("WHERE placed_at >= ?", [since.astimezone(timezone.utc).isoformat()]) if since else ("", [])
+        row = self._connect().execute(f"""
+            SELECT COUNT(*) AS attempts,
+                   COALESCE(SUM(status = 'placed'), 0) AS placed,
+                   COALESCE(SUM(status = 'failed'), 0) AS failed,
+                   COALESCE(SUM(CASE WHEN status = 'placed' THEN stake END), 0) AS staked,
+                   COALESCE(SUM(status = 'placed' AND resolution IS NULL), 0) AS open,
+                   COALESCE(SUM(resolution = 'won'), 0) AS won,
+                   COALESCE(SUM(resolution = 'lost'), 0) AS lost,
+                   COALESCE(SUM(resolution = 'split'), 0) AS split,
+                   COALESCE(SUM(payout), 0) AS payout,
+                   COALESCE(SUM(CASE WHEN resolution IS NOT NULL THEN payout - stake END), 0) AS pnl
+            FROM bets {where}""", params).fetchone()
+        return {k: (round(row[k], 2) if isinstance(row[k], float) else row[k]) for k in row.keys()}
+
+
+# ---------------------------------------------------------------------------
+# Reconciler — batched fills (CLOB trades) and resolutions (Gamma /markets)
+# ---------------------------------------------------------------------------
+
+def _trade_fills(trades: list[dict], order_ids: set[str]) -> dict[str, tuple[float, float | None, str]]:
+    """Aggregate CLOB trades per taker order: total shares, size-weighted price, latest status."""
+    totals: dict[str, list] = {}
+    for trade in trades:
+        order_id = trade.get("taker_order_id")
+        if order_id not in order_ids:
+            continue
+        try:
+            size, price = float(trade["size"]), float(trade["price"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        entry = totals.setdefault(order_id, [0.0, 0.0, None])
+        entry[0] += size
+        entry[1] += size * price
+        entry[2] = str(trade.get("status") or "").upper() or entry[2]
+    return {oid: (round(s, 6), round(n / s, 6) if s else None, status) for oid, (s, n, status) in totals.items()}
+
+
+def _settlement_price(market: dict, token_id: str) -> float | None:
+    """Final price of token_id in a closed Gamma market, or None while it is still trading / disputed."""
+    if not market.get("closed"):
+        return None
+    try:
+        prices = market.get("outcomePrices")
+        prices = [float(p) for p in (json.loads(prices) if isinstance(prices, str) else prices)]
+        token_ids = market.get("clobTokenIds") or []
+        token_ids = json.loads(token_ids) if isinstance(token_ids, str) else token_ids
+    except (TypeError, ValueError):
+        return None
+    index = token_ids.index(token_id) if token_id in token_ids else 0  # Bets are on the YES token
+    if index >= len(prices):
+        return None
+    price = prices[index]
+    if market.get("umaResolutionStatus") not in (None, "resolved") and price not in (0.0, 1.0):
+        return None
+    return price
+
+
+class Reconciler:
+    """
+    Periodically settles open ledger rows. One paged CLOB /data/trades call
+    covers every unconfirmed fill; resolutions come from Gamma /markets in
+    chunks of BET_RECONCILE_BATCH condition ids (the public CLOB has no
+    multi-market lookup), instead of one request per bet.
+    """
+
+    def __init__(self, ledger: BetLedger, interval: float = BET_RECONCILE_SECONDS,
+                 batch: int = BET_RECONCILE_BATCH, fetch_trades=None, fetch_markets=None) -> None:
+        self.ledger = ledger
+        self.interval = interval
+        self.batch = batch
+        self._fetch_trades = fetch_trades
+        self._fetch_markets = fetch_markets
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_result: dict | None = None
+
+    def _trades(self, after: int) -> list[dict]:
+        if self._fetch_trades is not None:
+            return self._fetch_trades(after)
+        import trader
+        return trader.get_trades(after)
+
+    def _markets(self, condition_ids: list[str]) -> list[dict]:
+        if self._fetch_markets is not None:
+            return self._fetch_markets(condition_ids)
+        import polymarket_client
+        return polymarket_client.get_markets(condition_ids)
+
+    def reconcile_once(self) -> dict:
+        """One pass over open bets. Returns counts of requests made and rows updated."""
+        result = {"open": 0, "requests": 0, "fills": 0, "resolved": 0}
+        open_bets = self.ledger.open_bets()
+        result["open"] = len(open_bets)
+        if not open_bets:
+            self.last_result = result
+            return result
+
+        unconfirmed = {b["order_id"]: b for b in open_bets if b["order_id"] and b["fill_status"] != "CONFIRMED"}
+        if unconfirmed:
+            oldest = min(datetime.fromisoformat(b["placed_at"]) for b in unconfirmed.values())
+            trades = self._trades(int(oldest.timestamp()) - 60)
+            result["requests"] += 1
+            fills = _trade_fills(trades or [], set(unconfirmed))
+            self.ledger.apply_fills(fills)
+            result["fills"] = len(fills)
+
+        by_condition: dict[str, list[str]] = {}
+        for bet in open_bets:
+            if bet["condition_id"]:
+                by_condition.setdefault(bet["condition_id"], []).append(bet["token_id"])
+        condition_ids = sorted(by_condition)
+        settlements: dict[str, float] = {}
+        for start in range(0, len(condition_ids), self.batch):
+            markets = self._markets(condition_ids[start:start + self.batch]) or []
+            result["requests"] += 1
+            for market in markets:
+                for token_id in by_condition.get(market.get("conditionId"), []):
+                    price = _settlement_price(market, token_id)
+                    if price is not None:
+                        settlements[token_id] = price
+        self.ledger.apply_resolutions(settlements)
+        result["resolved"] = len(settlements)
+        self.ledger.flush()
+        logger.info("Bet ledger reconciled: %s", result)
+        self.last_result = result
+        return result
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reconcile_once()
+            except Exception as e:
+                logger.error("Bet reconciliation failed: %s", e)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bet-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+# ---------------------------------------------------------------------------
+# Process-wide ledger used by scheduler.py / async_runtime.py
+# ---------------------------------------------------------------------------
+_ledger: BetLedger | None = None
+_reconciler: Reconciler | None = None
+_lock = threading.Lock()
+
+
+def get_ledger() -> BetLedger:
+    """The process-wide ledger (opened on first use)."""
+    global _ledger
+    with _lock:
+        if _ledger is None:
+            _ledger = BetLedger()
+        return _ledger
+
+
+def start_reconciler() -> Reconciler:
+    global _reconciler
+    ledger = get_ledger()
+    with _lock:
+        if _reconciler is None:
+            _reconciler = Reconciler(ledger)
+        _reconciler.start()
+        return _reconciler
+
+
+def shutdown() -> None:
+    """Stop the reconciler and commit queued writes."""
+    global _ledger, _reconciler
+    with _lock:
+        if _reconciler is not None:
+            _reconciler.stop()
+            _reconciler = None
+        if _ledger is not None:
+            _ledger.close()
+            _ledger = None
+
+
+if __name__ == "__main__":
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Query the bet ledger.")
+    parser.add_argument("--since", help="UTC date or ISO time, e.g. 2026-03-01")
+    parser.add_argument("--match", help="Substring of the match title")
+    parser.add_argument("--reconcile", action="store_true", help="Pull fills / resolutions first")
+    args = parser.parse_args()
+    if not os.path.exists(BET_LEDGER_FILE):
+        raise SystemExit(f"No ledger at {BET_LEDGER_FILE}")
+    since = datetime.fromisoformat(args.since) if args.since else None
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    ledger = get_ledger()
+    if args.reconcile:
+        from dotenv import load_dotenv
+        load_dotenv()
+        print(Reconciler(ledger).reconcile_once())
+    columns = ("placed_at", "match", "outcome", "minute", "price", "stake", "status",
+               "filled_shares", "fill_price", "resolution", "payout")
+    print(tabulate([[b[c] for c in columns] for b in ledger.bets(since=since, match=args.match)], headers=columns))
+    print(tabulate(ledger.summary(since).items(), headers=["Total", "Value"]))
+    shutdown()
@@ -0,0 +1,100 @@
+# clock.py — Injectable wall clock for the scheduler, scanner and dashboard.
+# Single Responsibility: answer "what time is it?" and "wait N seconds" in one place.
+# Production uses SystemClock; simulation.py installs a VirtualClock so a whole
+# weekend of matches runs in accelerated virtual time.
+# Monotonic timers for real-world rate limits (Telegram, HTTP retries, caches)
+# deliberately stay on time.monotonic and are not routed through here.
+
+import threading
+import time as _time
+from datetime import datetime, timedelta, timezone
+
+
+class SystemClock:
+    """Real UTC wall clock."""
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def time(self) -> float:
+        return _time.time()
+
+    def sleep(self, seconds: float) -> None:
+        _time.sleep(seconds)
+
+
+class SimulationFinished(BaseException):
+    """Raised by VirtualClock.sleep() once virtual time reaches stop_at.
+    BaseException so the scheduler's crash handler does not treat it as a crash."""
+
+
+class VirtualClock:
+    """
+    Manually driven clock. sleep() returns immediately after moving virtual
+    time forward, so loops that sleep between iterations run as fast as the CPU allows.
+    """
+
+    def __init__(self, start: datetime, stop_at: datetime | None = None) -> None:
+        if start.tzinfo is None:
+            raise ValueError("VirtualClock start must be timezone-aware")
+        self._now = start
+        self._stop_at = stop_at
+        self._lock = threading.Lock()
+        self.sleeps = 0
+        self.slept_seconds = 0.0
+
+    def now(self) -> datetime:
+        with self._lock:
+            return self._now
+
+    def time(self) -> float:
+        return self.now().timestamp()
+
+    def advance(self, seconds: float) -> datetime:
+        """Move virtual time forward without counting it as a sleep."""
+        with self._lock:
+            self._now += timedelta(seconds=seconds)
+            return self._now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps += 1
+            target = self._now + timedelta(seconds=max(seconds, 0))
+            if self._stop_at is not None and target >= self._stop_at:
+                self.slept_seconds += max((self._stop_at - self._now).total_seconds(), 0)
+                self._now = max(self._now, self._stop_at)
+                raise SimulationFinished()
+            self.slept_seconds += max(seconds, 0)
+            self._now = target
+
+
+# ---------------------------------------------------------------------------
+# Process-wide clock used by scheduler.py, scanner.py, match_clock.py,
+# polymarket_client.py and the Telegram dashboard
+# ---------------------------------------------------------------------------
+_clock = SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(new_clock) -> object:
+    """Install a clock (SystemClock / VirtualClock). Returns the previous one."""
+    global _clock
+    previous, _clock = _clock, new_clock
+    return previous
+
+
+def now() -> datetime:
+    """Current UTC datetime."""
+    return _clock.now()
+
+
+def time() -> float:
+    """Current epoch seconds."""
+    return _clock.time()
+
+
+def sleep(seconds: float) -> None:
+    _clock.sleep(seconds)
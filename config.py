@@ -1,6 +1,12 @@
 # config.py — All configurable constants for the Minutebid scanner.
 # No business logic here. Change thresholds without touching other files.
 
+import os
+
+# Directory for state that must survive restarts / redeploys. On Fly this is the
+# volume mounted by fly.toml [mounts] (MINUTEBID_DATA_DIR=/data); locally the working dir.
+DATA_DIR = os.getenv("MINUTEBID_DATA_DIR", "")
+
 # ---------------------------------------------------------------------------
 # Polymarket API endpoints (public, no auth required)
 # ---------------------------------------------------------------------------
@@ -23,6 +29,18 @@ LEAGUE_TAG_SLUGS = {
     'europa_league': 'uel',
 }
 
+# ---------------------------------------------------------------------------
+# League catalog (automatic discovery beyond the hard-coded leagues above)
+# ---------------------------------------------------------------------------
+LEAGUE_CATALOG_ENABLED = True
+LEAGUE_CATALOG_FILE = os.path.join(DATA_DIR, ".league_catalog.json")  # On the volume: no rediscovery per boot
+LEAGUE_CATALOG_REFRESH_HOURS = 24      # Rediscover soccer series once a day
+LEAGUE_CATALOG_REQUEST_BUDGET = 10     # Max Gamma requests per catalog refresh
+LEAGUE_CATALOG_MAX_LEAGUES = 100       # Monitor at most this many discovered leagues (top by liquidity)
+LEAGUE_CATALOG_MIN_LIQUIDITY = 0.0     # Drop discovered series below this liquidity (USDC)
+SOCCER_TAG_ID = "100350"               # Gamma tag id carried by every soccer sport in /sports
+GAMMA_FETCH_WORKERS = 8                # Leagues fetched concurrently per discovery / scan
+
 # ---------------------------------------------------------------------------
 # Filter thresholds
 # ---------------------------------------------------------------------------
@@ -32,6 +50,9 @@ WIN_PROB_THRESHOLD = 0.80  # Minimum Polymarket implied probability to surface a
 MAX_WIN_PROB_THRESHOLD = 0.97  # Exclude near-resolved markets (CLOB suspends trading above this)
 MAX_SCHEDULE_HOURS = 48    # Only monitor matches starting within this window
 SCAN_INTERVAL_SLOW = 120   # 2-minute "Slow Pulse" interval during active monitoring
+SCAN_OVERRUN_POLICY = "skip"  # Ticks missed by a slow scan: "skip" = wait for the next slot, "merge" = one catch-up scan now
+SCHEDULER_STATE_FILE = os.path.join(DATA_DIR, ".scheduler_state.json")  # Snapshot for instant resume after restarts
+RUNTIME = "threads"        # "threads" = scheduler.run_scheduler_loop, "async" = async_runtime.py (env MINUTEBID_RUNTIME)
 
 # ---------------------------------------------------------------------------
 # Betting configuration (Session 17 — Automatic Betting)
@@ -40,11 +61,106 @@ MAX_BET_BUDGET_USD = 5.0    # Maximum USDC to spend per game session (hard cap)
 BET_STAKE_USD = 1.0         # Fixed stake per bet in USDC
 CLOB_HOST = "https://clob.polymarket.com"
 CLOB_CHAIN_ID = 137         # Polygon mainnet
+ORDER_WORKERS = 4           # Max concurrent order placements per scan (bounded pool)
+MAX_WALLET_BUDGET_USD = 5.0 # Per-wallet cap within a session; MAX_BET_BUDGET_USD still caps the total
+
+# ---------------------------------------------------------------------------
+# Multi-wallet order routing (see order_router.py). Extra credential sets are
+# read from CLOB_PK_2 / CLOB_API_KEY_2 / ... (suffix _2 up to CLOB_MAX_WALLETS).
+# ---------------------------------------------------------------------------
+CLOB_MAX_WALLETS = 8
+CLOB_ORDER_RATE_PER_SECOND = 5.0       # Sustained orders/s per API key (well under the CLOB POST /order limit)
+CLOB_ORDER_BURST = 10                  # Orders one key may send back-to-back before throttling
+CLOB_WALLET_MAX_IN_FLIGHT = 2          # Concurrent orders per key
+CLOB_RATE_LIMIT_COOLDOWN_SECONDS = 10  # A key answered with HTTP 429 is rested this long
+
+# ---------------------------------------------------------------------------
+# Execution backend (trader.place_order). Override with MINUTEBID_EXECUTION_BACKEND.
+# ---------------------------------------------------------------------------
+EXECUTION_BACKEND = "live"     # "live" = real CLOB, "paper" = paper_trading.PaperTradingBackend
+PAPER_LATENCY_MS = 50          # Simulated order round-trip
+PAPER_LATENCY_JITTER_MS = 20   # Uniform +/- jitter on top of PAPER_LATENCY_MS
+PAPER_BOOK_FILE = ""           # Recorded order books (JSON); empty = synthetic books
+PAPER_SYNTHETIC_PRICE = 0.85   # Best ask of synthetic books
+PAPER_SYNTHETIC_DEPTH_USD = 50.0  # USDC of asks per synthetic price level (5 levels, 1¢ apart)
+PAPER_LEDGER_FILE = "paper_fills.jsonl"  # Append-only fill ledger; empty = memory only
+
+# ---------------------------------------------------------------------------
+# Telegram dashboard and alerts
+# ---------------------------------------------------------------------------
+DASHBOARD_MIN_EDIT_INTERVAL_SECONDS = 5  # Coalesce dashboard bursts; stay well under Telegram edit limits
+ALERT_PRICE_MOVE_THRESHOLD = 0.03  # Re-alert a condition only if its price moved >= 3¢ since the last alert
+ALERT_STATE_TTL_SECONDS = 3 * 3600 # Forget alerted conditions after 3h (match long over)
 
 # ---------------------------------------------------------------------------
 # Network settings
 # ---------------------------------------------------------------------------
 REQUEST_TIMEOUT_SECONDS = 10   # HTTP request timeout
+ASYNC_HTTP_MAX_CONNECTIONS = 100  # async_runtime: shared httpx pool size (Gamma / Telegram)
+ASYNC_HTTP_MAX_KEEPALIVE = 20     # async_runtime: idle keep-alive connections kept per pool
+GAMMA_CACHE_TTL_SECONDS = 15   # Shared /events response cache (discovery, dashboard, scans)
+GAMMA_EVENTS_LIMIT = 100       # Page size for league /events queries
+GAMMA_MAX_PAGES = 20           # Safety cap on pages per league query
+# Server-side time windows for Gamma /events (applied as start_date_max / end_date_min)
+LIVE_LOOKBACK_MINUTES = MAX_MINUTE + 60   # Oldest kickoff a live scan can still care about (halftime, stoppage, delays)
+SCHEDULE_LOOKBACK_MINUTES = 120           # Kickoff + wakeup delay + session duration, rounded up
 WS_READ_TIMEOUT_SECONDS = 8    # Max time to wait for WebSocket messages
 WS_MAX_MESSAGES = 50           # Max messages to read in one WebSocket session
 
+# ---------------------------------------------------------------------------
+# Logging (queue-based pipeline, rotated file — see log_pipeline.py)
+# ---------------------------------------------------------------------------
+LOG_FILE = "minutebid_scan.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate the log file at 5 MB
+LOG_BACKUP_COUNT = 5             # Keep 5 gzip-compressed rotations (~few MB total on disk)
+LOG_QUEUE_SIZE = 10000           # Records buffered for the writer thread; overflow is dropped, never blocks
+LOG_JSON = False                 # JSON lines in the log file (env MINUTEBID_LOG_JSON=1 also enables)
+
+# ---------------------------------------------------------------------------
+# On-demand profiling (see profiler.py). Arm with MINUTEBID_PROFILE=scans:5 /
+# session / memory:scans:5, or POST /profile on the health server
+# (requires MINUTEBID_PROFILE_TOKEN; the endpoint is off without it).
+# ---------------------------------------------------------------------------
+PROFILE_DIR = "profiles"         # Reports land here; downloadable via GET /profile/files/<name>
+PROFILE_MAX_FILES = 20           # Oldest reports are pruned beyond this
+PROFILE_TOP_N = 40               # Functions / allocation sites listed in text reports
+PROFILE_TRACEMALLOC_FRAMES = 10  # Stack depth recorded per allocation in memory mode
+
+# ---------------------------------------------------------------------------
+# Memory watchdog (see memory_watchdog.py) — Fly machine has 256 MB
+# ---------------------------------------------------------------------------
+MEMORY_WATCHDOG_ENABLED = True
+MEMORY_BUDGET_MB = 200             # Leave headroom below the 256 MB machine for the OS / page cache
+MEMORY_SHED_RATIO = 0.85           # Shed caches once RSS passes 85% of the budget
+MEMORY_SAMPLE_SECONDS = 60         # RSS / heap sampling interval
+MEMORY_SHED_COOLDOWN_SECONDS = 300 # Min gap between two cache sheds
+MEMORY_TREND_WINDOW_SAMPLES = 180  # Growth trend fitted over the last 3h of samples
+MEMORY_LEAK_WARN_MB_PER_HOUR = 5.0 # Warn when the fitted RSS trend exceeds this
+MEMORY_LOG_EVERY_SAMPLES = 15      # Log a memory/trend line every 15 samples
+
+# ---------------------------------------------------------------------------
+# Bet ledger (see bet_ledger.py) — SQLite history of every order attempt
+# ---------------------------------------------------------------------------
+BET_LEDGER_ENABLED = True
+BET_LEDGER_FILE = os.path.join(DATA_DIR, ".bet_ledger.sqlite3")  # WAL mode: -wal / -shm files sit next to it
+BET_RECONCILE_SECONDS = 600       # Pull fills and market resolutions for open bets every 10 minutes
+BET_RECONCILE_BATCH = 50          # condition_ids per Gamma /markets request while reconciling
+
+# ---------------------------------------------------------------------------
+# League sharding across worker processes (see shard_pool.py). Each worker is a
+# full interpreter (~40 MB RSS) — keep 0 on the 256 MB Fly machine.
+# ---------------------------------------------------------------------------
+SHARD_WORKERS = 0                  # 0 = scan in-process; env MINUTEBID_SHARD_WORKERS overrides
+SHARD_PRICE_TABLE_SLOTS = 1 << 17  # Shared price table capacity (power of two, 32 B per slot = 4 MB)
+SHARD_PRICE_TABLE_MAX_LOAD = 0.5   # Table is cleared (new epoch) once this share of slots is used
+SHARD_SCAN_TIMEOUT_SECONDS = 60    # Shards slower than this are left out of the scan and restarted
+
+# ---------------------------------------------------------------------------
+# Live match clock (Sports WebSocket game-state feed)
+# ---------------------------------------------------------------------------
+SPORTS_WS_ENABLED = False        # Run the background game-state consumer in the scheduler
+                                 # (off: the server pushes nothing until subscribed — set both)
+SPORTS_WS_SUBSCRIBE_MESSAGE = "" # JSON text sent on connect (required for the feed to receive data)
+SPORTS_WS_RECONNECT_SECONDS = 5  # Initial reconnect backoff (doubles up to 60s)
+GAME_STATE_MAX_AGE_SECONDS = 180 # Older live states fall back to startTime estimation
+
@@ -0,0 +1,174 @@
+# execution.py — Concurrent order execution for one scan's opportunities.
+# Single Responsibility: batch-alert new signals on a dedicated sender thread while
+# tokens are resolved, budget reserved and orders placed through a bounded worker pool.
+# Budget safety lives in RiskManager; alert dedup lives in alert_state.py.
+# Every order attempt is queued into the session's bet ledger (bet_ledger.py).
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import polymarket_client
+import telegram_client
+import trader
+from alert_state import AlertStateCache
+from config import BET_STAKE_USD, ORDER_WORKERS
+from risk_manager import RiskManager
+
+logger = logging.getLogger(__name__)
+
+_pool: ThreadPoolExecutor | None = None
+_alert_pool: ThreadPoolExecutor | None = None  # One thread: alerts never wait behind CLOB round-trips
+_pool_lock = threading.Lock()
+
+# Process-wide: a still-qualifying opportunity is alerted once, not every scan
+alert_cache = AlertStateCache()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Lazily create the shared worker pool (reused across scans and sessions)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=ORDER_WORKERS, thread_name_prefix="order")
+        return _pool
+
+
+def _get_alert_pool() -> ThreadPoolExecutor:
+    """Lazily create the alert sender (separate from the order pool)."""
+    global _alert_pool
+    with _pool_lock:
+        if _alert_pool is None:
+            _alert_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert")
+        return _alert_pool
+
+
+def shutdown() -> None:
+    """Wait for in-flight orders and alerts and tear down the worker pools."""
+    global _pool, _alert_pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+        if _alert_pool is not None:
+            _alert_pool.shutdown(wait=True)
+            _alert_pool = None
+
+
+def execute_opportunities(opportunities: list[dict], risk_manager: RiskManager | None) -> list[str]:
+    """
+    Process every opportunity concurrently and block until all are done.
+    New signals (see alert_state.py) go out as one batched Telegram message.
+
+    Args:
+        opportunities: Opportunity dicts from scanner.filter_opportunities().
+        risk_manager:  Session RiskManager. None = alert-only (no orders placed).
+
+    Returns:
+        One status string per opportunity, in input order
+        ("alerted", "placed", "skipped:<reason>", "failed").
+    """
+    if not opportunities:
+        return []
+    # One batched Telegram message for this scan's new signals, sent alongside the orders
+    new_signals = alert_cache.filter_new(opportunities)
+    alert_future = _get_alert_pool().submit(_send_alerts, new_signals) if new_signals else None
+
+    pool = _get_pool()
+    futures = [pool.submit(_process_opportunity, opp, risk_manager) for opp in opportunities]
+    results = []
+    for opp, future in zip(opportunities, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logger.error("Unexpected worker error for '%s': %s", opp.get("match"), e)
+            results.append("failed")
+    if alert_future is not None:
+        try:
+            alert_future.result()
+        except Exception as e:
+            logger.error("Batched alert failed: %s", e)
+    return results
+
+
+def _send_alerts(signals: list[dict]) -> None:
+    """Alert-pool job: send one scan's signals; only delivered ones count as alerted."""
+    delivered = telegram_client.send_opportunity_alerts(signals)
+    alert_cache.mark_sent(delivered)
+    if len(delivered) < len(signals):
+        logger.warning("%d of %d signal alerts not delivered — retrying next scan.",
+                       len(signals) - len(delivered), len(signals))
+
+
+def _process_opportunity(opp: dict, risk_manager: RiskManager | None) -> str:
+    """If betting: resolve token, reserve budget and place one FOK order."""
+    if risk_manager is None:
+        return "alerted"
+
+    token_id = _resolve_token_id(opp)
+    if not token_id:
+        logger.warning("No token_id for '%s' — skipping bet.", opp["match"])
+        return "skipped:no_token"
+
+    # Several configured wallets: RiskManager assigns one with budget room (order_router.py)
+    approved, reason = risk_manager.reserve(token_id, wallets=trader.wallet_names())
+    if not approved:
+        logger.info("Bet skipped for '%s': %s", opp["match"], reason)
+        return f"skipped:{reason}"
+    wallet = risk_manager.wallet_of(token_id)
+
+    try:
+        if wallet is None:
+            result = trader.place_order(token_id, BET_STAKE_USD)
+        else:
+            result = trader.place_order(token_id, BET_STAKE_USD, wallet=wallet)
+    except Exception as e:
+        risk_manager.release(token_id)
+        _record(risk_manager, opp, token_id, "failed", wallet=wallet, error=str(e))
+        _handle_order_error(opp, token_id, e, risk_manager)
+        return "failed"
+
+    risk_manager.commit(token_id)
+    _record(risk_manager, opp, token_id, "placed", wallet=wallet, response=result)
+    telegram_client.send_order_confirmation(opp, result, BET_STAKE_USD)
+    return "placed"
+
+
+def _record(risk_manager: RiskManager, opp: dict, token_id: str, status: str, **fields) -> None:
+    """Queue the order attempt in the session's bet ledger (no-op without one; never blocks)."""
+    if risk_manager.ledger is None:
+        return
+    try:
+        risk_manager.ledger.record(opp, token_id, BET_STAKE_USD, status, session=risk_manager.session, **fields)
+    except Exception as e:
+        logger.error("Bet ledger record failed for '%s': %s", opp["match"], e)
+
+
+def _resolve_token_id(opp: dict) -> str | None:
+    """Resolve authoritative token_id from CLOB API; Gamma's clobTokenIds is unreliable."""
+    condition_id = opp.get("condition_id")
+    token_id = opp.get("token_id")  # Gamma fallback
+    if condition_id:
+        authoritative = polymarket_client.get_clob_yes_token_id(condition_id)
+        if authoritative:
+            token_id = authoritative
+            logger.info("Resolved CLOB token_id for '%s'", opp["match"])
+        else:
+            logger.warning("CLOB token_id lookup failed for '%s' — using Gamma fallback", opp["match"])
+    return token_id
+
+
+def _handle_order_error(opp: dict, token_id: str, e: Exception, risk_manager: RiskManager) -> None:
+    err_str = str(e)
+    # "Invalid token id" = CLOB closed trading on this market (near-resolved).
+    # "no match" = order book has no asks (illiquid market, e.g. More Markets spreads).
+    # Both are not operator-actionable — log only, skip Telegram noise.
+    if "Invalid token id" in err_str or err_str == "no match":
+        logger.warning("CLOB silent-skip token_id=%s (%s): %s", token_id, opp["match"], e)
+    elif "401" in err_str or "403" in err_str or "Unauthorized" in err_str:
+        # Auth/geoblock errors won't resolve mid-session — block token to stop retry spam.
+        logger.warning("Auth error (no retry this session) token_id=%s (%s): %s", token_id, opp["match"], e)
+        risk_manager.block_token(token_id)
+    else:
+        logger.error("Order failed for '%s': %s", opp["match"], e)
+        telegram_client.send_order_failure(opp, err_str)
@@ -0,0 +1,135 @@
+# fetch_cache.py — Short-TTL response cache with in-flight request coalescing.
+# Single Responsibility: make concurrent callers asking for the same key share
+# one fetch (single-flight) and reuse its result until the TTL expires.
+# No HTTP here — callers pass the fetch function. AsyncSingleFlightCache is the
+# asyncio twin used by async_runtime.py (one event loop, no locks).
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightCache:
+    """
+    Thread-safe TTL cache. For a given key at most one fetch runs at a time;
+    callers arriving while it runs wait for (and share) its result.
+    None results are treated as failures and never cached.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], ttl: float) -> Any:
+        """Return a fresh cached value for key, or fetch it exactly once."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self.hits += 1
+                return entry[1]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if value is not None and ttl > 0:
+                self._entries[key] = (self._clock() + ttl, value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached entry (in-flight fetches are unaffected)."""
+        with self._lock:
+            self._entries.clear()
+
+    def purge_expired(self) -> int:
+        """Remove expired entries. Returns how many were dropped."""
+        now = self._clock()
+        with self._lock:
+            stale = [k for k, (exp, _) in self._entries.items() if exp <= now]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AsyncSingleFlightCache:
+    """
+    SingleFlightCache for coroutines on one event loop. Waiters share the
+    leader's task; a cancelled waiter never cancels the shared fetch.
+    None results and exceptions are never cached.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self._clock():
+            self.hits += 1
+            return entry[1]
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._settle(key, t, ttl))
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Hashable, task: asyncio.Task, ttl: float) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        if value is not None and ttl > 0:
+            self._entries[key] = (self._clock() + ttl, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def purge_expired(self) -> int:
+        """Remove expired entries. Returns how many were dropped."""
+        now = self._clock()
+        stale = [k for k, (exp, _) in self._entries.items() if exp <= now]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
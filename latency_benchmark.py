@@ -0,0 +1,405 @@
+# latency_benchmark.py — Tick-to-trade latency benchmark against local Gamma / CLOB stand-ins.
+# Single Responsibility: inject price crossings through WIN_PROB_THRESHOLD at
+# known wall-clock times, run the real session pipeline (FixedRateTicker ->
+# main.run_single_scan -> scanner -> RiskManager -> execution -> trader) against
+# a local HTTP server standing in for Gamma /events and CLOB /markets, and report
+# how long each crossing took to become an order at the (paper) CLOB.
+#
+# Usage:
+#   python latency_benchmark.py                        # every scenario, table report
+#   python latency_benchmark.py --output bench.json    # save for later comparison
+#   python latency_benchmark.py --baseline bench.json  # deltas against a saved report
+#
+# Everything runs in real time. Only the scan interval is shortened (--scan-interval,
+# default 1s instead of SCAN_INTERVAL_SLOW) and the Gamma cache TTL is scaled by the
+# same ratio, so polling wait keeps its shape; HTTP, retry back-off, Telegram and
+# order latency are not scaled. Compare reports taken with the same settings.
+
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+import display
+import execution
+import main
+import paper_trading
+import polymarket_client
+import telegram_client
+import ticker
+import trader
+from alert_state import AlertStateCache
+from bench_harness import overrides
+from config import (
+    WIN_PROB_THRESHOLD,
+    GAMMA_EVENTS_LIMIT,
+    GAMMA_CACHE_TTL_SECONDS,
+    SCAN_INTERVAL_SLOW,
+    PAPER_LATENCY_MS,
+    PAPER_LATENCY_JITTER_MS,
+    BET_STAKE_USD,
+)
+from latency_stats import percentile
+from risk_manager import RiskManager
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+_PRICE_BEFORE = 0.70                      # Leader's ask until its crossing
+_PRICE_AFTER = 0.85                       # From the crossing on (inside [threshold, max))
+_KICKOFF_AGO = timedelta(minutes=80)      # Every match sits mid-window (minute ~80)
+
+
+class Scenario(NamedTuple):
+    matches: int                          # Live matches, each crossing once per round
+    telegram_seconds: float = 0.05        # Per Telegram send / edit
+    gamma_failure_rate: float = 0.0       # Share of /events requests answered with HTTP 500
+    clob_latency_ms: float = PAPER_LATENCY_MS
+
+
+SCENARIOS = {
+    "one_match": Scenario(matches=1),
+    "many_matches": Scenario(matches=40),
+    "slow_telegram": Scenario(matches=8, telegram_seconds=2.0),
+    "flaky_gamma": Scenario(matches=8, gamma_failure_rate=0.2),
+}
+
+
+# ---------------------------------------------------------------------------
+# Stand-ins
+# ---------------------------------------------------------------------------
+
+class StandInMarket:
+    """
+    Live matches spread over the configured league queries. Each match's
+    leader is priced _PRICE_BEFORE until cross_at (epoch seconds), then
+    _PRICE_AFTER. Records when each token's order reached the CLOB.
+    """
+
+    def __init__(self, crossings: list[float], queries: list[tuple[str, str, str]],
+                 failure_rate: float = 0.0, seed: int = 0) -> None:
+        kickoff = (datetime.now(timezone.utc) - _KICKOFF_AGO).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.matches = []
+        for i, cross_at in enumerate(crossings):
+            self.matches.append({
+                "id": f"bench-{i}",
+                "title": f"Bench Home {i} vs. Bench Away {i}",
+                "league": queries[i % len(queries)][2],
+                "kickoff": kickoff,
+                "condition_id": f"bench-cond-{i}",
+                "token_id": f"bench-tok-{i}",
+                "cross_at": cross_at,
+            })
+        self._by_condition = {m["condition_id"]: m for m in self.matches}
+        self._by_token = {m["token_id"]: m for m in self.matches}
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.arrivals: dict[str, float] = {}  # token_id -> first order arrival
+        self.requests = 0
+        self.failures = 0
+
+    def price(self, match: dict, now: float) -> float:
+        return _PRICE_AFTER if now >= match["cross_at"] else _PRICE_BEFORE
+
+    def events_page(self, league: str, offset: int) -> list[dict] | None:
+        """Gamma /events page for one league, or None for an injected failure."""
+        with self._lock:
+            self.requests += 1
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                self.failures += 1
+                return None
+        now = time.time()
+        rows = [{
+            "id": m["id"],
+            "title": m["title"],
+            "slug": m["id"],
+            "startTime": m["kickoff"],
+            "startDate": m["kickoff"],
+            "markets": [{
+                "conditionId": m["condition_id"],
+                "question": f"Will Bench Home {m['id']} win?",
+                "bestAsk": str(self.price(m, now)),
+                "clobTokenIds": json.dumps([m["token_id"], m["token_id"] + "-no"]),
+            }],
+        } for m in self.matches if m["league"] == league]
+        return rows[offset:offset + GAMMA_EVENTS_LIMIT]
+
+    def clob_market(self, condition_id: str) -> dict | None:
+        match = self._by_condition.get(condition_id)
+        if match is None:
+            return None
+        return {"condition_id": condition_id, "tokens": [
+            {"token_id": match["token_id"], "outcome": "Yes"},
+            {"token_id": match["token_id"] + "-no", "outcome": "No"},
+        ]}
+
+    def book(self, token_id: str) -> paper_trading.OrderBook | None:
+        """Paper CLOB book lookup — the moment the FOK order is matched."""
+        arrived = time.time()
+        match = self._by_token.get(token_id)
+        if match is None:
+            return None
+        with self._lock:
+            self.arrivals.setdefault(token_id, arrived)
+        return paper_trading.synthetic_book(self.price(match, arrived))
+
+
+class StandInServer:
+    """Local HTTP server answering Gamma /events and CLOB /markets/<id> from a StandInMarket."""
+
+    def __init__(self, market: StandInMarket) -> None:
+        self.market = market
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the pooled client session
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path == "/events":
+                    league = params.get("series_id") or params.get("tag_slug") or ""
+                    body = server.market.events_page(league, int(params.get("offset", 0)))
+                elif url.path.startswith("/markets/"):
+                    body = server.market.clob_market(url.path.rsplit("/", 1)[-1])
+                else:
+                    body = None
+                payload = json.dumps(body).encode() if body is not None else b"{}"
+                self.send_response(200 if body is not None else 500)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-standin", daemon=True)
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _run_round(scenario: Scenario, scan_interval: float, window: float, seed: int) -> dict:
+    """One round: fresh stand-ins and session, every match crossing once within `window` seconds."""
+    rng = random.Random(seed)
+    warmup = scan_interval  # At least one scan sees every match below the threshold
+    start = time.time() + warmup
+    crossings = sorted(start + rng.uniform(0, window) for _ in range(scenario.matches))
+    market = StandInMarket(crossings, polymarket_client._league_queries(),
+                           scenario.gamma_failure_rate, seed=seed)
+    backend = paper_trading.PaperTradingBackend(books=market.book, latency_ms=scenario.clob_latency_ms,
+                                                jitter_ms=min(PAPER_LATENCY_JITTER_MS, scenario.clob_latency_ms),
+                                                seed=seed)
+    detected: dict[str, float] = {}
+    scan_seconds: list[float] = []
+    messages = []
+    original_execute = execution.execute_opportunities
+
+    def execute(opportunities, risk_manager):
+        seen = time.time()
+        for opp in opportunities:
+            detected.setdefault(opp.get("condition_id"), seen)
+        return original_execute(opportunities, risk_manager)
+
+    def send_message(text: str) -> int:
+        time.sleep(scenario.telegram_seconds)
+        messages.append(text)
+        return len(messages)
+
+    def edit_message(text: str, message_id: int) -> bool:
+        time.sleep(scenario.telegram_seconds)
+        return True
+
+    risk = RiskManager(max_budget=BET_STAKE_USD * (scenario.matches + 1), stake_per_bet=BET_STAKE_USD)
+    cache_ttl = GAMMA_CACHE_TTL_SECONDS * scan_interval / SCAN_INTERVAL_SLOW
+    previous_backend = trader.set_backend(backend)
+    try:
+        with StandInServer(market) as server, overrides([
+            (polymarket_client, "GAMMA_API_BASE", server.base_url),
+            (polymarket_client, "CLOB_API_BASE", server.base_url),
+            (polymarket_client, "GAMMA_CACHE_TTL_SECONDS", cache_ttl),
+            (telegram_client, "send_message", send_message),
+            (telegram_client, "edit_message", edit_message),
+            (display, "print_results", lambda opportunities: None),
+            (execution, "alert_cache", AlertStateCache()),
+            (execution, "execute_opportunities", execute),
+        ]):
+            polymarket_client.clear_cache()
+            polymarket_client.clear_resolved_tokens()
+
+            # Long enough for the last crossing plus a full retry back-off (1s + 2s) and a few scans
+            end = datetime.fromtimestamp(crossings[-1] + 3 + 5 * scan_interval, timezone.utc)
+            for _tick in ticker.FixedRateTicker(scan_interval, end=end):
+                started = time.perf_counter()
+                try:
+                    main.run_single_scan(risk_manager=risk)
+                except Exception as e:
+                    logger.error("Benchmark scan failed: %s", e)
+                scan_seconds.append(time.perf_counter() - started)
+                if len(market.arrivals) == len(market.matches):
+                    break
+            polymarket_client.clear_cache()
+            polymarket_client.clear_resolved_tokens()
+    finally:
+        trader.set_backend(previous_backend)
+
+    samples = []
+    for match in market.matches:
+        arrived = market.arrivals.get(match["token_id"])
+        if arrived is None:
+            continue
+        seen = detected.get(match["condition_id"], arrived)
+        samples.append({"total": arrived - match["cross_at"], "detect": seen - match["cross_at"],
+                        "order": arrived - seen})
+    return {"crossings": len(market.matches), "samples": samples, "scan_seconds": scan_seconds,
+            "gamma_requests": market.requests, "gamma_failures": market.failures,
+            "telegram_messages": len(messages)}
+
+
+def _distribution(seconds: list[float]) -> dict:
+    """p50 / p95 / p99 / max / mean in milliseconds (None when empty)."""
+    if not seconds:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+    ms = [s * 1000 for s in seconds]
+    return {"p50": percentile(ms, 50, 1), "p95": percentile(ms, 95, 1), "p99": percentile(ms, 99, 1),
+            "max": round(max(ms), 1), "mean": round(sum(ms) / len(ms), 1)}
+
+
+def run_scenario(scenario: Scenario, rounds: int = 3, scan_interval: float = 1.0,
+                 window: float = 5.0, seed: int = 7) -> dict:
+    """Aggregate `rounds` rounds of one scenario into latency distributions."""
+    rounds_out = [_run_round(scenario, scan_interval, window, seed + i) for i in range(rounds)]
+    samples = [s for r in rounds_out for s in r["samples"]]
+    crossings = sum(r["crossings"] for r in rounds_out)
+    return {
+        **scenario._asdict(),
+        "crossings": crossings,
+        "traded": len(samples),
+        "missed": crossings - len(samples),
+        "tick_to_trade_ms": _distribution([s["total"] for s in samples]),
+        "detect_ms": _distribution([s["detect"] for s in samples]),
+        "order_ms": _distribution([s["order"] for s in samples]),
+        "scan_ms": _distribution([s for r in rounds_out for s in r["scan_seconds"]]),
+        "scans": sum(len(r["scan_seconds"]) for r in rounds_out),
+        "gamma_requests": sum(r["gamma_requests"] for r in rounds_out),
+        "gamma_failures": sum(r["gamma_failures"] for r in rounds_out),
+        "telegram_messages": sum(r["telegram_messages"] for r in rounds_out),
+    }
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmark(names: list[str] | None = None, rounds: int = 3, scan_interval: float = 1.0,
+                  window: float = 5.0, seed: int = 7) -> dict:
+    """Every requested scenario plus the settings needed to compare reports across commits."""
+    names = names or list(SCENARIOS)
+    return {
+        "version": REPORT_VERSION,
+        "commit": _commit(),
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "settings": {"rounds": rounds, "scan_interval": scan_interval, "window": window, "seed": seed,
+                     "threshold": WIN_PROB_THRESHOLD},
+        "scenarios": {name: run_scenario(SCENARIOS[name], rounds, scan_interval, window, seed)
+                      for name in names},
+    }
+
+
+def compare(report: dict, baseline: dict) -> list[tuple]:
+    """(scenario, metric, baseline, current, change %) for the headline numbers."""
+    rows = []
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        for field, key in (("tick_to_trade_ms", "p50"), ("tick_to_trade_ms", "p95"), ("order_ms", "p95")):
+            old, new = before[field][key], current[field][key]
+            change = round((new - old) / old * 100, 1) if old and new is not None else None
+            rows.append((name, f"{field[:-3]} {key}", old, new, change))
+        rows.append((name, "missed", before["missed"], current["missed"], None))
+    return rows
+
+
+def print_report(report: dict) -> None:
+    from tabulate import tabulate
+
+    print(f"commit {report['commit']}  python {report['python']}  settings {json.dumps(report['settings'])}")
+    rows = []
+    for name, r in report["scenarios"].items():
+        t, d, o = r["tick_to_trade_ms"], r["detect_ms"], r["order_ms"]
+        rows.append((name, f"{r['traded']}/{r['crossings']}", t["p50"], t["p95"], t["p99"], t["max"],
+                     d["p50"], o["p50"], o["p95"], r["scan_ms"]["p50"], r["gamma_failures"]))
+    print(tabulate(rows, headers=["Scenario", "Traded", "T2T p50", "T2T p95", "T2T p99", "T2T max",
+                                  "Detect p50", "Order p50", "Order p95", "Scan p50", "Gamma 5xx"]))
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tick-to-trade latency on local Gamma / CLOB stand-ins.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per scenario (one crossing per match each)")
+    parser.add_argument("--scan-interval", type=float, default=1.0, help="Session scan interval in seconds")
+    parser.add_argument("--window", type=float, default=5.0, help="Crossings spread over this many seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> dict:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    report = run_benchmark(args.scenarios, args.rounds, args.scan_interval, args.window, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.baseline:
+        from tabulate import tabulate
+
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print()
+        print(f"vs baseline {baseline.get('commit')} ({baseline.get('created')})")
+        if baseline.get("settings") != report["settings"]:
+            print(f"warning: baseline settings differ {json.dumps(baseline.get('settings'))}")
+        print(tabulate(compare(report, baseline), headers=["Scenario", "Metric", "Baseline", "Current", "Change %"]))
+    return report
+
+
+if __name__ == "__main__":
+    main_cli()
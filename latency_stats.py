@@ -0,0 +1,18 @@
+# latency_stats.py — Percentile summaries for latency / lag measurements.
+# Single Responsibility: one nearest-rank percentile shared by the runtime
+# ticker stats, paper fills, the simulation and the benchmarks.
+
+import math
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], pct: float, digits: int | None = None) -> float | None:
+    """
+    Nearest-rank percentile (pct 0-100): the smallest value with at least pct%
+    of the values at or below it. None when empty; digits rounds the result.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    value = ordered[min(max(math.ceil(pct / 100 * len(ordered)) - 1, 0), len(ordered) - 1)]
+    return value if digits is None else round(value, digits)
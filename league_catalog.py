@@ -0,0 +1,156 @@
+# league_catalog.py — Automatic discovery of soccer leagues on Gamma.
+# Single Responsibility: build, rank, persist and refresh the list of soccer
+# series the bot monitors in addition to config.LEAGUE_SERIES_IDS / LEAGUE_TAG_SLUGS.
+# HTTP goes through polymarket_client; the active catalog is pushed back into it.
+
+import json
+import logging
+import os
+import time
+
+import polymarket_client
+from config import (
+    GAMMA_EVENTS_LIMIT,
+    LEAGUE_CATALOG_FILE,
+    LEAGUE_CATALOG_REFRESH_HOURS,
+    LEAGUE_CATALOG_REQUEST_BUDGET,
+    LEAGUE_CATALOG_MAX_LEAGUES,
+    LEAGUE_CATALOG_MIN_LIQUIDITY,
+    SOCCER_TAG_ID,
+)
+
+logger = logging.getLogger(__name__)
+
+# In-memory copy of the catalog file: {"refreshed_at": float, "leagues": [entry, ...]}
+# entry = {"key": str, "series_id": str, "title": str, "liquidity": float, "volume24hr": float}
+_catalog: dict | None = None
+
+
+def discover(request_budget: int = LEAGUE_CATALOG_REQUEST_BUDGET) -> list[dict] | None:
+    """
+    Query Gamma for every soccer competition and rank it by liquidity.
+    Spends at most request_budget HTTP requests: one /sports call, the rest on
+    /series pages for liquidity data. Returns None if /sports is unavailable.
+    """
+    sports = polymarket_client.get_sports_metadata()
+    if sports is None:
+        return None
+    requests_left = request_budget - 1
+
+    leagues: dict[str, dict] = {}
+    for sport in sports:
+        tags = {t.strip() for t in str(sport.get("tags") or "").split(",")}
+        if SOCCER_TAG_ID not in tags:
+            continue
+        series_ids = [sid.strip() for sid in str(sport.get("series") or "").split(",") if sid.strip()]
+        for series_id in series_ids:
+            if series_id not in leagues:
+                key = str(sport.get("sport") or series_id)
+                leagues[series_id] = {
+                    "key": key if len(series_ids) == 1 else f"{key}-{series_id}",
+                    "series_id": series_id,
+                    "title": "",
+                    "liquidity": 0.0,
+                    "volume24hr": 0.0,
+                }
+
+    # Liquidity / volume come from /series; page until every league is rated or budget is spent
+    unrated = set(leagues)
+    offset = 0
+    while unrated and requests_left > 0:
+        page = polymarket_client.get_series_page(offset)
+        requests_left -= 1
+        if not page:
+            break
+        for series in page:
+            entry = leagues.get(str(series.get("id")))
+            if entry is None:
+                continue
+            entry["title"] = series.get("title") or entry["title"]
+            entry["liquidity"] = _to_float(series.get("liquidity"))
+            entry["volume24hr"] = _to_float(series.get("volume24hr"))
+            unrated.discard(entry["series_id"])
+        if len(page) < GAMMA_EVENTS_LIMIT:
+            break
+        offset += GAMMA_EVENTS_LIMIT
+    if unrated:
+        logger.info("League catalog: %d series left unrated (request budget %d).", len(unrated), request_budget)
+
+    return rank(list(leagues.values()))
+
+
+def rank(leagues: list[dict]) -> list[dict]:
+    """Highest liquidity first (24h volume breaks ties), filtered and capped by config."""
+    eligible = [league for league in leagues if league["liquidity"] >= LEAGUE_CATALOG_MIN_LIQUIDITY]
+    eligible.sort(key=lambda league: (league["liquidity"], league["volume24hr"]), reverse=True)
+    return eligible[:LEAGUE_CATALOG_MAX_LEAGUES]
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+def load(path: str = LEAGUE_CATALOG_FILE) -> dict | None:
+    """Load the catalog from disk into memory and activate it. None if absent/corrupt."""
+    global _catalog
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data.get("leagues"), list):
+            raise ValueError("missing 'leagues'")
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning("Ignoring unreadable league catalog %s: %s", path, e)
+        return None
+    _catalog = data
+    _activate(data["leagues"])
+    return data
+
+
+def save(leagues: list[dict], path: str = LEAGUE_CATALOG_FILE) -> dict:
+    """Atomically write the catalog (tmp file + rename) and activate it."""
+    global _catalog
+    data = {"refreshed_at": time.time(), "leagues": leagues}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+    _catalog = data
+    _activate(leagues)
+    return data
+
+
+def _activate(leagues: list[dict]) -> None:
+    polymarket_client.set_catalog_leagues({league["key"]: league["series_id"] for league in leagues})
+
+
+def is_stale(max_age_hours: float = LEAGUE_CATALOG_REFRESH_HOURS) -> bool:
+    if _catalog is None:
+        return True
+    return time.time() - _catalog.get("refreshed_at", 0) > max_age_hours * 3600
+
+
+def refresh_if_stale(path: str = LEAGUE_CATALOG_FILE) -> int:
+    """
+    Ensure an up-to-date catalog is active: load from disk on first use,
+    rediscover when older than LEAGUE_CATALOG_REFRESH_HOURS. On discovery
+    failure the previous catalog stays active. Returns the active league count.
+    """
+    if _catalog is None:
+        load(path)
+    if is_stale():
+        leagues = discover()
+        if leagues is not None:
+            save(leagues, path)
+            logger.info("League catalog refreshed: %d soccer leagues active.", len(leagues))
+        else:
+            logger.warning("League catalog refresh failed — keeping previous catalog.")
+    return len(_catalog["leagues"]) if _catalog else 0
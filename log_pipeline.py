@@ -0,0 +1,118 @@
+# log_pipeline.py — Non-blocking logging for the scan / order hot path.
+# Callers only enqueue records; a background QueueListener thread does all
+# console and file I/O, size-based rotation and gzip compression of old logs.
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+from datetime import datetime, timezone
+
+from config import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_QUEUE_SIZE, LOG_JSON
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or raising."""
+
+    def __init__(self, q: queue.Queue) -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg (+ exc)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def build_file_handler(path: str = LOG_FILE, max_bytes: int = LOG_MAX_BYTES,
+                       backup_count: int = LOG_BACKUP_COUNT, json_lines: bool = False) -> logging.Handler:
+    """Size-rotated file handler whose rotated files are gzip-compressed."""
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    handler.setFormatter(JsonLineFormatter() if json_lines else logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+    return handler
+
+
+def json_enabled() -> bool:
+    return LOG_JSON or os.getenv("MINUTEBID_LOG_JSON", "").strip().lower() in ("1", "true", "yes")
+
+
+def start(level: int = logging.INFO, path: str = LOG_FILE) -> logging.handlers.QueueListener:
+    """
+    Attach a single DroppingQueueHandler to the root logger and start the writer
+    thread (console + rotated file). Idempotent; stopped automatically at exit.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+    file_handler = build_file_handler(path, json_lines=json_enabled())
+
+    q: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(DroppingQueueHandler(q))
+
+    _listener = logging.handlers.QueueListener(q, console, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop)
+    return _listener
+
+
+def stop() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Records discarded because the queue was full (for health / diagnostics)."""
+    return sum(h.dropped for h in logging.getLogger().handlers if isinstance(h, DroppingQueueHandler))
@@ -2,39 +2,32 @@
 # One scan per invocation. No daemon loop.
 
 import logging
-import sys
 from dotenv import load_dotenv
 
 import polymarket_client
 import scanner
 import display
-import telegram_client
+import execution
+import log_pipeline
+import match_clock
+import shard_pool
 import trader
-from config import BET_STAKE_USD
 from risk_manager import RiskManager
 
 # ---------------------------------------------------------------------------
-# Logging — console + persistent file for traceability
+# Logging — console + rotated file, written by a background thread (log_pipeline)
 # ---------------------------------------------------------------------------
 def setup_logging():
-    """Unifies logging for console and file across all entry points."""
-    log_format = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    date_format = "%H:%M:%S"
-
+    """Unifies logging for console and file across all entry points.
+    The hot path only enqueues records; I/O, rotation and compression happen off-thread."""
     # Check if handlers are already configured to avoid duplicate setup
     if not logging.getLogger().handlers:
-        logging.basicConfig(
-            level=logging.INFO,
-            format=log_format,
-            datefmt=date_format,
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler("minutebid_scan.log", encoding="utf-8")
-            ]
-        )
+        log_pipeline.start(level=logging.INFO)
     return logging.getLogger("main")
 
-logger = setup_logging()
+# Handlers are attached by the entry point (run() / scheduler.py), not at import,
+# so importing this module never opens the log file.
+logger = logging.getLogger("main")
 
 
 def run_single_scan(risk_manager: RiskManager = None) -> None:
@@ -43,74 +36,40 @@ def run_single_scan(risk_manager: RiskManager = None) -> None:
 
     Args:
         risk_manager: Optional session-scoped RiskManager. If provided, bet
-                      placement is attempted after each Telegram alert.
+                      placement is attempted after each Telegram alert,
+                      with all opportunities processed concurrently.
                       If None, the scan runs in alert-only mode (no orders placed).
     """
     logger.info("--- Starting single scan iteration ---")
 
-    # 1. Fetch active soccer events and their market prices from Gamma
-    events, prices = polymarket_client.get_active_soccer_events()
-    if not events:
-        logger.info("No active soccer events found on Polymarket right now.")
-        return
-
-    # 2. Filter: find outcomes >= 80% on Polymarket in the 75-90+ min window
-    opportunities = scanner.filter_opportunities(events, prices)
+    pool = shard_pool.get_pool()
+    if pool is not None:
+        # 1+2. Worker processes fetch and filter disjoint league groups (SHARD_WORKERS)
+        opportunities = pool.scan(match_clock.get_game_states())
+    else:
+        # 1. Fetch active soccer events and their market prices from Gamma
+        events, prices = polymarket_client.get_active_soccer_events()
+        if not events:
+            logger.info("No active soccer events found on Polymarket right now.")
+            return
+
+        # 2. Filter: find outcomes >= 80% on Polymarket in the 75-90+ min window
+        #    (live match clock when the Sports WS feed is running, else startTime estimate)
+        opportunities = scanner.filter_opportunities(events, prices, match_clock.get_game_states())
     display.print_results(opportunities)
 
     betting_active = risk_manager is not None and trader.is_credentials_configured()
     if risk_manager is not None and not betting_active:
         logger.warning("RiskManager provided but CLOB credentials missing — running alert-only.")
 
-    for opp in opportunities:
-        # Always send Telegram alert regardless of betting mode
-        telegram_client.send_opportunity_alert(opp)
-
-        if not betting_active:
-            continue
-
-        # Resolve authoritative token_id from CLOB API; Gamma's clobTokenIds is unreliable.
-        condition_id = opp.get("condition_id")
-        token_id = opp.get("token_id")  # Gamma fallback
-        if condition_id:
-            authoritative = polymarket_client.get_clob_yes_token_id(condition_id)
-            if authoritative:
-                token_id = authoritative
-                logger.info("Resolved CLOB token_id for '%s'", opp["match"])
-            else:
-                logger.warning("CLOB token_id lookup failed for '%s' — using Gamma fallback", opp["match"])
-
-        if not token_id:
-            logger.warning("No token_id for '%s' — skipping bet.", opp["match"])
-            continue
-
-        approved, reason = risk_manager.approve(token_id)
-        if not approved:
-            logger.info("Bet skipped for '%s': %s", opp["match"], reason)
-            continue
-
-        try:
-            result = trader.place_order(token_id, BET_STAKE_USD)
-            risk_manager.record_bet(token_id)
-            telegram_client.send_order_confirmation(opp, result, BET_STAKE_USD)
-        except Exception as e:
-            err_str = str(e)
-            # "Invalid token id" = CLOB closed trading on this market (near-resolved).
-            # "no match" = order book has no asks (illiquid market, e.g. More Markets spreads).
-            # Both are not operator-actionable — log only, skip Telegram noise.
-            if "Invalid token id" in err_str or err_str == "no match":
-                logger.warning("CLOB silent-skip token_id=%s (%s): %s", token_id, opp["match"], e)
-            elif "401" in err_str or "403" in err_str or "Unauthorized" in err_str:
-                # Auth/geoblock errors won't resolve mid-session — block token to stop retry spam.
-                logger.warning("Auth error (no retry this session) token_id=%s (%s): %s", token_id, opp["match"], e)
-                if risk_manager is not None:
-                    risk_manager.block_token(token_id)
-            else:
-                logger.error("Order failed for '%s': %s", opp["match"], e)
-                telegram_client.send_order_failure(opp, err_str)
+    # 3. Alert on every opportunity and, when betting, place orders concurrently.
+    #    RiskManager reservations keep the session budget cap and duplicate guard
+    #    intact while several orders are in flight at once.
+    execution.execute_opportunities(opportunities, risk_manager if betting_active else None)
 
 
 def run() -> None:
+    setup_logging()
     load_dotenv()
     logger.info("=== Minutebid orchestrator started ===")
     run_single_scan()  # alert-only when invoked standalone
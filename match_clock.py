@@ -0,0 +1,228 @@
+# match_clock.py — Background consumer for the Polymarket Sports WebSocket.
+# Single Responsibility: keep a live minute / period / score table per event.
+# scanner.py reads snapshots of this table; startTime estimation is the fallback
+# whenever the feed is down, silent, or has no entry for an event.
+
+import json
+import logging
+import re
+import threading
+
+import websocket
+
+import clock
+from config import SPORTS_WS_URL, SPORTS_WS_SUBSCRIBE_MESSAGE, SPORTS_WS_RECONNECT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_MAX_RECONNECT_SECONDS = 60
+_MINUTE_RE = re.compile(r"^\s*(\d+)(?::\d+)?\s*(?:\+\s*(\d+))?")
+
+# Feed field -> identifier namespace. Slugs, Gamma event ids and sports gameIds are
+# separate id spaces (a gameId can equal some unrelated event id), so each gets its own map.
+_KEY_FIELDS = (("slug", "slug"), ("gameId", "game"), ("eventId", "event"), ("event_id", "event"))
+NAMESPACES = ("slug", "event", "game")
+
+
+def parse_game_message(msg: dict) -> tuple[list[str], dict] | None:
+    """
+    Normalize one Sports WebSocket game update.
+    Returns (keys, state) where keys are every (namespace, identifier) pair the
+    update can be looked up by — ("slug", slug), ("game", gameId), ("event", eventId) —
+    or None if the message is not a game update.
+
+    state = {'minute': int|None, 'period': str, 'home_score': int|None,
+             'away_score': int|None, 'live': bool, 'ended': bool, 'updated_at': datetime}
+    """
+    if not isinstance(msg, dict):
+        return None
+    keys = [(ns, str(msg[field])) for field, ns in _KEY_FIELDS if msg.get(field) not in (None, "")]
+    if not keys:
+        return None
+
+    home_score, away_score = _parse_score(msg)
+    period = str(msg.get("period") or "").upper()
+    ended = bool(msg.get("ended")) or period in ("FT", "AET", "FINISHED")
+    return keys, {
+        "minute": _parse_minute(msg.get("minute", msg.get("elapsed"))),
+        "period": period,
+        "home_score": home_score,
+        "away_score": away_score,
+        "live": bool(msg.get("live", not ended)),
+        "ended": ended,
+        "updated_at": clock.now(),
+    }
+
+
+def _parse_minute(raw) -> int | None:
+    """Accepts 67, "67", "67:12", "90+3", "45+2'"; returns whole match minutes."""
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    m = _MINUTE_RE.match(str(raw))
+    if not m:
+        return None
+    return int(m.group(1)) + int(m.group(2) or 0)
+
+
+def _parse_score(msg: dict) -> tuple[int | None, int | None]:
+    if "homeScore" in msg or "awayScore" in msg:
+        try:
+            return int(msg.get("homeScore")), int(msg.get("awayScore"))
+        except (TypeError, ValueError):
+            return None, None
+    score = msg.get("score")
+    if isinstance(score, str) and "-" in score:
+        home, _, away = score.partition("-")
+        try:
+            return int(home), int(away)
+        except ValueError:
+            pass
+    return None, None
+
+
+class GameStateTable:
+    """Thread-safe maps of namespace -> event key -> latest game state."""
+
+    def __init__(self) -> None:
+        self._states: dict[str, dict[str, dict]] = {ns: {} for ns in NAMESPACES}
+        self._lock = threading.Lock()
+
+    def apply(self, msg: dict) -> bool:
+        """Apply one raw feed message. Returns True if it updated the table."""
+        parsed = parse_game_message(msg)
+        if parsed is None:
+            return False
+        keys, state = parsed
+        with self._lock:
+            for ns, key in keys:
+                self._states[ns][key] = state
+        return True
+
+    def snapshot(self) -> dict[str, dict[str, dict]]:
+        """Shallow copy safe to hand to scanner.filter_opportunities()."""
+        with self._lock:
+            return {ns: dict(states) for ns, states in self._states.items()}
+
+    def prune_ended(self) -> None:
+        with self._lock:
+            self._states = {ns: {k: v for k, v in states.items() if not v["ended"]}
+                            for ns, states in self._states.items()}
+
+    def __len__(self) -> int:
+        return sum(len(states) for states in self._states.values())
+
+
+class MatchClockFeed:
+    """
+    Daemon-thread consumer of the Sports WebSocket.
+    Reconnects with exponential backoff until stop() is called.
+    """
+
+    def __init__(self, url: str = SPORTS_WS_URL, table: GameStateTable | None = None,
+                 subscribe_message: str = SPORTS_WS_SUBSCRIBE_MESSAGE) -> None:
+        self.url = url
+        self.table = table if table is not None else GameStateTable()
+        self._subscribe_message = subscribe_message
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._app: websocket.WebSocketApp | None = None
+        self.connected = threading.Event()
+        self.messages_received = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="match-clock", daemon=True)
+        self._thread.start()
+        logger.info("Match clock feed started (%s)", self.url)
+        if not self._subscribe_message:
+            logger.warning("No SPORTS_WS_SUBSCRIBE_MESSAGE set — the Sports WS sends nothing unsubscribed; "
+                           "match minutes will come from startTime.")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._app is not None:
+            self._app.close()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        delay = SPORTS_WS_RECONNECT_SECONDS
+        while not self._stop.is_set():
+            self._app = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self._app.run_forever(ping_interval=20, ping_timeout=10)
+            except Exception as e:
+                logger.warning("Match clock feed crashed: %s", e)
+            if self.messages_received:
+                delay = SPORTS_WS_RECONNECT_SECONDS  # Healthy session — reset backoff
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, _MAX_RECONNECT_SECONDS)
+
+    def _on_open(self, ws) -> None:
+        self.connected.set()
+        logger.info("Match clock feed connected.")
+        if self._subscribe_message:
+            ws.send(self._subscribe_message)
+
+    def _on_message(self, ws, raw: str) -> None:
+        try:
+            data = json.loads(raw)
+        except (ValueError, TypeError):
+            return  # Pings / non-JSON keepalives
+        for msg in data if isinstance(data, list) else [data]:
+            if self.table.apply(msg):
+                self.messages_received += 1
+
+    def _on_error(self, ws, error) -> None:
+        logger.warning("Match clock feed error: %s", error)
+
+    def _on_close(self, ws, status_code, reason) -> None:
+        self.connected.clear()
+        if not self._stop.is_set():
+            logger.info("Match clock feed closed (%s %s). Reconnecting...", status_code, reason)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide feed used by scheduler.py / main.py
+# ---------------------------------------------------------------------------
+_feed: MatchClockFeed | None = None
+
+
+def start_feed(url: str = SPORTS_WS_URL) -> MatchClockFeed:
+    """Start (once) the shared background feed."""
+    global _feed
+    if _feed is None:
+        _feed = MatchClockFeed(url)
+    _feed.start()
+    return _feed
+
+
+def stop_feed() -> None:
+    global _feed
+    if _feed is not None:
+        _feed.stop()
+        _feed = None
+
+
+def prune_ended() -> None:
+    """Drop finished games from the shared feed's table (memory pressure)."""
+    if _feed is not None:
+        _feed.table.prune_ended()
+
+
+def get_game_states() -> dict[str, dict[str, dict]]:
+    """Snapshot of live game states, or {} when the feed is not running."""
+    if _feed is None:
+        return {}
+    return _feed.table.snapshot()
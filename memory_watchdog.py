@@ -0,0 +1,272 @@
+# memory_watchdog.py — RSS / heap sampling, leak trend and cache shedding.
+# Single Responsibility: keep the long-running scheduler inside MEMORY_BUDGET_MB.
+# A daemon thread samples RSS and Python heap stats, fits a growth trend,
+# tracks growth per scanning session and calls registered cache shedders when
+# RSS nears the budget. Status is exposed on the health server (GET /memory).
+
+import ctypes
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable
+
+from config import (
+    MEMORY_BUDGET_MB,
+    MEMORY_SHED_RATIO,
+    MEMORY_SAMPLE_SECONDS,
+    MEMORY_SHED_COOLDOWN_SECONDS,
+    MEMORY_TREND_WINDOW_SAMPLES,
+    MEMORY_LEAK_WARN_MB_PER_HOUR,
+    MEMORY_LOG_EVERY_SAMPLES,
+)
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+_MIN_TREND_SPAN_SECONDS = 1800  # Don't call a trend on less than 30 min of samples
+
+
+def read_rss_bytes() -> int | None:
+    """Current resident set size. Peak RSS where only getrusage exists; None on Windows."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def heap_stats() -> dict:
+    """Cheap CPython heap counters (no full object walk)."""
+    return {
+        "allocated_blocks": sys.getallocatedblocks(),
+        "gc_counts": list(gc.get_count()),
+        "gc_garbage": len(gc.garbage),
+    }
+
+
+def _malloc_trim() -> bool:
+    """Ask glibc to hand freed arenas back to the OS. No-op elsewhere."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return bool(ctypes.CDLL("libc.so.6").malloc_trim(0))
+    except (OSError, AttributeError):
+        return False
+
+
+class MemoryWatchdog:
+    """
+    Samples every `interval` seconds on a daemon thread (or on demand via sample()).
+    Shedders are plain callables registered by name; they run, followed by a
+    full gc and malloc_trim, when RSS crosses shed_ratio * budget.
+    """
+
+    def __init__(self, budget_mb: float = MEMORY_BUDGET_MB, shed_ratio: float = MEMORY_SHED_RATIO,
+                 interval: float = MEMORY_SAMPLE_SECONDS, cooldown: float = MEMORY_SHED_COOLDOWN_SECONDS,
+                 window: int = MEMORY_TREND_WINDOW_SAMPLES, leak_warn_mb_per_hour: float = MEMORY_LEAK_WARN_MB_PER_HOUR,
+                 rss_reader: Callable[[], int | None] = read_rss_bytes,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.budget_mb = budget_mb
+        self.shed_ratio = shed_ratio
+        self.interval = interval
+        self.cooldown = cooldown
+        self.leak_warn_mb_per_hour = leak_warn_mb_per_hour
+        self._rss_reader = rss_reader
+        self._clock = clock
+        self._samples: deque = deque(maxlen=window)  # (monotonic_ts, rss_mb)
+        self._shedders: dict[str, Callable[[], object]] = {}
+        self._sessions: deque = deque(maxlen=20)
+        self._open_session: dict | None = None
+        self._last_shed: float | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_sample: dict | None = None
+        self.sheds = 0
+        self.samples_taken = 0
+
+    def register_shedder(self, name: str, fn: Callable[[], object]) -> None:
+        self._shedders[name] = fn
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def sample(self) -> dict:
+        """Take one sample, shed if over the threshold, log periodically."""
+        rss = self._rss_reader()
+        now = self._clock()
+        rss_mb = round(rss / _MB, 1) if rss is not None else None
+        sample = {"rss_mb": rss_mb, **heap_stats()}
+        with self._lock:
+            if rss_mb is not None:
+                self._samples.append((now, rss_mb))
+            self.last_sample = sample
+            self.samples_taken += 1
+            count = self.samples_taken
+
+        if rss_mb is not None and rss_mb >= self.budget_mb * self.shed_ratio:
+            if self._last_shed is None or now - self._last_shed >= self.cooldown:
+                self.shed(f"RSS {rss_mb:.0f} MB >= {self.shed_ratio:.0%} of {self.budget_mb:.0f} MB budget")
+
+        trend = self.trend_mb_per_hour()
+        if count % MEMORY_LOG_EVERY_SAMPLES == 0:
+            logger.info("Memory: rss=%s MB (budget %.0f) blocks=%d trend=%s MB/h",
+                        rss_mb, self.budget_mb, sample["allocated_blocks"],
+                        f"{trend:+.1f}" if trend is not None else "n/a")
+            if trend is not None and trend > self.leak_warn_mb_per_hour:
+                logger.warning("Memory growing %.1f MB/h over the last %.1fh — possible leak.",
+                               trend, self._span_seconds() / 3600)
+        return sample
+
+    def shed(self, reason: str) -> dict:
+        """Run every shedder, then gc + malloc_trim. Returns a per-shedder result map."""
+        before = self._rss_reader()
+        results = {}
+        for name, fn in self._shedders.items():
+            try:
+                fn()
+                results[name] = "ok"
+            except Exception as e:
+                results[name] = f"error: {e}"
+        collected = gc.collect()
+        trimmed = _malloc_trim()
+        after = self._rss_reader()
+        self._last_shed = self._clock()
+        self.sheds += 1
+        logger.warning("Memory shed (%s): %s; gc freed %d objects, malloc_trim=%s, rss %s -> %s MB",
+                       reason, results, collected, trimmed,
+                       round(before / _MB, 1) if before else None, round(after / _MB, 1) if after else None)
+        return results
+
+    def _span_seconds(self) -> float:
+        with self._lock:
+            return self._samples[-1][0] - self._samples[0][0] if len(self._samples) > 1 else 0.0
+
+    def trend_mb_per_hour(self) -> float | None:
+        """Least-squares RSS slope over the sample window; None until 30 min of samples exist."""
+        with self._lock:
+            points = list(self._samples)
+        if len(points) < 3 or points[-1][0] - points[0][0] < _MIN_TREND_SPAN_SECONDS:
+            return None
+        n = len(points)
+        mean_t = sum(t for t, _ in points) / n
+        mean_m = sum(m for _, m in points) / n
+        var = sum((t - mean_t) ** 2 for t, _ in points)
+        if var == 0:
+            return None
+        slope = sum((t - mean_t) * (m - mean_m) for t, m in points) / var
+        return round(slope * 3600, 2)
+
+    # ------------------------------------------------------------------
+    # Per-session growth
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def session(self, title: str):
+        """Record RSS / heap growth across one scanning session."""
+        start_rss = self._rss_reader()
+        start_blocks = sys.getallocatedblocks()
+        started = self._clock()
+        self._open_session = {"title": title}
+        try:
+            yield
+        finally:
+            self._open_session = None
+            end_rss = self._rss_reader()
+            record = {
+                "title": title,
+                "duration_s": round(self._clock() - started),
+                "growth_mb": round((end_rss - start_rss) / _MB, 1) if end_rss and start_rss else None,
+                "block_growth": sys.getallocatedblocks() - start_blocks,
+            }
+            with self._lock:
+                self._sessions.append(record)
+                recent = [s["growth_mb"] for s in list(self._sessions)[-5:]]
+            logger.info("Session memory for %s: %s MB, %+d blocks", title, record["growth_mb"], record["block_growth"])
+            if len(recent) == 5 and all(g is not None and g > 0 for g in recent):
+                logger.warning("RSS grew in each of the last 5 sessions (%s MB) — possible leak.", recent)
+
+    # ------------------------------------------------------------------
+    # Thread / reporting
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("Memory watchdog started (budget %.0f MB, shed at %.0f%%).", self.budget_mb, self.shed_ratio * 100)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error("Memory watchdog sample failed: %s", e)
+            self._stop.wait(self.interval)
+
+    def status(self) -> dict:
+        """JSON-safe snapshot for the health server."""
+        with self._lock:
+            sessions = list(self._sessions)
+            last = dict(self.last_sample) if self.last_sample else None
+        return {
+            "budget_mb": self.budget_mb,
+            "shed_at_mb": round(self.budget_mb * self.shed_ratio, 1),
+            "last_sample": last,
+            "trend_mb_per_hour": self.trend_mb_per_hour(),
+            "samples": self.samples_taken,
+            "sheds": self.sheds,
+            "shedders": sorted(self._shedders),
+            "open_session": self._open_session,
+            "sessions": sessions,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide watchdog used by scheduler.py
+# ---------------------------------------------------------------------------
+_watchdog = MemoryWatchdog()
+
+
+def get_watchdog() -> MemoryWatchdog:
+    return _watchdog
+
+
+def register_shedder(name: str, fn: Callable[[], object]) -> None:
+    _watchdog.register_shedder(name, fn)
+
+
+def start() -> MemoryWatchdog:
+    _watchdog.start()
+    return _watchdog
+
+
+def stop() -> None:
+    _watchdog.stop()
+
+
+def session(title: str):
+    return _watchdog.session(title)
+
+
+def status() -> dict:
+    return _watchdog.status()
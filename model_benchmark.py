@@ -0,0 +1,156 @@
+# model_benchmark.py — Memory / access-cost benchmark for models.py on large synthetic schedules.
+# Run: `python model_benchmark.py [--events N] [--leagues N]`
+# Compares three representations of the same Gamma /events payload, held twice
+# (the "live" and "schedule" caches overlap): raw dicts as Gamma sends them, the
+# old projected dicts, and slotted models.Event objects with interned strings.
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from tabulate import tabulate
+
+import clock
+import scanner
+from models import Event
+
+# What the bot used to keep per event / market before models.py (dict projection)
+_DICT_EVENT_FIELDS = ("id", "title", "slug", "startTime", "startDate", "gameId")
+_DICT_MARKET_FIELDS = ("conditionId", "condition_id", "question", "bestAsk", "clobTokenIds")
+
+
+def synthetic_payload(events: int, leagues: int = 40, markets: int = 3, seed: int = 11,
+                      start: datetime | None = None, spread_minutes: int = 48 * 60) -> str:
+    """JSON text shaped like Gamma /events: every field Gamma sends, team names shared across fixtures."""
+    rng = random.Random(seed)
+    teams = [f"Club {i} {'United' if i % 3 else 'City'}" for i in range(leagues * 20)]
+    start = start or datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    rows = []
+    for i in range(events):
+        league = i % leagues
+        home, away = rng.sample(teams[league * 20:(league + 1) * 20], 2)
+        kickoff = start + timedelta(minutes=15 * rng.randrange(max(spread_minutes // 15, 1)))
+        kickoff = kickoff.strftime("%Y-%m-%dT%H:%M:%SZ")
+        rows.append({
+            "id": str(100000 + i),
+            "ticker": f"league-{league}-{i}",
+            "slug": f"league-{league}-{home}-{away}".lower().replace(" ", "-"),
+            "title": f"{home} vs. {away}",
+            "description": f"League {league} fixture between {home} and {away}. " * 4,
+            "startDate": kickoff, "startTime": kickoff, "endDate": kickoff, "creationDate": kickoff,
+            "image": f"https://polymarket-upload.s3.amazonaws.com/league-{league}.png",
+            "icon": f"https://polymarket-upload.s3.amazonaws.com/league-{league}.png",
+            "active": True, "closed": False, "archived": False, "featured": False,
+            "liquidity": rng.uniform(1000, 50000), "volume": rng.uniform(1000, 500000),
+            "gameId": 900000 + i,
+            "tags": [{"id": "100350", "label": "Soccer", "slug": "soccer"},
+                     {"id": str(200 + league), "label": f"League {league}", "slug": f"league-{league}"}],
+            "markets": [{
+                "id": str(500000 + i * markets + m),
+                "conditionId": f"0x{rng.getrandbits(256):064x}",
+                "question": f"Will {(home, away, 'the match')[m % 3]} win?" if m < 2 else f"{home} vs. {away}: draw?",
+                "outcomes": '["Yes", "No"]',
+                "outcomePrices": '["0.55", "0.45"]',
+                "bestAsk": round(rng.uniform(0.05, 0.95), 3),
+                "bestBid": round(rng.uniform(0.05, 0.95), 3),
+                "clobTokenIds": json.dumps([str(rng.getrandbits(250)), str(rng.getrandbits(250))]),
+                "description": "This market resolves to Yes if ... " * 6,
+                "image": f"https://polymarket-upload.s3.amazonaws.com/league-{league}.png",
+                "volume": "12345.67", "liquidity": "2345.6", "active": True, "closed": False,
+            } for m in range(markets)],
+        })
+    return json.dumps(rows)
+
+
+def _project_dict(event: dict) -> dict:
+    projected = {k: event[k] for k in _DICT_EVENT_FIELDS if k in event}
+    projected["markets"] = [{k: m[k] for k in _DICT_MARKET_FIELDS if k in m} for m in event.get("markets") or []]
+    return projected
+
+
+def _measure(build) -> tuple[object, int]:
+    """Build two copies (two caches) from freshly parsed JSON; bytes still held afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, after - before
+
+
+def _dict_access(events: list[dict]) -> int:
+    """Hot-path reads the dict-based scanner did per event and market each scan."""
+    hits = 0
+    for event in events:
+        if event.get("title", "") and event.get("startTime"):
+            datetime.fromisoformat(event["startTime"].replace("Z", "+00:00"))
+            for market in event.get("markets", []):
+                if market.get("conditionId") or market.get("condition_id", ""):
+                    hits += 1
+    return hits
+
+
+def _model_access(events: list[Event]) -> int:
+    hits = 0
+    for event in events:
+        if event.title and event.kickoff:
+            for market in event.markets:
+                if market.condition_id:
+                    hits += 1
+    return hits
+
+
+def _best_of(fn, arg, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(events: int = 20000, leagues: int = 40) -> dict:
+    payload = synthetic_payload(events, leagues)
+    raw, raw_bytes = _measure(lambda: [json.loads(payload) for _ in range(2)])
+    dicts, dict_bytes = _measure(lambda: [[_project_dict(e) for e in json.loads(payload)] for _ in range(2)])
+    models, model_bytes = _measure(lambda: [[Event.from_gamma(e) for e in json.loads(payload)] for _ in range(2)])
+    del raw
+
+    dict_s = _best_of(_dict_access, dicts[0])
+    model_s = _best_of(_model_access, models[0])
+
+    # One scan over everything at a fixed time, dicts (parsed per scan) vs pre-parsed models
+    prices = {m.condition_id: m.best_ask for e in models[0] for m in e.markets}
+    previous = clock.set_clock(clock.VirtualClock(datetime(2026, 3, 1, 14, 0, tzinfo=timezone.utc)))
+    try:
+        scan_dict_s = _best_of(lambda evs: scanner.filter_opportunities(evs, prices), dicts[0], repeat=3)
+        scan_model_s = _best_of(lambda evs: scanner.filter_opportunities(evs, prices), models[0], repeat=3)
+    finally:
+        clock.set_clock(previous)
+
+    per_event = lambda total: round(total / (2 * events))
+    return {
+        "events": events,
+        "raw_bytes_per_event": per_event(raw_bytes),
+        "dict_bytes_per_event": per_event(dict_bytes),
+        "model_bytes_per_event": per_event(model_bytes),
+        "memory_saving_vs_dict": f"{1 - model_bytes / dict_bytes:.0%}",
+        "dict_access_us_per_event": round(dict_s / events * 1e6, 3),
+        "model_access_us_per_event": round(model_s / events * 1e6, 3),
+        "scan_dicts_ms": round(scan_dict_s * 1000, 1),
+        "scan_models_ms": round(scan_model_s * 1000, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark models.py against dict events.")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--leagues", type=int, default=40)
+    args = parser.parse_args()
+    print(tabulate(run(args.events, args.leagues).items(), headers=["Metric", "Value"]))
@@ -0,0 +1,198 @@
+# models.py — Compact typed models for Gamma events, markets, scheduled runs and opportunities.
+# Single Responsibility: parse raw API / state dicts into slotted objects that keep
+# only the fields this bot reads. Repeated strings (titles, slugs, ids, questions)
+# are interned, so every cache refresh and scan shares one copy of each.
+#
+# Models still answer the old dict lookups (event["title"], opp.get("token_id"))
+# so display, Telegram and older call sites keep working; hot paths use attributes.
+
+import json
+import sys
+from datetime import datetime
+
+
+def _intern(value) -> str | None:
+    if value is None or value == "":
+        return None
+    return sys.intern(value if isinstance(value, str) else str(value))
+
+
+def _parse_time(value) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class _Model:
+    """Slotted base: legacy dict-style reads plus equality / hashing on the subclass's _key() tuple."""
+
+    __slots__ = ()
+    _KEYS: dict[str, str] = {}  # Legacy dict key -> attribute name
+
+    def __getitem__(self, key: str):
+        attr = self._KEYS.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def get(self, key: str, default=None):
+        """dict.get() over the legacy keys; unset (None) fields return default."""
+        attr = self._KEYS.get(key)
+        value = getattr(self, attr) if attr is not None else None
+        return default if value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, attr) for key, attr in self._KEYS.items()}
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Market(_Model):
+    """One Gamma market: condition id, question, best ask and the YES token id."""
+
+    __slots__ = ("condition_id", "question", "best_ask", "token_id")
+    # No "clobTokenIds": only the YES token is kept, so market["clobTokenIds"] fails loudly
+    _KEYS = {"conditionId": "condition_id", "condition_id": "condition_id", "question": "question",
+             "bestAsk": "best_ask"}
+
+    def __init__(self, condition_id: str | None, question: str | None = None,
+                 best_ask: float | None = None, token_id: str | None = None) -> None:
+        self.condition_id = condition_id
+        self.question = question
+        self.best_ask = best_ask
+        self.token_id = token_id
+
+    @classmethod
+    def from_gamma(cls, data: dict) -> "Market":
+        token_ids = data.get("clobTokenIds") or []
+        if isinstance(token_ids, str):
+            try:
+                token_ids = json.loads(token_ids)  # Gamma often sends a JSON-encoded list
+            except ValueError:
+                token_ids = []
+        return cls(
+            condition_id=_intern(data.get("conditionId") or data.get("condition_id")),
+            question=_intern(data.get("question")),
+            best_ask=_to_float(data.get("bestAsk")),
+            # clobTokenIds[0] = YES token (Gamma fallback; authoritative lookup done at bet time)
+            token_id=_intern(token_ids[0]) if token_ids else None,
+        )
+
+    def _key(self) -> tuple:
+        return (self.condition_id,)
+
+
+class Event(_Model):
+    """One Gamma event (a match or one of its sub-markets) with parsed times."""
+
+    __slots__ = ("id", "title", "slug", "kickoff", "listed", "game_id", "markets")
+    _KEYS = {"id": "id", "title": "title", "slug": "slug", "startTime": "start_time",
+             "startDate": "start_date", "gameId": "game_id", "markets": "markets"}
+
+    def __init__(self, id: str, title: str = "", slug: str | None = None, kickoff: datetime | None = None,
+                 listed: datetime | None = None, game_id: str | None = None,
+                 markets: tuple[Market, ...] = ()) -> None:
+        self.id = id
+        self.title = title
+        self.slug = slug
+        self.kickoff = kickoff    # startTime
+        self.listed = listed      # startDate (Gamma sort key)
+        self.game_id = game_id
+        self.markets = markets
+
+    @classmethod
+    def from_gamma(cls, data: dict) -> "Event":
+        return cls(
+            id=_intern(data.get("id")) or "",
+            title=_intern(data.get("title")) or "",
+            slug=_intern(data.get("slug")),
+            kickoff=_parse_time(data.get("startTime")),
+            listed=_parse_time(data.get("startDate")),
+            game_id=_intern(data.get("gameId")),
+            markets=tuple(Market.from_gamma(m) for m in data.get("markets") or () if isinstance(m, dict)),
+        )
+
+    @classmethod
+    def coerce(cls, event) -> "Event":
+        """Pass Events through, parse raw Gamma dicts (tests, simulation, recorded data)."""
+        return event if isinstance(event, cls) else cls.from_gamma(event)
+
+    @property
+    def start_time(self) -> str | None:
+        return self.kickoff.strftime("%Y-%m-%dT%H:%M:%SZ") if self.kickoff else None
+
+    @property
+    def start_date(self) -> str | None:
+        return self.listed.strftime("%Y-%m-%dT%H:%M:%SZ") if self.listed else None
+
+    def _key(self) -> tuple:
+        return (self.id,)
+
+
+class Run(_Model):
+    """A scheduled scanning session for one match."""
+
+    __slots__ = ("title", "kickoff", "wakeup_time", "end_time", "event_id")
+    _KEYS = {"title": "title", "kickoff": "kickoff", "wakeup_time": "wakeup_time", "end_time": "end_time",
+             "event_id": "event_id"}
+
+    def __init__(self, title: str, kickoff: datetime | None, wakeup_time: datetime, end_time: datetime,
+                 event_id: str | None = None) -> None:
+        self.title = title
+        self.kickoff = kickoff
+        self.wakeup_time = wakeup_time
+        self.end_time = end_time
+        self.event_id = event_id  # Gamma event id (None in snapshots from before schedule_store.py)
+
+    @classmethod
+    def from_dict(cls, data) -> "Run":
+        if isinstance(data, cls):
+            return data
+        return cls(_intern(data.get("title")) or "", data.get("kickoff"), data["wakeup_time"], data["end_time"],
+                   _intern(data.get("event_id")))
+
+    def _key(self) -> tuple:
+        return (self.title, self.end_time)
+
+
+class Opportunity(_Model):
+    """A market at or above WIN_PROB_THRESHOLD inside the 75-90+ minute window."""
+
+    __slots__ = ("match", "minute", "outcome", "poly_prob", "market_url", "token_id", "condition_id")
+    _KEYS = {name: name for name in __slots__}
+
+    def __init__(self, match: str, minute: int, outcome: str, poly_prob: float, market_url: str,
+                 token_id: str | None = None, condition_id: str | None = None) -> None:
+        self.match = match
+        self.minute = minute
+        self.outcome = outcome
+        self.poly_prob = poly_prob
+        self.market_url = market_url
+        self.token_id = token_id
+        self.condition_id = condition_id
+
+    def _key(self) -> tuple:
+        return (self.condition_id, self.match, self.outcome, self.minute, self.poly_prob)
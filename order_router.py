@@ -0,0 +1,209 @@
+# order_router.py — Spreads live CLOB orders across several wallets / API keys.
+# Single Responsibility: hold one warm ClobClient per configured credential set,
+# account each key's order rate and in-flight orders, and lease the least-loaded
+# key to each order. Budget per wallet is enforced by RiskManager, not here.
+#
+# Credential sets: CLOB_PK / CLOB_API_KEY / CLOB_API_SECRET / CLOB_API_PASSPHRASE
+# is wallet "1"; the same four names with a _2, _3, ... suffix add wallets
+# "2", "3", ... (up to CLOB_MAX_WALLETS). Incomplete sets are skipped with a warning.
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import (
+    CLOB_HOST,
+    CLOB_CHAIN_ID,
+    CLOB_MAX_WALLETS,
+    CLOB_ORDER_RATE_PER_SECOND,
+    CLOB_ORDER_BURST,
+    CLOB_WALLET_MAX_IN_FLIGHT,
+    CLOB_RATE_LIMIT_COOLDOWN_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+CREDENTIAL_VARS = ("CLOB_PK", "CLOB_API_KEY", "CLOB_API_SECRET", "CLOB_API_PASSPHRASE")
+
+
+def load_credentials(environ=None) -> dict[str, dict[str, str]]:
+    """Complete credential sets from the environment: wallet name -> {CLOB_PK: ..., ...}."""
+    environ = os.environ if environ is None else environ
+    wallets = {}
+    for index in range(1, CLOB_MAX_WALLETS + 1):
+        suffix = "" if index == 1 else f"_{index}"
+        creds = {var: environ.get(var + suffix, "").strip() for var in CREDENTIAL_VARS}
+        present = [var for var, value in creds.items() if value]
+        if len(present) == len(CREDENTIAL_VARS):
+            wallets[str(index)] = creds
+        elif present:
+            missing = [var + suffix for var, value in creds.items() if not value]
+            logger.warning("Wallet %d skipped — missing %s", index, ", ".join(missing))
+    return wallets
+
+
+def build_client(creds: dict[str, str]):
+    """Authenticated ClobClient for one credential set."""
+    from py_clob_client.client import ClobClient
+    from py_clob_client.clob_types import ApiCreds
+
+    return ClobClient(
+        host=CLOB_HOST,
+        chain_id=CLOB_CHAIN_ID,
+        key=creds["CLOB_PK"],
+        creds=ApiCreds(
+            api_key=creds["CLOB_API_KEY"],
+            api_secret=creds["CLOB_API_SECRET"],
+            api_passphrase=creds["CLOB_API_PASSPHRASE"],
+        ),
+    )
+
+
+class RateLimiter:
+    """Token bucket: `rate` orders per second sustained, up to `burst` back-to-back."""
+
+    def __init__(self, rate: float, burst: int, monotonic=time.monotonic) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._monotonic = monotonic
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> float:
+        now = self._monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def reserve(self) -> float:
+        """Take one token; returns seconds to wait before using it (0 when one was available)."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def wait_estimate(self) -> float:
+        """Seconds until a token would be free, without taking one."""
+        with self._lock:
+            self._refill()
+            return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so the next order waits at least `seconds` (after an HTTP 429)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class Wallet:
+    """One credential set: lazily built, reused client plus its own rate and load accounting."""
+
+    def __init__(self, name: str, creds: dict[str, str], client_factory=build_client,
+                 rate: float = CLOB_ORDER_RATE_PER_SECOND, burst: int = CLOB_ORDER_BURST,
+                 max_in_flight: int = CLOB_WALLET_MAX_IN_FLIGHT) -> None:
+        self.name = name
+        self._creds = creds
+        self._client_factory = client_factory
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.limiter = RateLimiter(rate, burst)
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.in_flight = 0
+        self.orders = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.throttled_seconds = 0.0
+
+    @property
+    def address(self) -> str:
+        from eth_account import Account
+
+        try:
+            return Account.from_key(self._creds["CLOB_PK"]).address
+        except Exception as e:
+            return f"INVALID({e})"
+
+    @property
+    def api_key_prefix(self) -> str:
+        return self._creds["CLOB_API_KEY"][:8]
+
+    def client(self):
+        """Warm client for this key (built on first use, reused for every later order)."""
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._client_factory(self._creds)
+            return self._client
+
+    def status(self) -> dict:
+        return {"wallet": self.name, "in_flight": self.in_flight, "orders": self.orders,
+                "errors": self.errors, "rate_limited": self.rate_limited,
+                "throttled_s": round(self.throttled_seconds, 3)}
+
+
+class OrderRouter:
+    """Leases wallets to orders: fewest in-flight orders first, then shortest rate-limit wait."""
+
+    def __init__(self, wallets: list[Wallet], sleep=time.sleep) -> None:
+        if not wallets:
+            raise ValueError("OrderRouter needs at least one wallet")
+        self.wallets = {w.name: w for w in wallets}
+        self._lock = threading.Lock()
+        self._sleep = sleep
+
+    @classmethod
+    def from_env(cls, environ=None, client_factory=build_client) -> "OrderRouter":
+        creds = load_credentials(environ)
+        if not creds:
+            raise EnvironmentError(f"Missing CLOB credentials: {', '.join(CREDENTIAL_VARS)}")
+        return cls([Wallet(name, c, client_factory) for name, c in creds.items()])
+
+    @staticmethod
+    def _load(wallet: Wallet) -> tuple:
+        return wallet.in_flight, wallet.limiter.wait_estimate(), wallet.name
+
+    def names(self) -> list[str]:
+        """Wallet names, least loaded first (RiskManager assigns budget in this order)."""
+        with self._lock:
+            ranked = sorted(self.wallets.values(), key=self._load)
+        return [w.name for w in ranked]
+
+    @contextmanager
+    def lease(self, name: str | None = None):
+        """
+        Hold one order slot on a wallet (the named one, else the least loaded)
+        and wait out its rate limit before yielding it.
+        """
+        with self._lock:
+            wallet = self.wallets[name] if name is not None else min(self.wallets.values(), key=self._load)
+            wallet.in_flight += 1
+        try:
+            with wallet.slots:
+                wait = wallet.limiter.reserve()
+                if wait > 0:
+                    with self._lock:
+                        wallet.throttled_seconds += wait
+                    logger.info("Wallet %s rate limited — order waits %.2fs", wallet.name, wait)
+                    self._sleep(wait)
+                try:
+                    yield wallet
+                except Exception as e:
+                    rate_limited = "429" in str(e)
+                    with self._lock:
+                        wallet.errors += 1
+                        wallet.rate_limited += rate_limited
+                    if rate_limited:
+                        wallet.limiter.penalize(CLOB_RATE_LIMIT_COOLDOWN_SECONDS)
+                        logger.warning("Wallet %s hit the CLOB rate limit — resting it %ds",
+                                       wallet.name, CLOB_RATE_LIMIT_COOLDOWN_SECONDS)
+                    raise
+                with self._lock:
+                    wallet.orders += 1
+        finally:
+            with self._lock:
+                wallet.in_flight -= 1
+
+    def status(self) -> list[dict]:
+        return [w.status() for w in self.wallets.values()]
@@ -0,0 +1,310 @@
+# paper_trading.py — Paper-trading execution backend and mock CLOB.
+# Single Responsibility: fill FOK market orders against recorded or synthetic
+# order books with configurable latency, and record every attempt to a ledger.
+# Selected via trader.set_backend() or EXECUTION_BACKEND / MINUTEBID_EXECUTION_BACKEND="paper".
+#
+# Burst benchmark (orders/sec, time-to-fill, RiskManager behaviour):
+#   python paper_trading.py --orders 2000 --tokens 500 --latency-ms 50
+
+import argparse
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+import clock
+from bench_harness import overrides
+from latency_stats import percentile
+from config import (
+    BET_STAKE_USD,
+    PAPER_LATENCY_MS,
+    PAPER_LATENCY_JITTER_MS,
+    PAPER_BOOK_FILE,
+    PAPER_SYNTHETIC_PRICE,
+    PAPER_SYNTHETIC_DEPTH_USD,
+    PAPER_LEDGER_FILE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PaperOrderError(Exception):
+    """Rejected paper order. Messages mirror the CLOB errors execution.py recognises."""
+
+
+class OrderBook:
+    """Ask side of one token's book: [[price, size_in_shares], ...], best ask first."""
+
+    def __init__(self, asks: list) -> None:
+        levels = []
+        for level in asks:
+            if isinstance(level, dict):  # CLOB /book format: {"price": "0.85", "size": "100"}
+                level = (level.get("price"), level.get("size"))
+            price, size = float(level[0]), float(level[1])
+            if size > 0:
+                levels.append([price, size])
+        self.asks = sorted(levels)
+        self._lock = threading.Lock()
+
+    def fill_fok(self, amount_usdc: float) -> tuple[float, float]:
+        """
+        Buy amount_usdc worth of shares walking the asks, all or nothing.
+        Consumes the liquidity taken. Returns (shares, average_price).
+        """
+        with self._lock:
+            remaining = amount_usdc
+            shares = 0.0
+            taken = []
+            for i, (price, size) in enumerate(self.asks):
+                cost = price * size
+                if cost >= remaining:
+                    part = remaining / price
+                    shares += part
+                    taken.append((i, part))
+                    remaining = 0.0
+                    break
+                shares += size
+                taken.append((i, size))
+                remaining -= cost
+            if remaining > 1e-9 or shares == 0:
+                raise PaperOrderError("no match")
+            for i, size in taken:
+                self.asks[i][1] -= size
+            self.asks = [level for level in self.asks if level[1] > 1e-9]
+        return shares, amount_usdc / shares
+
+    @property
+    def depth_usd(self) -> float:
+        return sum(price * size for price, size in self.asks)
+
+
+def synthetic_book(best_ask: float = PAPER_SYNTHETIC_PRICE, levels: int = 5,
+                   depth_usd: float = PAPER_SYNTHETIC_DEPTH_USD, tick: float = 0.01) -> OrderBook:
+    """Evenly stacked asks from best_ask upward, depth_usd of liquidity per level (capped at 0.99)."""
+    asks = []
+    for i in range(levels):
+        price = round(min(best_ask + i * tick, 0.99), 4)
+        asks.append([price, depth_usd / price])
+    return OrderBook(asks)
+
+
+class RecordedBooks:
+    """
+    Book source backed by a JSON file: {token_id: {"asks": [...]}} or {token_id: [...]}.
+    Each token's book is shared across orders, so fills deplete it like a real book.
+    """
+
+    def __init__(self, data: dict) -> None:
+        self._books = {str(token): OrderBook(book["asks"] if isinstance(book, dict) else book)
+                       for token, book in data.items()}
+
+    @classmethod
+    def load(cls, path: str) -> "RecordedBooks":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __call__(self, token_id: str) -> OrderBook | None:
+        return self._books.get(token_id)
+
+
+class FillLedger:
+    """Thread-safe record of every paper order attempt, optionally appended to a JSONL file."""
+
+    def __init__(self, path: str = "") -> None:
+        self.path = path
+        self.entries: list[dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            self.entries.append(entry)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def fills(self) -> list[dict]:
+        with self._lock:
+            return [e for e in self.entries if e["status"] == "matched"]
+
+    def stats(self) -> dict:
+        """Counts, fill rate over the ledger's lifetime and time-to-fill percentiles (ms)."""
+        with self._lock:
+            entries = list(self.entries)
+        fills = [e for e in entries if e["status"] == "matched"]
+        latencies = sorted(e["latency_ms"] for e in fills)
+        span = (max(e["completed_ts"] for e in entries) - min(e["submitted_ts"] for e in entries)) if entries else 0
+        return {
+            "orders": len(entries),
+            "fills": len(fills),
+            "rejects": len(entries) - len(fills),
+            "filled_usd": round(sum(e["stake"] for e in fills), 2),
+            "fills_per_second": round(len(fills) / span, 1) if span > 0 else None,
+            "time_to_fill_ms_p50": percentile(latencies, 50),
+            "time_to_fill_ms_p95": percentile(latencies, 95),
+            "time_to_fill_ms_max": latencies[-1] if latencies else None,
+        }
+
+
+class PaperTradingBackend:
+    """
+    Drop-in for the live CLOB behind trader.place_order.
+    books(token_id) returns the OrderBook to fill against, or None for an
+    unknown / closed market. Latency is slept outside any lock, so concurrent
+    workers overlap exactly as they would on the network.
+    """
+
+    name = "paper"
+    requires_credentials = False
+
+    def __init__(self, books: Callable[[str], OrderBook | None] | None = None,
+                 latency_ms: float = PAPER_LATENCY_MS, jitter_ms: float = PAPER_LATENCY_JITTER_MS,
+                 ledger: FillLedger | None = None, sleep: Callable[[float], None] = time.sleep,
+                 seed: int | None = None) -> None:
+        self._books = books or (lambda token_id: synthetic_book())
+        self._latency_ms = latency_ms
+        self._jitter_ms = jitter_ms
+        self.ledger = ledger if ledger is not None else FillLedger()
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _latency(self) -> float:
+        with self._rng_lock:
+            jitter = self._rng.uniform(-self._jitter_ms, self._jitter_ms) if self._jitter_ms else 0.0
+        return max(self._latency_ms + jitter, 0.0) / 1000
+
+    def place_order(self, token_id: str, stake_usdc: float, wallet: str | None = None) -> dict:
+        """Same signature as LiveClobBackend.place_order; wallet is only recorded (one paper book for all)."""
+        order_id = f"paper-{next(self._ids)}"
+        submitted = time.perf_counter()
+        entry = {"order_id": order_id, "token_id": token_id, "stake": stake_usdc, "wallet": wallet,
+                 "submitted_at": clock.now().isoformat(), "submitted_ts": time.time()}
+
+        # Half the round-trip before matching, half after — the book can move meanwhile
+        latency = self._latency()
+        self._sleep(latency / 2)
+        try:
+            book = self._books(token_id)
+            if book is None:
+                raise PaperOrderError("Invalid token id")
+            shares, avg_price = book.fill_fok(stake_usdc)
+        except PaperOrderError as e:
+            self._sleep(latency / 2)
+            self._record(entry, submitted, status="rejected", error=str(e))
+            raise
+        self._sleep(latency / 2)
+        self._record(entry, submitted, status="matched", shares=round(shares, 6), avg_price=round(avg_price, 6))
+        logger.info("Paper order filled — token_id=%s stake=$%.2f avg=%.4f", token_id, stake_usdc, avg_price)
+        return {
+            "success": True,
+            "orderID": order_id,
+            "status": "matched",
+            "makingAmount": f"{stake_usdc:.6f}",
+            "takingAmount": f"{shares:.6f}",
+            "errorMsg": "",
+        }
+
+    def get_trades(self, after: int | None = None) -> list[dict]:
+        """Paper fills in the CLOB /data/trades shape (bet_ledger.Reconciler)."""
+        return [{"taker_order_id": e["order_id"], "asset_id": e["token_id"], "size": e["shares"],
+                 "price": e["avg_price"], "status": "CONFIRMED", "match_time": int(e["completed_ts"])}
+                for e in self.ledger.fills() if after is None or e["completed_ts"] >= after]
+
+    def _record(self, entry: dict, submitted: float, **fields) -> None:
+        entry.update(fields, latency_ms=round((time.perf_counter() - submitted) * 1000, 3),
+                     completed_ts=time.time())
+        self.ledger.record(entry)
+
+
+def from_config() -> PaperTradingBackend:
+    """Backend built from config.PAPER_* (used by trader when EXECUTION_BACKEND="paper")."""
+    books = RecordedBooks.load(PAPER_BOOK_FILE) if PAPER_BOOK_FILE else None
+    return PaperTradingBackend(books=books, ledger=FillLedger(PAPER_LEDGER_FILE))
+
+
+# ---------------------------------------------------------------------------
+# Burst benchmark through execution.py + RiskManager
+# ---------------------------------------------------------------------------
+
+def run_burst(orders: int, tokens: int, budget: float, latency_ms: float, jitter_ms: float,
+              seed: int = 7) -> dict:
+    """
+    Push one burst of `orders` opportunities spread over `tokens` distinct tokens
+    through execution.execute_opportunities with a fresh RiskManager and the
+    paper backend. Telegram is silenced for the run.
+    """
+    import execution
+    import telegram_client
+    import trader
+    from risk_manager import RiskManager
+
+    rng = random.Random(seed)
+    opportunities = [{
+        "match": f"Bench {i % tokens}",
+        "minute": 80,
+        "outcome": "Leader",
+        "poly_prob": 0.85,
+        "market_url": "",
+        "token_id": f"bench-tok-{i % tokens}",
+        "condition_id": None,  # Skip the CLOB token lookup — the Gamma token is used as-is
+    } for i in range(orders)]
+    rng.shuffle(opportunities)
+
+    backend = PaperTradingBackend(latency_ms=latency_ms, jitter_ms=jitter_ms, seed=seed)
+    risk = RiskManager(max_budget=budget, stake_per_bet=BET_STAKE_USD)
+    previous_backend = trader.set_backend(backend)
+    try:
+        with overrides([(telegram_client, "send_message", lambda text: 0),
+                        (execution, "alert_cache", execution.AlertStateCache())]):
+            started = time.perf_counter()
+            results = execution.execute_opportunities(opportunities, risk)
+            elapsed = time.perf_counter() - started
+    finally:
+        trader.set_backend(previous_backend)
+
+    fills = backend.ledger.fills()
+    stats = backend.ledger.stats()
+    filled_tokens = Counter(f["token_id"] for f in fills)
+    return {
+        "orders_submitted": orders,
+        "distinct_tokens": tokens,
+        "wall_seconds": round(elapsed, 3),
+        "orders_per_second": round(len(fills) / elapsed, 1) if elapsed else None,
+        **{k: v for k, v in stats.items() if k.startswith("time_to_fill")},
+        "statuses": dict(Counter(results)),
+        "spent_usd": risk.spent,
+        "budget_usd": budget,
+        "budget_respected": risk.spent <= budget and stats["filled_usd"] <= budget,
+        "duplicate_fills": sum(1 for n in filled_tokens.values() if n > 1),
+    }
+
+
+def _main(argv=None) -> dict:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Burst-load the order path against the paper CLOB.")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--budget", type=float, default=250.0)
+    parser.add_argument("--latency-ms", type=float, default=PAPER_LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=PAPER_LATENCY_JITTER_MS)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run_burst(args.orders, args.tokens, args.budget, args.latency_ms, args.jitter_ms)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(tabulate([(k, json.dumps(v) if isinstance(v, dict) else v) for k, v in report.items()],
+                       headers=["Metric", "Value"]))
+    return report
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,19 +1,51 @@
 # polymarket_client.py — HTTP calls to Gamma API and CLOB API.
 # Single responsibility: fetch raw market data. No filtering logic here.
 
+import asyncio
 import logging
 import requests
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import clock
 from config import (
     GAMMA_API_BASE,
     CLOB_API_BASE,
     REQUEST_TIMEOUT_SECONDS,
+    GAMMA_CACHE_TTL_SECONDS,
+    GAMMA_EVENTS_LIMIT,
+    GAMMA_MAX_PAGES,
+    GAMMA_FETCH_WORKERS,
+    LIVE_LOOKBACK_MINUTES,
+    SCHEDULE_LOOKBACK_MINUTES,
+    MIN_MINUTE,
+    MAX_SCHEDULE_HOURS,
     LEAGUE_SERIES_IDS,
-    LEAGUE_TAG_SLUGS
+    LEAGUE_TAG_SLUGS,
+    ASYNC_HTTP_MAX_CONNECTIONS,
+    ASYNC_HTTP_MAX_KEEPALIVE,
 )
+from fetch_cache import AsyncSingleFlightCache, SingleFlightCache
+from models import Event
 
 logger = logging.getLogger(__name__)
 
+# One process-wide cache: discovery, dashboard refresh and every concurrent scan
+# share a single /events fetch per league and window per GAMMA_CACHE_TTL_SECONDS.
+_cache = SingleFlightCache()
+_async_cache = AsyncSingleFlightCache()  # Same role for async_runtime.py (event-loop only)
+
+# Pooled keep-alive connections; explicitly ask for compressed bodies.
+_session = requests.Session()
+_session.headers.update({"Accept-Encoding": "gzip, deflate", "Accept": "application/json"})
+
+# Gamma has no server-side field selection, so pages are parsed into slotted
+# models.Event objects (only the fields read downstream, interned strings)
+# right after parsing — before caching — to keep the cached payload small.
+
 
 def _with_retry(func, *args, max_retries=3, initial_delay=1, **kwargs):
     """Execution wrapper with exponential backoff for HTTP requests."""
@@ -37,62 +69,225 @@ def _with_retry(func, *args, max_retries=3, initial_delay=1, **kwargs):
 def _get(url: str, params: dict = None) -> dict | list | None:
     """Shared GET helper with timeout, error handling, and exponential backoff retry."""
     def make_req():
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+        response = _session.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
         response.raise_for_status()
         return response.json()
 
     return _with_retry(make_req)
 
 
-def get_active_soccer_events() -> tuple[list[dict], dict[str, float]]:
+# Series discovered by league_catalog.py, as {league_key: series_id}.
+_catalog_series: dict[str, str] = {}
+
+
+# condition_id -> authoritative CLOB YES token_id (persisted across restarts by scheduler.py)
+_resolved_tokens: dict[str, str] = {}
+
+
+def resolved_tokens() -> dict[str, str]:
+    """Copy of every condition_id -> token_id resolved so far."""
+    return dict(_resolved_tokens)
+
+
+def seed_resolved_tokens(tokens: dict[str, str]) -> None:
+    """Pre-load token resolutions (e.g. from a state snapshot) to skip CLOB lookups."""
+    _resolved_tokens.update(tokens)
+
+
+def clear_resolved_tokens() -> int:
+    """Forget resolved tokens (memory pressure). Returns how many were dropped."""
+    count = len(_resolved_tokens)
+    _resolved_tokens.clear()
+    return count
+
+
+def set_catalog_leagues(series: dict[str, str]) -> None:
+    """Replace the discovered leagues scanned alongside the configured ones."""
+    global _catalog_series
+    _catalog_series = dict(series)
+
+
+def _league_queries() -> list[tuple[str, str, str]]:
+    """(league, query_param, value) for every configured and discovered league."""
+    queries = [(league, "series_id", sid) for league, sid in LEAGUE_SERIES_IDS.items()]
+    queries += [(league, "tag_slug", slug) for league, slug in LEAGUE_TAG_SLUGS.items()]
+    known = set(LEAGUE_SERIES_IDS.values())
+    queries += [(league, "series_id", sid) for league, sid in _catalog_series.items() if sid not in known]
+    return queries
+
+
+def shard_league_queries(shards: int) -> list[list[tuple[str, str, str]]]:
     """
-    Fetch all active soccer events from specific leagues defined in config.
-    Returns (all_events, market_prices) where market_prices maps condition_id -> bestAsk.
+    Split the league queries into `shards` groups (shard_pool.py). Assignment is
+    by a stable hash of the query value, so a league stays on the same worker
+    (and its warm cache) while leagues are added or removed.
+    """
+    groups: list[list[tuple[str, str, str]]] = [[] for _ in range(max(shards, 1))]
+    for query in _league_queries():
+        groups[zlib.crc32(query[2].encode()) % len(groups)].append(query)
+    return groups
+
+
+def _for_each_league_page(window: str, horizon: datetime, handle,
+                          queries: list[tuple[str, str, str]] | None = None) -> None:
+    """
+    Feed every league's pages (or just `queries`) to handle(page), fetching
+    leagues concurrently (GAMMA_FETCH_WORKERS). Pages are gathered per query and
+    handled on the calling thread in query order (config leagues first), so
+    first-seen-wins accumulators such as _Schedule stay deterministic however the
+    fetches finish.
     """
-    all_events = []
-    seen_ids = set()
-    market_prices = {}
+    def fetch(query):
+        league, param, value = query
+        logger.debug("Fetching %s events (%s %s)", league, param, value)
+        return list(iter_event_pages(param, value, window, horizon))
+
+    if queries is None:
+        queries = _league_queries()
+    with ThreadPoolExecutor(max_workers=min(GAMMA_FETCH_WORKERS, max(len(queries), 1))) as pool:
+        for future in [pool.submit(fetch, q) for q in queries]:
+            for page in future.result():
+                handle(page)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _window_params(window: str) -> dict:
+    """
+    Server-side date bounds for a league query.
+      live:     kickoff between now - LIVE_LOOKBACK_MINUTES and now - MIN_MINUTE
+      schedule: kickoff between now - SCHEDULE_LOOKBACK_MINUTES and now + MAX_SCHEDULE_HOURS
+    Only an upper bound on startDate and a lower bound on endDate are sent:
+    Gamma's startDate can predate kickoff and endDate is never before it, so
+    these bounds can only over-include — callers keep their exact client-side filter.
+    """
+    now = clock.now()
+    if window == "live":
+        return {
+            "end_date_min": _iso(now - timedelta(minutes=LIVE_LOOKBACK_MINUTES)),
+            "start_date_max": _iso(now - timedelta(minutes=MIN_MINUTE)),
+        }
+    return {
+        "end_date_min": _iso(now - timedelta(minutes=SCHEDULE_LOOKBACK_MINUTES)),
+        "start_date_max": _iso(now + timedelta(hours=MAX_SCHEDULE_HOURS)),
+    }
+
+
+def _fetch_event_page(param: str, value: str, window: str, offset: int) -> list | None:
+    """
+    One page of the canonical open-events query for a league and time window
+    ("live" or "schedule"). Callers of the same page share one cached response
+    and concurrent callers coalesce onto one in-flight request.
+    """
+    def fetch():
+        return _project_page(_get(f"{GAMMA_API_BASE}/events", params=_events_params(param, value, window, offset)))
+
+    return _cache.get_or_fetch(("events", window, param, value, offset), fetch, GAMMA_CACHE_TTL_SECONDS)
+
+
+def _events_params(param: str, value: str, window: str, offset: int) -> dict:
+    return {
+        param: value,
+        "active": "true",
+        "closed": "false",
+        "limit": GAMMA_EVENTS_LIMIT,
+        "offset": offset,
+        "order": "startDate",
+        "ascending": "true",
+        **_window_params(window),
+    }
+
+
+def _project_page(data):
+    if not isinstance(data, list):
+        return data
+    return [Event.from_gamma(e) for e in data if isinstance(e, dict)]
+
+
+def _past_horizon(event: Event, horizon: datetime) -> bool:
+    """True if this event (and, by startDate ordering, every later one) kicks off after horizon."""
+    start = event.listed or event.kickoff
+    return start is not None and start > horizon
+
+
+def _next_offset(page: list, offset: int, horizon: datetime | None) -> int | None:
+    """Offset of the page after this one, or None when paging should stop."""
+    if len(page) < GAMMA_EVENTS_LIMIT:
+        return None
+    if horizon is not None and _past_horizon(page[-1], horizon):
+        return None
+    return offset + GAMMA_EVENTS_LIMIT
+
+
+def iter_event_pages(param: str, value: str, window: str,
+                     horizon: datetime | None = None) -> Iterator[list[Event]]:
+    """
+    Lazily yield pages of one league's /events query, one page in memory at a time.
+    Stops on a short or failed page, after the first page whose last event
+    starts beyond horizon (pages are ordered by startDate, which never
+    follows kickoff), or at GAMMA_MAX_PAGES.
+    """
+    offset = 0
+    for _ in range(GAMMA_MAX_PAGES):
+        page = _fetch_event_page(param, value, window, offset)
+        if not isinstance(page, list) or not page:
+            return
+        yield page
+        offset = _next_offset(page, offset, horizon)
+        if offset is None:
+            return
+    logger.warning("Reached GAMMA_MAX_PAGES (%d) for %s=%s — results may be truncated.",
+                   GAMMA_MAX_PAGES, param, value)
+
+
+def clear_cache() -> None:
+    """Drop cached Gamma/CLOB responses (next call refetches)."""
+    _cache.clear()
+    _async_cache.clear()
+
+
+class _ActiveEvents:
+    """Page handler for live scans: unique moneyline events plus condition_id -> bestAsk."""
 
-    def add_events(data):
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+        self.prices: dict[str, float] = {}
+        self._seen_ids: set[str] = set()
+
+    def __call__(self, data) -> None:
         if not isinstance(data, list):
             return
         for event in data:
-            event_id = str(event.get("id"))
-            title = event.get("title", "")
-            if _moneyline_base_title(title) is None:
+            if _moneyline_base_title(event.title) is None:
                 continue  # Skip non-moneyline sub-markets (Player Props, Total Corners, etc.)
-            if event_id not in seen_ids:
-                all_events.append(event)
-                seen_ids.add(event_id)
-                
-                # Extract prices directly from market data in Gamma response
-                for market in event.get("markets", []):
-                    cond_id = market.get("conditionId") or market.get("condition_id")
-                    best_ask = market.get("bestAsk")
-                    if cond_id and best_ask is not None:
-                        try:
-                            # bestAsk in Gamma is already 0.0-1.0 float string or float
-                            market_prices[str(cond_id)] = float(best_ask)
-                        except (ValueError, TypeError):
-                            continue
-
-    # 1. Fetch by Series IDs (Premier League, La Liga, Serie A)
-    for league, series_id in LEAGUE_SERIES_IDS.items():
-        logger.debug("Fetching %s events (series %s)", league, series_id)
-        params = {"series_id": series_id, "active": "true", "closed": "false"}
-        data = _get(f"{GAMMA_API_BASE}/events", params=params)
-        add_events(data)
-
-    # 2. Fetch by Tag Slugs (Bundesliga, Champions League)
-    for league, tag_slug in LEAGUE_TAG_SLUGS.items():
-        logger.debug("Fetching %s events (tag %s)", league, tag_slug)
-        params = {"tag_slug": tag_slug, "active": "true", "closed": "false"}
-        data = _get(f"{GAMMA_API_BASE}/events", params=params)
-        add_events(data)
-
-    logger.info("Found %d unique active soccer events. Resolved %d prices from Gamma.", 
-                len(all_events), len(market_prices))
-    return all_events, market_prices
+            if event.id not in self._seen_ids:
+                self.events.append(event)
+                self._seen_ids.add(event.id)
+
+                # Extract prices directly from market data in Gamma response (bestAsk parsed to float)
+                for market in event.markets:
+                    if market.condition_id and market.best_ask is not None:
+                        self.prices[market.condition_id] = market.best_ask
+
+    def result(self) -> tuple[list[Event], dict[str, float]]:
+        logger.info("Found %d unique active soccer events. Resolved %d prices from Gamma.",
+                    len(self.events), len(self.prices))
+        return self.events, self.prices
+
+
+def get_active_soccer_events(queries: list[tuple[str, str, str]] | None = None) -> tuple[list[Event], dict[str, float]]:
+    """
+    Fetch all active soccer events from specific leagues defined in config
+    (or only `queries`, one shard_league_queries() group, in a shard worker).
+    Only events that kicked off inside the live scan window are requested.
+    Returns (all_events, market_prices) where market_prices maps condition_id -> bestAsk.
+    """
+    collector = _ActiveEvents()
+    horizon = clock.now() - timedelta(minutes=MIN_MINUTE)
+    _for_each_league_page("live", horizon, collector, queries)
+    return collector.result()
 
 
 _WINNER_SUFFIX = " - winner"
@@ -113,25 +308,20 @@ def _moneyline_base_title(title: str) -> str | None:
     return title.strip()
 
 
-def get_soccer_schedule() -> list[dict]:
-    """
-    Fetch upcoming soccer matches from specific leagues.
-    Returns a list of match event dicts with at least 'id', 'title', and 'startTime'.
-    Filters for events that look like individual matches (containing " vs " or " v ").
-    Only includes moneyline (1X2) events — sub-markets (Player Props, Total Corners,
-    Halftime Result, Exact Score, More Markets, Draw No Bet) are excluded entirely.
-    """
-    matches = []
-    seen_ids = set()
-    seen_titles = set()
+class _Schedule:
+    """Page handler for discovery: one moneyline event per match, with a startTime."""
+
+    def __init__(self) -> None:
+        self.matches: list[Event] = []
+        self._seen_ids: set[str] = set()
+        self._seen_titles: set[str] = set()
 
-    def find_matches(data):
+    def __call__(self, data) -> None:
         if not isinstance(data, list):
             return
         for event in data:
-            event_id = str(event.get("id"))
-            title = event.get("title", "")
-            st = event.get("startTime")
+            event_id = event.id
+            title = event.title
             title_lower = title.lower()
             is_match = False
             for term in [" vs ", " vs. ", " v ", " v. "]:
@@ -143,25 +333,45 @@ def get_soccer_schedule() -> list[dict]:
                 base = _moneyline_base_title(title)
                 if base is None:
                     continue  # Non-moneyline sub-market — exclude entirely
-                if event_id not in seen_ids and base not in seen_titles:
-                    if st:
-                        matches.append(event)
-                        seen_ids.add(event_id)
-                        seen_titles.add(base)
+                if event_id not in self._seen_ids and base not in self._seen_titles:
+                    if event.kickoff:
+                        self.matches.append(event)
+                        self._seen_ids.add(event_id)
+                        self._seen_titles.add(base)
 
-    # Fetch from configured leagues
-    for league, series_id in LEAGUE_SERIES_IDS.items():
-        params = {"series_id": series_id, "closed": "false", "limit": 50}
-        data = _get(f"{GAMMA_API_BASE}/events", params=params)
-        find_matches(data)
+    def result(self) -> list[Event]:
+        logger.info("Discovered %d upcoming soccer matches for scheduling.", len(self.matches))
+        return self.matches
 
-    for league, tag_slug in LEAGUE_TAG_SLUGS.items():
-        params = {"tag_slug": tag_slug, "closed": "false", "limit": 50}
-        data = _get(f"{GAMMA_API_BASE}/events", params=params)
-        find_matches(data)
 
-    logger.info("Discovered %d upcoming soccer matches for scheduling.", len(matches))
-    return matches
+def get_soccer_schedule() -> list[Event]:
+    """
+    Fetch upcoming soccer matches from specific leagues (kickoff within
+    MAX_SCHEDULE_HOURS, or recent enough to still have an active session).
+    Returns a list of match Events, each with a kickoff time.
+    Filters for events that look like individual matches (containing " vs " or " v ").
+    Only includes moneyline (1X2) events — sub-markets (Player Props, Total Corners,
+    Halftime Result, Exact Score, More Markets, Draw No Bet) are excluded entirely.
+    """
+    _cache.purge_expired()  # Once per discovery cycle: drop responses no scan will reuse
+    collector = _Schedule()
+    # Fetch from configured leagues (shared cache with dashboard / re-discovery)
+    horizon = clock.now() + timedelta(hours=MAX_SCHEDULE_HOURS)
+    _for_each_league_page("schedule", horizon, collector)
+    return collector.result()
+
+
+def get_sports_metadata() -> list[dict] | None:
+    """Gamma /sports: one entry per sport/competition with its series id and tag ids."""
+    data = _get(f"{GAMMA_API_BASE}/sports")
+    return data if isinstance(data, list) else None
+
+
+def get_series_page(offset: int, limit: int = GAMMA_EVENTS_LIMIT) -> list[dict] | None:
+    """One page of open Gamma /series (carries liquidity and 24h volume)."""
+    params = {"closed": "false", "limit": limit, "offset": offset}
+    data = _get(f"{GAMMA_API_BASE}/series", params=params)
+    return data if isinstance(data, list) else None
 
 
 def get_clob_yes_token_id(condition_id: str) -> str | None:
@@ -170,17 +380,35 @@ def get_clob_yes_token_id(condition_id: str) -> str | None:
     More reliable than Gamma's clobTokenIds field for order placement.
     Returns None on failure (caller should fall back to Gamma's token_id).
     """
-    data = _get(f"{CLOB_API_BASE}/markets/{condition_id}")
-    if not isinstance(data, dict):
-        logger.warning("CLOB /markets lookup returned unexpected type for %s", condition_id)
+    if condition_id in _resolved_tokens:
+        return _resolved_tokens[condition_id]
+
+    def fetch():
+        data = _get(f"{CLOB_API_BASE}/markets/{condition_id}")
+        if not isinstance(data, dict):
+            logger.warning("CLOB /markets lookup returned unexpected type for %s", condition_id)
+            return None
+        for token in data.get("tokens", []):
+            if str(token.get("outcome", "")).lower() == "yes" and token.get("token_id"):
+                _resolved_tokens[condition_id] = str(token["token_id"])
+                return _resolved_tokens[condition_id]
+        logger.warning("No YES token found in CLOB /markets response for %s", condition_id)
         return None
-    for token in data.get("tokens", []):
-        if str(token.get("outcome", "")).lower() == "yes":
-            token_id = token.get("token_id")
-            if token_id:
-                return str(token_id)
-    logger.warning("No YES token found in CLOB /markets response for %s", condition_id)
-    return None
+
+    # ttl=0: concurrent lookups share one request; the answer lives in _resolved_tokens only
+    return _cache.get_or_fetch(("clob_yes_token", condition_id), fetch, 0)
+
+
+def get_markets(condition_ids: list[str]) -> list[dict]:
+    """
+    Gamma /markets for several condition ids in one request (open or closed):
+    closed, outcomePrices, clobTokenIds, umaResolutionStatus. Used by bet_ledger.py.
+    """
+    if not condition_ids:
+        return []
+    data = _get(f"{GAMMA_API_BASE}/markets",
+                params={"condition_ids": list(condition_ids), "limit": len(condition_ids)})
+    return data if isinstance(data, list) else []
 
 
 def get_market_prices(condition_ids: list[str]) -> dict[str, float]:
@@ -190,3 +418,96 @@ def get_market_prices(condition_ids: list[str]) -> dict[str, float]:
     """
     logger.warning("get_market_prices is deprecated. Use get_active_soccer_events return value.")
     return {}
+
+
+# ---------------------------------------------------------------------------
+# asyncio variants for async_runtime.py — same queries, windows, projection and
+# filtering as above, over one pooled httpx.AsyncClient. httpx is imported on
+# first use so the threaded scheduler never pays for it.
+# ---------------------------------------------------------------------------
+_async_client = None
+
+
+def get_async_client():
+    """Shared httpx.AsyncClient (created lazily inside the running event loop)."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        import httpx
+        _async_client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            headers=dict(_session.headers),
+            limits=httpx.Limits(max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                                max_keepalive_connections=ASYNC_HTTP_MAX_KEEPALIVE),
+        )
+    return _async_client
+
+
+def set_async_client(client) -> None:
+    """Install a client (e.g. one with a mock transport in tests)."""
+    global _async_client
+    _async_client = client
+
+
+async def aclose_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+async def _aget(url: str, params: dict = None, max_retries: int = 3, initial_delay: float = 1) -> dict | list | None:
+    """Async _get(): same timeout and exponential-backoff retry, without blocking the loop."""
+    for attempt in range(1, max_retries + 1):
+        try:
+            response = await get_async_client().get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            if attempt == max_retries:
+                logger.error("Max retries reached for request. Last error: %s", e)
+                return None
+            delay = initial_delay * (2 ** (attempt - 1))
+            logger.warning("Request failed (%s). Retrying in %ds... (Attempt %d/%d)",
+                           e, delay, attempt, max_retries)
+            await asyncio.sleep(delay)
+    return None
+
+
+async def _afetch_event_page(param: str, value: str, window: str, offset: int) -> list | None:
+    async def fetch():
+        return _project_page(await _aget(f"{GAMMA_API_BASE}/events", params=_events_params(param, value, window, offset)))
+
+    return await _async_cache.get_or_fetch(("events", window, param, value, offset), fetch, GAMMA_CACHE_TTL_SECONDS)
+
+
+async def _afor_each_league_page(window: str, horizon: datetime, handle) -> None:
+    """Every league concurrently (bounded only by the client's connection pool), pages in order."""
+    async def consume(param: str, value: str):
+        offset = 0
+        for _ in range(GAMMA_MAX_PAGES):
+            page = await _afetch_event_page(param, value, window, offset)
+            if not isinstance(page, list) or not page:
+                return
+            handle(page)  # Single-threaded loop — no lock needed
+            offset = _next_offset(page, offset, horizon)
+            if offset is None:
+                return
+        logger.warning("Reached GAMMA_MAX_PAGES (%d) for %s=%s — results may be truncated.",
+                       GAMMA_MAX_PAGES, param, value)
+
+    await asyncio.gather(*(consume(param, value) for _, param, value in _league_queries()))
+
+
+async def aget_active_soccer_events() -> tuple[list[Event], dict[str, float]]:
+    """Async get_active_soccer_events()."""
+    collector = _ActiveEvents()
+    await _afor_each_league_page("live", clock.now() - timedelta(minutes=MIN_MINUTE), collector)
+    return collector.result()
+
+
+async def aget_soccer_schedule() -> list[Event]:
+    """Async get_soccer_schedule()."""
+    _async_cache.purge_expired()
+    collector = _Schedule()
+    await _afor_each_league_page("schedule", clock.now() + timedelta(hours=MAX_SCHEDULE_HOURS), collector)
+    return collector.result()
@@ -0,0 +1,300 @@
+# profiler.py — Opt-in CPU / memory profiling of scan iterations.
+# Single Responsibility: when armed (env var or health-server endpoint), wrap the
+# next N scans or a whole session in cProfile or tracemalloc and write reports
+# that can be downloaded from the health server.
+# Disarmed cost is one lock-free check per scan.
+#
+# cProfile is deterministic and only sees the scanning (main) thread; order
+# workers in execution.py show up as time spent waiting on their futures.
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+import clock
+from config import PROFILE_DIR, PROFILE_MAX_FILES, PROFILE_TOP_N, PROFILE_TRACEMALLOC_FRAMES
+
+logger = logging.getLogger(__name__)
+
+MODES = ("cpu", "memory")
+
+
+class _Capture:
+    """One profiling capture: a cProfile.Profile or a tracemalloc baseline."""
+
+    def __init__(self, mode: str, scope: str, scans: int | None) -> None:
+        self.mode = mode
+        self.scope = scope
+        self.scans_left = scans
+        self.scans_done = 0
+        self.started_at = clock.now()
+        self._profile: cProfile.Profile | None = None
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._started_tracing = False
+        if mode == "cpu":
+            self._profile = cProfile.Profile()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+                self._started_tracing = True
+            self._baseline = tracemalloc.take_snapshot()
+
+    def resume(self) -> None:
+        if self._profile is not None:
+            self._profile.enable()
+
+    def pause(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+
+    def finish(self, out_dir: str) -> list[str]:
+        """Stop the capture and write its reports. Returns the file names written."""
+        self.pause()
+        os.makedirs(out_dir, exist_ok=True)
+        stem = f"{self.started_at.strftime('%Y%m%dT%H%M%SZ')}-{self.scope}-{self.mode}"
+        if self._profile is not None:
+            return self._write_cpu(out_dir, stem)
+        return self._write_memory(out_dir, stem)
+
+    def _write_cpu(self, out_dir: str, stem: str) -> list[str]:
+        self._profile.dump_stats(os.path.join(out_dir, f"{stem}.prof"))
+        text = io.StringIO()
+        text.write(f"{self.scope} profile, {self.scans_done} scan(s), started {self.started_at.isoformat()}\n")
+        pstats.Stats(self._profile, stream=text).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        with open(os.path.join(out_dir, f"{stem}.txt"), "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+        return [f"{stem}.prof", f"{stem}.txt"]
+
+    def _write_memory(self, out_dir: str, stem: str) -> list[str]:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+        snapshot.dump(os.path.join(out_dir, f"{stem}.tracemalloc"))
+        lines = [f"{self.scope} memory growth, {self.scans_done} scan(s), started {self.started_at.isoformat()}",
+                 f"traced now {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB", ""]
+        for stat in snapshot.compare_to(self._baseline, "lineno")[:PROFILE_TOP_N]:
+            lines.append(str(stat))
+        with open(os.path.join(out_dir, f"{stem}.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return [f"{stem}.tracemalloc", f"{stem}.txt"]
+
+
+class ScanProfiler:
+    """
+    Arm once, capture later. The scanning thread calls scan() around every
+    run_single_scan() and session() around every scanning session; captures
+    start and stop inside those hooks, so arming from another thread is safe.
+    """
+
+    def __init__(self, out_dir: str = PROFILE_DIR) -> None:
+        self.out_dir = out_dir
+        self._lock = threading.Lock()
+        self._armed: dict | None = None
+        self._active: _Capture | None = None
+        self.last_files: list[str] = []
+
+    def arm(self, mode: str = "cpu", scans: int | None = None, session: bool = False) -> dict:
+        """Profile the next `scans` scans, or the next whole session."""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if not session and (scans is None or scans < 1):
+            raise ValueError("scans must be >= 1 unless profiling a session")
+        with self._lock:
+            self._armed = {"mode": mode, "scans": None if session else scans, "session": session}
+        logger.info("Profiler armed: %s", self._armed)
+        return self.status()
+
+    def disarm(self) -> None:
+        with self._lock:
+            self._armed = None
+
+    def status(self) -> dict:
+        with self._lock:
+            active = self._active
+            return {
+                "armed": dict(self._armed) if self._armed else None,
+                "active": {"mode": active.mode, "scope": active.scope, "scans_done": active.scans_done}
+                          if active else None,
+                "last_files": list(self.last_files),
+            }
+
+    @contextmanager
+    def scan(self):
+        """Wrap one scan. Starts / continues / finishes an armed per-scan capture."""
+        if self._armed is None and self._active is None:
+            yield
+            return
+        capture = self._active
+        if capture is None:
+            with self._lock:
+                armed = self._armed
+                if armed is None or armed["session"]:
+                    armed = None
+                else:
+                    self._armed = None
+            if armed is None:
+                yield
+                return
+            capture = self._active = _Capture(armed["mode"], "scans", armed["scans"])
+        if capture.scope == "session":
+            capture.scans_done += 1
+            yield
+            return
+
+        capture.resume()
+        try:
+            yield
+        finally:
+            capture.pause()
+            capture.scans_done += 1
+            capture.scans_left -= 1
+            if capture.scans_left <= 0:
+                self._finish(capture)
+
+    @contextmanager
+    def session(self):
+        """Wrap one scanning session. Runs an armed session capture across all of it."""
+        with self._lock:
+            armed = self._armed
+            if armed is None or not armed["session"] or self._active is not None:
+                armed = None
+            else:
+                self._armed = None
+        if armed is None:
+            yield
+            return
+        capture = self._active = _Capture(armed["mode"], "session", None)
+        capture.resume()
+        try:
+            yield
+        finally:
+            self._finish(capture)
+
+    def _finish(self, capture: _Capture) -> None:
+        try:
+            files = capture.finish(self.out_dir)
+            self.last_files = files
+            logger.info("Profile written: %s", ", ".join(os.path.join(self.out_dir, f) for f in files))
+            self._prune()
+        except OSError as e:
+            logger.error("Could not write profile: %s", e)
+        finally:
+            self._active = None
+
+    def _prune(self) -> None:
+        files = sorted(self.list_files(), reverse=True)
+        for name in files[PROFILE_MAX_FILES:]:
+            try:
+                os.remove(os.path.join(self.out_dir, name))
+            except OSError:
+                pass
+
+    def list_files(self) -> list[str]:
+        if not os.path.isdir(self.out_dir):
+            return []
+        return sorted(name for name in os.listdir(self.out_dir)
+                      if os.path.isfile(os.path.join(self.out_dir, name)))
+
+    def read_file(self, name: str) -> bytes | None:
+        """Contents of a report by bare file name; None if unknown (no path traversal)."""
+        if name not in self.list_files():
+            return None
+        with open(os.path.join(self.out_dir, name), "rb") as f:
+            return f.read()
+
+
+def parse_spec(spec: str) -> dict | None:
+    """
+    Parse a MINUTEBID_PROFILE value: "[cpu:|memory:]scans:N" or "[cpu:|memory:]session".
+    Returns arm() kwargs, or None if the spec is empty / invalid.
+    """
+    parts = [p.strip().lower() for p in spec.split(":") if p.strip()]
+    mode = "cpu"
+    if parts and parts[0] in MODES:
+        mode = parts.pop(0)
+    if parts == ["session"]:
+        return {"mode": mode, "session": True}
+    if len(parts) == 2 and parts[0] == "scans" and parts[1].isdigit() and int(parts[1]) > 0:
+        return {"mode": mode, "scans": int(parts[1])}
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Process-wide profiler used by scheduler.py (scan / session hooks, HTTP routes)
+# ---------------------------------------------------------------------------
+_profiler = ScanProfiler()
+
+
+def get_profiler() -> ScanProfiler:
+    return _profiler
+
+
+def scan():
+    return _profiler.scan()
+
+
+def session():
+    return _profiler.session()
+
+
+def arm_from_env() -> dict | None:
+    """Arm from MINUTEBID_PROFILE at startup. Returns the parsed spec, if any."""
+    spec = os.getenv("MINUTEBID_PROFILE", "").strip()
+    if not spec:
+        return None
+    kwargs = parse_spec(spec)
+    if kwargs is None:
+        logger.warning("Ignoring invalid MINUTEBID_PROFILE=%r", spec)
+        return None
+    _profiler.arm(**kwargs)
+    return kwargs
+
+
+def handle_http(method: str, path: str, query: dict[str, list[str]]) -> tuple[int, str, bytes]:
+    """
+    Health-server routes, all gated by ?token=<MINUTEBID_PROFILE_TOKEN>:
+      GET  /profile                     -> status JSON
+      POST /profile?mode=cpu&scans=5    -> arm (or &session=1, or ?cancel=1)
+      GET  /profile/files               -> report file names
+      GET  /profile/files/<name>        -> download one report
+    Returns (status, content_type, body). 404 everywhere when no token is configured.
+    """
+    token = os.getenv("MINUTEBID_PROFILE_TOKEN", "").strip()
+    if not token:
+        return 404, "text/plain", b"Not found"
+    if query.get("token", [""])[0] != token:
+        return 403, "text/plain", b"Forbidden"
+
+    def _json(status: int, data) -> tuple[int, str, bytes]:
+        return status, "application/json", json.dumps(data).encode()
+
+    path = path.rstrip("/")
+    if path == "/profile" and method == "GET":
+        return _json(200, _profiler.status())
+    if path == "/profile" and method == "POST":
+        if query.get("cancel", ["0"])[0] == "1":
+            _profiler.disarm()
+            return _json(200, _profiler.status())
+        try:
+            scans = query.get("scans", [None])[0]
+            status = _profiler.arm(mode=query.get("mode", ["cpu"])[0],
+                                   scans=int(scans) if scans else None,
+                                   session=query.get("session", ["0"])[0] == "1")
+        except ValueError as e:
+            return _json(400, {"error": str(e)})
+        return _json(200, status)
+    if path == "/profile/files" and method == "GET":
+        return _json(200, _profiler.list_files())
+    if path.startswith("/profile/files/") and method == "GET":
+        body = _profiler.read_file(path[len("/profile/files/"):])
+        if body is None:
+            return 404, "text/plain", b"Not found"
+        return 200, "application/octet-stream", body
+    return 404, "text/plain", b"Not found"
@@ -1,8 +1,10 @@
 # risk_manager.py — Session-scoped bet guard.
 # Tracks budget spent and markets already bet in this session.
 # Single Responsibility: approve or reject a bet before it reaches trader.py.
+# Thread-safe: budget is reserved atomically so orders can be placed concurrently.
 
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -12,17 +14,34 @@ class RiskManager:
     Enforces per-session betting constraints:
       - Hard budget cap (MAX_BET_BUDGET_USD)
       - Fixed stake per bet (BET_STAKE_USD)
-      - Duplicate guard: no two bets on the same token in one session
+      - Duplicate guard: no two bets on the same token in one session, nor on a
+        token any earlier session already bet when a bet_ledger.BetLedger is attached
+      - Optional per-wallet cap (MAX_WALLET_BUDGET_USD) when orders are routed over
+        several wallets (order_router.py); the session cap still bounds the total
 
     One instance is created per game session by scheduler.py and passed to
     run_single_scan() on every scan iteration within that session.
+
+    Concurrent order flow (used by execution.py):
+        reserve(token_id) -> place order -> commit(token_id) on fill
+                                         -> release(token_id) on failure
+    A reservation holds one stake of budget and the token's duplicate slot
+    until it is committed or released, so parallel workers can never
+    overspend the cap or bet the same token twice.
     """
 
-    def __init__(self, max_budget: float, stake_per_bet: float) -> None:
+    def __init__(self, max_budget: float, stake_per_bet: float,
+                 ledger=None, session: str | None = None, wallet_budget: float | None = None) -> None:
         self._max_budget = max_budget
         self._stake = stake_per_bet
+        self._wallet_budget = wallet_budget
         self._spent = 0.0
+        self._wallet_spent: dict[str, float] = {}
         self._placed: set[str] = set()
+        self._reserved: dict[str, str | None] = {}  # token_id -> wallet the stake is held on
+        self._lock = threading.Lock()
+        self.ledger = ledger    # bet_ledger.BetLedger: cross-session duplicate guard + order history
+        self.session = session  # bet_ledger.session_id() of the match session
 
     # ------------------------------------------------------------------
     # Public interface
@@ -32,28 +51,99 @@ class RiskManager:
         """
         Check whether a bet on token_id is permitted.
         Returns (True, "ok") or (False, reason_string).
+        Advisory only — use reserve() when orders may run concurrently.
         """
-        if token_id in self._placed:
-            return False, "duplicate"
-        if self._spent + self._stake > self._max_budget:
-            return False, "budget_exceeded"
-        return True, "ok"
+        with self._lock:
+            return self._check(token_id)
 
-    def record_bet(self, token_id: str) -> None:
+    def record_bet(self, token_id: str, wallet: str | None = None) -> None:
         """Call after a successful order to update session state."""
-        self._placed.add(token_id)
-        self._spent += self._stake
+        with self._lock:
+            spent = self._record(token_id, wallet)
         logger.info(
             "Bet recorded. Session spent: $%.2f / $%.2f",
-            self._spent, self._max_budget,
+            spent, self._max_budget,
         )
 
+    def reserve(self, token_id: str, wallets: list[str] | None = None) -> tuple[bool, str]:
+        """
+        Atomically approve a bet on token_id and hold one stake of budget for it.
+        With `wallets` (order_router names, preferred first) the stake is also
+        held on the wallet with room and the fewest orders in flight — read it
+        back with wallet_of(). Returns (True, "ok") or (False, reason_string).
+        On success the caller must later call commit() or release() for the same token_id.
+        """
+        with self._lock:
+            approved, reason = self._check(token_id)
+            if not approved:
+                return approved, reason
+            wallet = None
+            if wallets:
+                wallet = self._pick_wallet(wallets)
+                if wallet is None:
+                    return False, "wallet_budget_exceeded"
+            self._reserved[token_id] = wallet
+            return True, "ok"
+
+    def wallet_of(self, token_id: str) -> str | None:
+        """Wallet a reservation was assigned to (None = no routing)."""
+        with self._lock:
+            return self._reserved.get(token_id)
+
+    def commit(self, token_id: str) -> None:
+        """Convert a reservation into a recorded bet after the order filled."""
+        with self._lock:
+            if token_id not in self._reserved:
+                logger.warning("commit() without reservation for token %s", token_id)
+            spent = self._record(token_id, self._reserved.get(token_id))
+        logger.info(
+            "Bet recorded. Session spent: $%.2f / $%.2f",
+            spent, self._max_budget,
+        )
+
+    def release(self, token_id: str) -> None:
+        """Drop a reservation after a failed order, returning its budget."""
+        with self._lock:
+            self._reserved.pop(token_id, None)
+
     def block_token(self, token_id: str) -> None:
         """Mark token as do-not-retry for this session without spending budget.
         Use for infrastructure failures (401, 403) that won't resolve mid-session."""
-        self._placed.add(token_id)
+        with self._lock:
+            self._reserved.pop(token_id, None)
+            self._placed.add(token_id)
         logger.warning("Token blocked (no retry this session): %s", token_id)
 
+    # ------------------------------------------------------------------
+    # Persistence (scheduler state snapshot)
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """
+        JSON-safe session state. In-flight reservations are saved as placed and
+        spent: after a crash their outcome is unknown, so never retry them.
+        """
+        with self._lock:
+            return {
+                "max_budget": self._max_budget,
+                "stake": self._stake,
+                "spent": self._spent + len(self._reserved) * self._stake,
+                "placed": sorted(self._placed | self._reserved.keys()),
+                "session": self.session,
+                "wallet_budget": self._wallet_budget,
+                "wallet_spent": {w: self._held_on(w) for w in self._wallets()},
+            }
+
+    @classmethod
+    def restore(cls, data: dict, ledger=None) -> "RiskManager":
+        """Rebuild a session RiskManager from snapshot()."""
+        rm = cls(max_budget=data["max_budget"], stake_per_bet=data["stake"],
+                 ledger=ledger, session=data.get("session"), wallet_budget=data.get("wallet_budget"))
+        rm._spent = float(data.get("spent", 0.0))
+        rm._wallet_spent = {w: float(v) for w, v in (data.get("wallet_spent") or {}).items()}
+        rm._placed = set(data.get("placed", []))
+        return rm
+
     # ------------------------------------------------------------------
     # Read-only properties for logging / Telegram messages
     # ------------------------------------------------------------------
@@ -62,10 +152,64 @@ class RiskManager:
     def spent(self) -> float:
         return self._spent
 
+    @property
+    def reserved(self) -> float:
+        """Budget currently held by in-flight orders."""
+        return len(self._reserved) * self._stake
+
     @property
     def remaining(self) -> float:
-        return self._max_budget - self._spent
+        with self._lock:
+            return self._max_budget - self._spent - len(self._reserved) * self._stake
 
     @property
     def bets_placed(self) -> int:
         return len(self._placed)
+
+    @property
+    def wallet_spent(self) -> dict[str, float]:
+        """Committed spend per wallet (routed orders only)."""
+        with self._lock:
+            return dict(self._wallet_spent)
+
+    # ------------------------------------------------------------------
+    # Internal helpers (caller must hold self._lock)
+    # ------------------------------------------------------------------
+
+    def _check(self, token_id: str) -> tuple[bool, str]:
+        if token_id in self._placed or token_id in self._reserved:
+            return False, "duplicate"
+        if self.ledger is not None and self.ledger.has_bet(token_id):
+            return False, "duplicate"  # Bet in an earlier session / before a restart (indexed lookup)
+        committed_and_held = self._spent + len(self._reserved) * self._stake
+        if committed_and_held + self._stake > self._max_budget:
+            return False, "budget_exceeded"
+        return True, "ok"
+
+    def _wallets(self) -> set[str]:
+        return set(self._wallet_spent) | {w for w in self._reserved.values() if w is not None}
+
+    def _held_on(self, wallet: str) -> float:
+        """Committed plus reserved spend on one wallet."""
+        in_flight = sum(1 for w in self._reserved.values() if w == wallet)
+        return self._wallet_spent.get(wallet, 0.0) + in_flight * self._stake
+
+    def _pick_wallet(self, wallets: list[str]) -> str | None:
+        """Wallet with room for one more stake and the fewest reservations; ties keep the caller's order."""
+        room = [w for w in wallets
+                if self._wallet_budget is None or self._held_on(w) + self._stake <= self._wallet_budget]
+        if not room:
+            return None
+        in_flight = {w: 0 for w in room}
+        for w in self._reserved.values():
+            if w in in_flight:
+                in_flight[w] += 1
+        return min(room, key=lambda w: in_flight[w])
+
+    def _record(self, token_id: str, wallet: str | None = None) -> float:
+        self._reserved.pop(token_id, None)
+        self._placed.add(token_id)
+        self._spent += self._stake
+        if wallet is not None:
+            self._wallet_spent[wallet] = self._wallet_spent.get(wallet, 0.0) + self._stake
+        return self._spent
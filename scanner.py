@@ -1,31 +1,46 @@
 # scanner.py — Pure filter logic. No I/O, no API calls.
 # Takes raw data from Gamma API and returns actionable opportunities.
-# Game minute is estimated from event startTime (no WebSocket required).
+# Game minute comes from the live match clock (match_clock.py snapshot) when
+# available, else it is estimated from event startTime.
 
 import logging
-from datetime import datetime, timezone
-from config import MIN_MINUTE, MAX_MINUTE, WIN_PROB_THRESHOLD, MAX_WIN_PROB_THRESHOLD
+from datetime import datetime
+
+import clock
+from models import Event, Market, Opportunity
+from config import (
+    MIN_MINUTE,
+    MAX_MINUTE,
+    WIN_PROB_THRESHOLD,
+    MAX_WIN_PROB_THRESHOLD,
+    GAME_STATE_MAX_AGE_SECONDS,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def filter_opportunities(
-    events: list[dict],
+    events: list[Event],
     prices: dict[str, float],
-) -> list[dict]:
+    game_states: dict[str, dict[str, dict]] | None = None,
+) -> list[Opportunity]:
     """
     Return opportunities where Polymarket already implies >= WIN_PROB_THRESHOLD
     confidence for one outcome during the 75-90+ minute window.
-    Game minute is estimated from event startTime + elapsed real time.
+    Game minute comes from game_states (live match clock: one map per id type,
+    {"slug": {...}, "event": {...}, "game": {...}}); falls back to event
+    startTime + elapsed real time.
     Signal: go to Polymarket and bet on the leading outcome.
+    Raw Gamma dicts are accepted too (parsed with Event.coerce).
     """
     opportunities = []
-    now = datetime.now(timezone.utc)
+    now = clock.now()
+    game_states = game_states or {}
 
     for event in events:
-        event_id = str(event.get("id", ""))
+        event = Event.coerce(event)
 
-        minute = _estimate_minute(event, now)
+        minute = _match_minute(event, game_states, now)
         if minute is None:
             continue
 
@@ -33,60 +48,86 @@ def filter_opportunities(
             continue
 
         best = _best_outcome(event, prices)
-        if not best:
+        if best is None:
             continue
 
-        if WIN_PROB_THRESHOLD <= best["probability"] < MAX_WIN_PROB_THRESHOLD:
-            opportunities.append({
-                "match": event.get("title", ""),
-                "minute": minute,
-                "outcome": best["outcome"],
-                "poly_prob": best["probability"],
-                "market_url": f"https://polymarket.com/event/{event.get('slug', event_id)}",
-                "token_id": best.get("token_id"),
-                "condition_id": best.get("condition_id"),
-            })
+        price = prices[best.condition_id]
+        if WIN_PROB_THRESHOLD <= price < MAX_WIN_PROB_THRESHOLD:
+            opportunities.append(Opportunity(
+                match=event.title,
+                minute=minute,
+                outcome=best.question or best.condition_id,
+                poly_prob=price,
+                market_url=f"https://polymarket.com/event/{event.slug or event.id}",
+                token_id=best.token_id,
+                condition_id=best.condition_id,
+            ))
 
     logger.info("Found %d opportunities", len(opportunities))
     return opportunities
 
 
-def _estimate_minute(event: dict, now: datetime) -> int | None:
-    """Estimate game minute from event startTime and current UTC time."""
-    start_str = event.get("startTime")
-    if not start_str:
+# Periods during which the match clock is stopped (no extrapolation between updates)
+_STOPPED_PERIODS = {"HT", "BT", "PEN", "BREAK"}
+
+
+def _lookup_game_state(event: Event, game_states: dict[str, dict[str, dict]]) -> dict | None:
+    # Each id is only looked up in its own namespace, so a gameId can't hit another event's id
+    for namespace, value in (("slug", event.slug), ("event", event.id), ("game", event.game_id)):
+        state = game_states.get(namespace, {}).get(value) if value else None
+        if state is not None:
+            return state
+    return None
+
+
+def _live_minute(state: dict, now: datetime) -> int | None:
+    """
+    Current minute from a live game state, extrapolated by the time since the
+    update while the clock runs. Returns None if the state is unusable.
+    """
+    minute = state.get("minute")
+    if minute is None:
         return None
-    try:
-        kickoff = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-        elapsed_minutes = int((now - kickoff).total_seconds() / 60)
-        return elapsed_minutes
-    except (ValueError, TypeError):
+    updated_at = state.get("updated_at")
+    if updated_at is None:
+        return minute
+    age = (now - updated_at).total_seconds()
+    if age > GAME_STATE_MAX_AGE_SECONDS:
+        return None  # Stale — feed likely dropped; use startTime estimate
+    if state.get("live", True) and state.get("period") not in _STOPPED_PERIODS:
+        minute += int(max(age, 0) / 60)
+    return minute
+
+
+def _match_minute(event: Event, game_states: dict[str, dict[str, dict]], now: datetime) -> int | None:
+    """Live match-clock minute when available, else startTime estimate. None = skip event."""
+    state = _lookup_game_state(event, game_states)
+    if state is not None:
+        if state.get("ended"):
+            return None  # Final whistle — nothing left to bet on
+        minute = _live_minute(state, now)
+        if minute is not None:
+            return minute
+    return _estimate_minute(event, now)
+
+
+def _estimate_minute(event: Event, now: datetime) -> int | None:
+    """Estimate game minute from event startTime (parsed kickoff) and current UTC time."""
+    if event.kickoff is None:
         return None
+    try:
+        return int((now - event.kickoff).total_seconds() / 60)
+    except TypeError:
+        return None  # Naive startTime
 
 
-def _best_outcome(event: dict, prices: dict[str, float]) -> dict | None:
-    """Find outcome with highest Polymarket implied probability."""
+def _best_outcome(event: Event, prices: dict[str, float]) -> Market | None:
+    """Market with the highest Polymarket implied probability (None if no market is priced)."""
     best_prob = 0.0
-    best_name = None
-    best_token_id = None
-    best_condition_id = None
-
-    for market in event.get("markets", []):
-        condition_id = market.get("conditionId") or market.get("condition_id", "")
-        price = prices.get(condition_id)
+    best = None
+    for market in event.markets:
+        price = prices.get(market.condition_id or "")
         if price is not None and price > best_prob:
             best_prob = price
-            best_name = market.get("question") or condition_id
-            best_condition_id = condition_id
-            # clobTokenIds[0] = YES token (Gamma fallback; authoritative lookup done at bet time)
-            clob_ids = market.get("clobTokenIds") or []
-            best_token_id = str(clob_ids[0]) if clob_ids else None
-
-    if best_name is None:
-        return None
-    return {
-        "outcome": str(best_name),
-        "probability": best_prob,
-        "token_id": best_token_id,
-        "condition_id": best_condition_id,
-    }
+            best = market
+    return best
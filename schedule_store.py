@@ -0,0 +1,206 @@
+# schedule_store.py — Incremental match schedule for the scheduler loops.
+# Single Responsibility: keep one Run per Gamma event id, merge each discovery
+# fetch into it as deltas (new matches, kickoff changes, cancellations, finished
+# windows) and keep the Runs ordered by wakeup time, so consumers react to
+# ScheduleChange events instead of rebuilding and rescanning the whole list.
+#
+# Unchanged events keep their Run object across discoveries. Runs whose window
+# has already opened are never cancelled by a fetch (Gamma's schedule window can
+# drop a live match); they leave the store when their window ends.
+
+import bisect
+import logging
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Callable, Iterable, NamedTuple
+
+import clock
+from config import MAX_SCHEDULE_HOURS
+from models import Event, Run
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("added", "moved", "updated", "cancelled", "expired")
+
+_wakeup = itemgetter(0)
+
+
+class ScheduleChange(NamedTuple):
+    kind: str                   # One of KINDS
+    run: Run                    # Current Run (the removed one for cancelled / expired)
+    previous: Run | None = None  # Run it replaced (moved / updated)
+
+
+def _store_key(run: Run) -> str:
+    # Snapshots written before runs carried event ids are keyed by title
+    return run.event_id or run.title
+
+
+def summarize(changes: Iterable[ScheduleChange]) -> str:
+    """'2 added, 1 moved' — for discovery log lines."""
+    counts = {}
+    for change in changes:
+        counts[change.kind] = counts.get(change.kind, 0) + 1
+    return ", ".join(f"{counts[k]} {k}" for k in KINDS if k in counts) or "no changes"
+
+
+class ScheduleStore:
+    """
+    store = ScheduleStore(80, 35)
+    store.subscribe(on_changes)        # called with each non-empty list of changes
+    store.apply(get_soccer_schedule()) # -> [ScheduleChange, ...]
+    store.active(now), store.next_wakeup(now), store.runs()
+    """
+
+    def __init__(self, wakeup_delay_minutes: float, session_minutes: float,
+                 horizon_hours: float = MAX_SCHEDULE_HOURS) -> None:
+        self.wakeup_delay = timedelta(minutes=wakeup_delay_minutes)
+        self.session_duration = timedelta(minutes=session_minutes)
+        self.horizon = timedelta(hours=horizon_hours)
+        self.version = 0
+        self._runs: dict[str, Run] = {}
+        self._index: list[tuple[datetime, str]] = []  # (wakeup_time, key), sorted
+        self._sorted: list[Run] | None = None
+        self._listeners: list[Callable[[list[ScheduleChange]], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def runs(self) -> list[Run]:
+        """Runs sorted by wakeup time. The list is rebuilt only after a change; don't mutate it."""
+        if self._sorted is None:
+            self._sorted = [self._runs[key] for _, key in self._index]
+        return self._sorted
+
+    def get(self, event_id: str) -> Run | None:
+        return self._runs.get(event_id)
+
+    def active(self, now: datetime | None = None) -> Run | None:
+        """Earliest-waking Run whose window contains now."""
+        now = now or clock.now()
+        for _, key in self._index[:bisect.bisect_right(self._index, now, key=_wakeup)]:
+            run = self._runs[key]
+            if now < run.end_time:
+                return run
+        return None
+
+    def next_wakeup(self, now: datetime | None = None) -> datetime | None:
+        """First wakeup strictly after now, or None."""
+        now = now or clock.now()
+        i = bisect.bisect_right(self._index, now, key=_wakeup)
+        return self._index[i][0] if i < len(self._index) else None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def subscribe(self, listener: Callable[[list[ScheduleChange]], None]) -> None:
+        self._listeners.append(listener)
+
+    def plan(self, event, now: datetime | None = None) -> Run | None:
+        """Run for one schedule event, or None if it has no kickoff, already finished or is past the horizon."""
+        event = Event.coerce(event)
+        kickoff = event.kickoff
+        if kickoff is None:
+            return None
+        now = now or clock.now()
+        wakeup = kickoff + self.wakeup_delay
+        end = wakeup + self.session_duration
+        if now >= end or kickoff > now + self.horizon:
+            return None
+        return Run(event.title, kickoff, wakeup, end, event_id=event.id or None)
+
+    def apply(self, events: Iterable, now: datetime | None = None, complete: bool = True) -> list[ScheduleChange]:
+        """
+        Merge one discovery fetch. complete=True means `events` is the whole
+        schedule, so stored matches missing from it (and not yet started) are
+        cancelled; an empty fetch is treated as a failed one and cancels nothing.
+        """
+        now = now or clock.now()
+        changes = self._expire(now)
+        seen = set()
+        for event in events:
+            event = Event.coerce(event)
+            run = self.plan(event, now)
+            if run is None:
+                continue
+            key = _store_key(run)
+            seen.add(key)
+            previous = self._runs.get(key)
+            if previous is None:
+                legacy = self._runs.get(run.title)
+                if legacy is not None and legacy.event_id is None:
+                    previous = self._remove(run.title)
+                    self._insert(key, previous)
+            if previous is None:
+                self._insert(key, run)
+                changes.append(ScheduleChange("added", run))
+            elif previous.wakeup_time != run.wakeup_time:
+                self._remove(key)
+                self._insert(key, run)
+                changes.append(ScheduleChange("moved", run, previous))
+            elif previous.title != run.title or previous.event_id != run.event_id:
+                self._runs[key] = run  # Same wakeup: the index entry stays valid
+                changes.append(ScheduleChange("updated", run, previous))
+        if complete and seen:
+            for key, run in list(self._runs.items()):
+                if key not in seen and run.wakeup_time > now:
+                    self._remove(key)
+                    changes.append(ScheduleChange("cancelled", run))
+        self._publish(changes)
+        return changes
+
+    def expire(self, now: datetime | None = None) -> list[ScheduleChange]:
+        """Drop Runs whose window has ended."""
+        changes = self._expire(now or clock.now())
+        self._publish(changes)
+        return changes
+
+    def restore(self, runs: Iterable[Run], now: datetime | None = None) -> None:
+        """Load Runs from a state snapshot (no change events; finished windows are skipped)."""
+        now = now or clock.now()
+        for run in runs:
+            if run.end_time > now:
+                key = _store_key(run)
+                if key in self._runs:
+                    self._remove(key)
+                self._insert(key, run)
+        self.version += 1
+
+    def _expire(self, now: datetime) -> list[ScheduleChange]:
+        # Every Run has the same session length, so windows end in wakeup order
+        changes = []
+        while self._index:
+            run = self._runs[self._index[0][1]]
+            if run.end_time > now:
+                break
+            self._remove(self._index[0][1])
+            changes.append(ScheduleChange("expired", run))
+        return changes
+
+    def _insert(self, key: str, run: Run) -> None:
+        self._runs[key] = run
+        bisect.insort(self._index, (run.wakeup_time, key))
+        self._sorted = None
+
+    def _remove(self, key: str) -> Run:
+        run = self._runs.pop(key)
+        i = bisect.bisect_left(self._index, (run.wakeup_time, key))
+        del self._index[i]
+        self._sorted = None
+        return run
+
+    def _publish(self, changes: list[ScheduleChange]) -> None:
+        if not changes:
+            return
+        self._sorted = None
+        self.version += 1
+        for listener in self._listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                logger.error("Schedule listener failed: %s", e)
@@ -1,23 +1,113 @@
 # scheduler.py — Orchestrates bot runs based on Gamma API soccer schedules.
 # Prevents quota waste by only scanning during the 75-90+ minute window.
 
+import time
+_BOOT_TS = time.monotonic()  # Cold-start reference for the boot timing log
+
+# Only the stdlib and config until the health endpoint is bound (see below)
+import json
 import logging
-import platform
+import os
 import threading
-import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config import RUNTIME
+
+logger = logging.getLogger("scheduler")
+
+
+def runtime_name() -> str:
+    """Configured runtime: MINUTEBID_RUNTIME env var, else config.RUNTIME."""
+    return (os.getenv("MINUTEBID_RUNTIME", "").strip() or RUNTIME).lower()
+
+
+def route_http(method: str, target: str) -> tuple[int, str, bytes]:
+    """Health-server routing shared by _HealthHandler and async_runtime.py."""
+    import memory_watchdog, profiler  # Loaded after the bind; cached in sys.modules by then
+    url = urlparse(target)
+    if url.path.startswith("/profile"):
+        return profiler.handle_http(method, url.path, parse_qs(url.query))
+    if url.path == "/memory" and method == "GET":
+        return 200, "application/json", json.dumps(memory_watchdog.status()).encode()
+    return 200, "text/plain", b"OK"
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP handler — satisfies Fly's TCP/HTTP health check on port 8000.
+    /profile* routes are delegated to profiler.py (token-gated, off by default);
+    /memory returns the memory watchdog status."""
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        status, content_type, body = route_http(method, self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass  # Silence per-request access logs
+
+
+_health_server: HTTPServer | None = None
+_health_bound_at: float | None = None  # time.monotonic() of the bind (boot timing log)
+
+
+def _start_health_server(port: int = 8000):
+    """Start health check server in a daemon thread (once). Dies when main process exits."""
+    global _health_server, _health_bound_at
+    if _health_server is not None:
+        return _health_server
+    _health_server = HTTPServer(("0.0.0.0", port), _HealthHandler)
+    _health_bound_at = time.monotonic()
+    t = threading.Thread(target=_health_server.serve_forever, daemon=True)
+    t.start()
+    logger.info("Health check server listening on port %d", port)
+    return _health_server
+
+
+# Bind the health endpoint before the heavy imports below (requests, websocket,
+# sqlite3, multiprocessing) — Fly health checks race startup. The async runtime
+# binds its own server on the event loop.
+if __name__ == "__main__" and runtime_name() != "async":
+    _start_health_server()
+
 import ctypes
+import platform
 from datetime import datetime, timedelta, timezone
-from http.server import BaseHTTPRequestHandler, HTTPServer
 from dotenv import load_dotenv
 
+import bet_ledger
+import clock
 import polymarket_client
+import league_catalog
 import main
+import match_clock
+import memory_watchdog
+import profiler
+import shard_pool
+import state_store
 import telegram_client
+import ticker
 import trader
-from config import MIN_MINUTE, MAX_MINUTE, MAX_SCHEDULE_HOURS, SCAN_INTERVAL_SLOW, MAX_BET_BUDGET_USD, BET_STAKE_USD
+from config import (
+    MIN_MINUTE, MAX_MINUTE, MAX_SCHEDULE_HOURS, SCAN_INTERVAL_SLOW,
+    MAX_BET_BUDGET_USD, BET_STAKE_USD, MAX_WALLET_BUDGET_USD,
+    SPORTS_WS_ENABLED, LEAGUE_CATALOG_ENABLED, MEMORY_WATCHDOG_ENABLED, BET_LEDGER_ENABLED,
+)
+from models import Event, Run
 from risk_manager import RiskManager
-
-logger = logging.getLogger("scheduler")
+from schedule_store import ScheduleStore, summarize
 
 # Kickoff + 80 minutes = target start of scanning (around Minute 65+ match clock)
 WAKEUP_DELAY_MINUTES = 80
@@ -47,27 +137,27 @@ def set_windows_sleep_inhibition(prevent: bool):
     except Exception as e:
         logger.warning("Could not set Windows execution state: %s", e)
 
-class _HealthHandler(BaseHTTPRequestHandler):
-    """Minimal HTTP handler — satisfies Koyeb's TCP/HTTP health check on port 8000."""
-    def do_GET(self):
-        self.send_response(200)
-        self.end_headers()
-        self.wfile.write(b"OK")
+def _prewarm_trader():
+    """Background: load the crypto/CLOB stack and log the credential fingerprint."""
+    try:
+        trader.prewarm()
+        trader.log_credential_fingerprint()  # Log wallet+api_key on every machine boot
+        trader.warm_clients()  # One authenticated client per wallet (order_router.py)
+    except Exception as e:
+        logger.warning("Trader pre-warm failed (will retry on first order): %s", e)
 
-    def do_HEAD(self):
-        self.send_response(200)
-        self.end_headers()
 
-    def log_message(self, *args):
-        pass  # Silence per-request access logs
+def _start_memory_watchdog():
+    """Register cache shedders (safe to drop — all refetchable) and start sampling."""
+    memory_watchdog.register_shedder("gamma_cache", polymarket_client.clear_cache)
+    memory_watchdog.register_shedder("resolved_tokens", polymarket_client.clear_resolved_tokens)
+    memory_watchdog.register_shedder("ended_games", match_clock.prune_ended)
+    memory_watchdog.start()
 
 
-def _start_health_server(port: int = 8000):
-    """Start health check server in a daemon thread. Dies when main process exits."""
-    server = HTTPServer(("0.0.0.0", port), _HealthHandler)
-    t = threading.Thread(target=server.serve_forever, daemon=True)
-    t.start()
-    logger.info("Health check server listening on port %d", port)
+def _session_ledger():
+    """Bet ledger attached to session RiskManagers (None when BET_LEDGER_ENABLED is off)."""
+    return bet_ledger.get_ledger() if BET_LEDGER_ENABLED else None
 
 
 def get_br_time(utc_dt: datetime) -> datetime:
@@ -75,49 +165,63 @@ def get_br_time(utc_dt: datetime) -> datetime:
     return utc_dt.astimezone(timezone(timedelta(hours=-3)))
 
 
-def get_upcoming_runs() -> list[dict]:
+def new_schedule() -> ScheduleStore:
+    """Empty incremental schedule with this loop's wakeup delay and session length."""
+    return ScheduleStore(WAKEUP_DELAY_MINUTES, SESSION_DURATION_MINUTES, MAX_SCHEDULE_HOURS)
+
+
+def get_upcoming_runs(matches: list[Event] | None = None) -> list[Run]:
     """
     Fetch today's soccer schedule and calculate wakeup times.
-    Returns a list of dicts: {'title': str, 'wakeup_time': datetime, 'end_time': datetime}
+    matches: an already-fetched schedule; fetched here if None.
+    Returns Runs (title, kickoff, wakeup_time, end_time) sorted by wakeup time.
+    One-shot view — the loops keep a ScheduleStore and merge each discovery into it.
     """
-    logger.info("Fetching soccer schedule from Gamma...")
-    matches = polymarket_client.get_soccer_schedule()
-    upcoming = []
-    
-    now = datetime.now(timezone.utc)
-    
-    for match in matches:
-        # Gamma startTime is ISO 8601, e.g., "2026-02-28T15:00:00Z"
-        start_str = match.get("startTime")
-        if not start_str:
-            continue
-            
-        try:
-            # Handle possible 'Z' or offset formats
-            kickoff = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-            wakeup = kickoff + timedelta(minutes=WAKEUP_DELAY_MINUTES)
-            end = wakeup + timedelta(minutes=SESSION_DURATION_MINUTES)
-            
-            # Skip matches that already finished their target window
-            if now > end:
-                continue
-                
-            # Skip matches scheduled too far in the future (Time Horizon Filter)
-            if kickoff > now + timedelta(hours=MAX_SCHEDULE_HOURS):
-                continue
-                
-            upcoming.append({
-                "title": match.get("title"),
-                "kickoff": kickoff,
-                "wakeup_time": wakeup,
-                "end_time": end
-            })
-        except ValueError as e:
-            logger.error("Failed to parse timestamp for %s: %s", match.get("title"), e)
-            
-    # Sort by wakeup time
-    upcoming.sort(key=lambda x: x["wakeup_time"])
-    return upcoming
+    if matches is None:
+        logger.info("Fetching soccer schedule from Gamma...")
+        matches = polymarket_client.get_soccer_schedule()
+    schedule = new_schedule()
+    schedule.apply(matches)
+    return schedule.runs()
+
+
+def _restore_state(state: dict | None, discovery_interval: float) -> dict:
+    """
+    Turn a state_store snapshot into loop state. Finished runs are dropped;
+    the active session (if still open) comes back with its RiskManager.
+    """
+    restored = {"runs": [], "last_discovery_time": 0, "last_dashboard_update": 0,
+                "last_dashboard_repost": 0, "session": None}
+    if not state:
+        return restored
+
+    now = clock.now()
+    try:
+        runs = [Run.from_dict(state_store.decode_run(r)) for r in state.get("runs", [])]
+        runs = [r for r in runs if r.end_time >= now]
+        runs.sort(key=lambda x: x.wakeup_time)
+        session = state.get("session")
+        if session:
+            session = state_store.decode_run(session)
+            if session["end_time"] > now:
+                session["risk"] = RiskManager.restore(session["risk"], ledger=_session_ledger())
+            else:
+                session = None
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning("State snapshot unusable, starting fresh: %s", e)
+        return restored
+
+    polymarket_client.seed_resolved_tokens(state.get("resolved_tokens", {}))
+    restored.update(
+        runs=runs,
+        session=session,
+        last_dashboard_update=state.get("last_dashboard_update", 0),
+        last_dashboard_repost=state.get("last_dashboard_repost", 0),
+    )
+    # Reuse the saved schedule until its discovery cycle would have expired anyway
+    if runs and clock.time() - state.get("last_discovery_time", 0) < discovery_interval:
+        restored["last_discovery_time"] = state["last_discovery_time"]
+    return restored
 
 
 def run_scheduler_loop():
@@ -125,8 +229,26 @@ def run_scheduler_loop():
     load_dotenv()
     _start_health_server()
     logger.info("Starting Smart Scheduler Loop...")
-    trader.log_credential_fingerprint()  # Log wallet+api_key on every machine boot
-    telegram_client.send_status_update("Smart Scheduler Started 🚀")
+    # Heavy eth_account / py_clob_client imports happen off the startup path
+    threading.Thread(target=_prewarm_trader, name="trader-prewarm", daemon=True).start()
+    threading.Thread(target=telegram_client.send_status_update, args=("Smart Scheduler Started 🚀",),
+                     name="boot-status", daemon=True).start()
+
+    # Opt-in profiling of the next scans / session (MINUTEBID_PROFILE)
+    if profiler.arm_from_env():
+        logger.info("Profiling armed from MINUTEBID_PROFILE.")
+
+    # RSS / heap sampling with cache shedding near MEMORY_BUDGET_MB (256 MB machine)
+    if MEMORY_WATCHDOG_ENABLED:
+        _start_memory_watchdog()
+
+    # Bet history in SQLite; open bets are settled from CLOB fills / Gamma resolutions
+    if BET_LEDGER_ENABLED:
+        bet_ledger.start_reconciler()
+
+    # Live match clock — background consumer; scans fall back to startTime estimates without it
+    if SPORTS_WS_ENABLED:
+        match_clock.start_feed()
     
     # Track heartbeat for diagnostic purposes
     last_loop_heartbeat = 0
@@ -136,18 +258,55 @@ def run_scheduler_loop():
     set_windows_sleep_inhibition(True)
 
     try:
-        last_discovery_time = 0
-        last_dashboard_update = 0
-        last_dashboard_repost = 0
         discovery_interval = 3600  # 1 hour
         dashboard_interval = 600   # 10 minutes — Reduce noise as requested
         repost_interval = 7200     # 2 hours — Post a fresh message to avoid scrolling
-        runs = []
 
-        def _check_dashboard(runs_list: list):
-            """Helper to update the Telegram dashboard if interval passed."""
-            nonlocal last_dashboard_update, last_dashboard_repost
-            now_ts = time.time()
+        # Resume from the last snapshot: schedule, dashboard timers and any open session
+        restored = _restore_state(state_store.load(), discovery_interval)
+        schedule = new_schedule()
+        schedule.restore(restored["runs"])
+        last_discovery_time = restored["last_discovery_time"]
+        last_dashboard_update = restored["last_dashboard_update"]
+        last_dashboard_repost = restored["last_dashboard_repost"]
+        resumed_session = restored["session"]
+        dashboard_dirty = False
+        if schedule:
+            logger.info("Restored %d scheduled matches from state snapshot.", len(schedule))
+
+        def _on_schedule_change(changes: list):
+            """Schedule deltas (new / moved / cancelled / finished matches) refresh the dashboard."""
+            nonlocal dashboard_dirty
+            dashboard_dirty = True
+            for change in changes:
+                if change.kind in ("moved", "cancelled"):
+                    logger.info("Schedule %s: %s (wakeup %s)", change.kind, change.run.title,
+                                get_br_time(change.run.wakeup_time).strftime('%H:%M'))
+
+        schedule.subscribe(_on_schedule_change)
+
+        def _persist(active_run: dict | None = None, session_risk: RiskManager | None = None):
+            """Snapshot loop state so a restart resumes instead of starting over."""
+            session = None
+            if active_run is not None and session_risk is not None:
+                session = {**state_store.encode_run(active_run), "risk": session_risk.snapshot()}
+            try:
+                state_store.save({
+                    "last_discovery_time": last_discovery_time,
+                    "last_dashboard_update": last_dashboard_update,
+                    "last_dashboard_repost": last_dashboard_repost,
+                    "runs": [state_store.encode_run(r) for r in schedule.runs()],
+                    "session": session,
+                    "resolved_tokens": polymarket_client.resolved_tokens(),
+                })
+            except OSError as e:
+                logger.error("Could not save scheduler state: %s", e)
+
+        def _check_dashboard():
+            """Helper to update the Telegram dashboard if interval passed or the schedule changed."""
+            nonlocal last_dashboard_update, last_dashboard_repost, dashboard_dirty
+            now_ts = clock.time()
+            runs_list = schedule.runs()
             
             # Check for 2-hour RE-POST (Fresh Message)
             if now_ts - last_dashboard_repost > repost_interval:
@@ -155,80 +314,103 @@ def run_scheduler_loop():
                     telegram_client.update_scheduler_dashboard(runs_list, force_new=True)
                     last_dashboard_repost = now_ts
                     last_dashboard_update = now_ts # Also resets update timer
+                    dashboard_dirty = False
                     return
                 except Exception as e:
                     logger.error("Dashboard re-post failed: %s", e)
 
             # Check for regular EDIT (Update same message)
-            if now_ts - last_dashboard_update > dashboard_interval:
+            if dashboard_dirty or now_ts - last_dashboard_update > dashboard_interval:
                 try:
                     telegram_client.update_scheduler_dashboard(runs_list, force_new=False)
                 except Exception as e:
                     logger.error("Dashboard update failed: %s", e)
                 last_dashboard_update = now_ts
+                dashboard_dirty = False
 
         while True:
-            now_ts = time.time()
+            now_ts = clock.time()
 
             # 1. Periodically fetch soccer schedule (Discovery)
             if now_ts - last_discovery_time > discovery_interval:
-                runs = get_upcoming_runs()
+                if LEAGUE_CATALOG_ENABLED:
+                    try:
+                        league_catalog.refresh_if_stale()
+                    except Exception as e:
+                        logger.error("League catalog refresh failed: %s", e)
+                logger.info("Fetching soccer schedule from Gamma...")
+                changes = schedule.apply(polymarket_client.get_soccer_schedule())
                 last_discovery_time = now_ts
-                logger.info("Discovery cycle complete. %d matches found.", len(runs))
-                if runs:
-                    next_m = runs[0]
+                logger.info("Discovery cycle complete. %d matches scheduled (%s).", len(schedule), summarize(changes))
+                if schedule:
+                    next_m = schedule.runs()[0]
                     br_kickoff = get_br_time(next_m['kickoff'])
                     br_wakeup = get_br_time(next_m['wakeup_time'])
                     logger.info("Next Match: %s | Kickoff: %s (BR) | Wakeup: %s (BR)", 
                                 next_m['title'], br_kickoff.strftime('%H:%M'), br_wakeup.strftime('%H:%M'))
+                _persist()
 
-            # 2. Update Telegram dashboard periodically
-            _check_dashboard(runs)
-            
-            if not runs:
+            # 2. Drop finished windows, then update Telegram dashboard periodically / on change
+            schedule.expire()
+            _check_dashboard()
+
+            if not schedule:
                 logger.info("No more matches scheduled. Sleeping before re-discovery.")
-                time.sleep(60)
+                clock.sleep(60)
                 continue
 
-            now = datetime.now(timezone.utc)
-            active_run = None
-            for run in runs:
-                if run["wakeup_time"] <= now <= run["end_time"]:
-                    active_run = run
-                    break
-            
+            active_run = schedule.active(clock.now())
+
             if active_run:
-                logger.info("!!! WAKING UP for match: %s", active_run["title"])
-                telegram_client.send_status_update(f"Waking up for: {active_run['title']} 🏟")
+                if (resumed_session is not None and resumed_session["title"] == active_run.title
+                        and resumed_session["end_time"] == active_run.end_time):
+                    # Same session as before the restart — keep its budget and placed tokens
+                    session_risk = resumed_session["risk"]
+                    logger.info("!!! RESUMING session for match: %s (spent $%.2f, %d tokens placed)",
+                                active_run.title, session_risk.spent, session_risk.bets_placed)
+                    telegram_client.send_status_update(f"Resuming session: {active_run.title} 🏟")
+                else:
+                    logger.info("!!! WAKING UP for match: %s", active_run.title)
+                    telegram_client.send_status_update(f"Waking up for: {active_run.title} 🏟")
 
-                # Fresh RiskManager per session — budget and duplicate guard reset each game
-                session_risk = RiskManager(max_budget=MAX_BET_BUDGET_USD, stake_per_bet=BET_STAKE_USD)
-                logger.info("RiskManager created — budget $%.2f, stake $%.2f", MAX_BET_BUDGET_USD, BET_STAKE_USD)
+                    # Fresh RiskManager per session — budget and duplicate guard reset each game
+                    session_risk = RiskManager(max_budget=MAX_BET_BUDGET_USD, stake_per_bet=BET_STAKE_USD,
+                                               ledger=_session_ledger(), session=bet_ledger.session_id(active_run),
+                                               wallet_budget=MAX_WALLET_BUDGET_USD)
+                    logger.info("RiskManager created — budget $%.2f, stake $%.2f", MAX_BET_BUDGET_USD, BET_STAKE_USD)
+                resumed_session = None
+                _persist(active_run, session_risk)
 
                 # Start frequent scanning session
-                session_end = active_run["end_time"]
-                while datetime.now(timezone.utc) < session_end:
-                    try:
-                        main.run_single_scan(risk_manager=session_risk)
-                    except Exception as e:
-                        logger.error("Error during scan session: %s", e)
-                    
-                    # Check for dashboard update even during active session
-                    _check_dashboard(runs)
-                    
-                    # Scan on a slow pulse (e.g. 120s) during active window
-                    time.sleep(SCAN_INTERVAL_SLOW)
-                    
-                logger.info("Session finished for %s. Re-running discovery.", active_run["title"])
+                # Scans run on a fixed-rate grid (e.g. every 120s) until exactly end_time
+                scan_ticker = ticker.FixedRateTicker(SCAN_INTERVAL_SLOW, end=active_run.end_time)
+                with memory_watchdog.session(active_run.title), profiler.session():
+                    for _tick in scan_ticker:
+                        try:
+                            with profiler.scan():
+                                main.run_single_scan(risk_manager=session_risk)
+                        except Exception as e:
+                            logger.error("Error during scan session: %s", e)
+
+                        # Check for dashboard update even during active session
+                        _check_dashboard()
+                        _persist(active_run, session_risk)
+
+                logger.info("Session finished for %s (scan ticks: %s). Re-running discovery.",
+                            active_run.title, scan_ticker.stats())
                 last_discovery_time = 0 # Force discovery after a session
+                _persist()
                 continue
 
             # 3. If no match is active, sleep (60s check for dashboard/active runs)
             if now_ts - last_loop_heartbeat > heartbeat_interval:
-                logger.info("Scheduler Heartbeat: Loop active. Monitoring %d upcoming matches.", len(runs))
+                logger.info("Scheduler Heartbeat: Loop active. Monitoring %d upcoming matches.", len(schedule))
                 last_loop_heartbeat = now_ts
 
-            time.sleep(60)
+            # Wake on time for the next session instead of up to 60s late
+            now = clock.now()
+            next_wakeup = schedule.next_wakeup(now)
+            clock.sleep(60 if next_wakeup is None else min(60, (next_wakeup - now).total_seconds()))
     except Exception as exc:
         import traceback
         error_msg = traceback.format_exc()
@@ -241,10 +423,21 @@ def run_scheduler_loop():
     finally:
         # Restore normal sleep settings on exit
         set_windows_sleep_inhibition(False)
+        match_clock.stop_feed()
+        memory_watchdog.stop()
+        shard_pool.shutdown()
+        bet_ledger.shutdown()
         logger.info("Scheduler loop exited.")
 
 
 if __name__ == "__main__":
-    # Setup unified logging (console + file)
-    main.setup_logging()
-    run_scheduler_loop()
+    if runtime_name() == "async":
+        import async_runtime
+        # The async runtime binds its own health server on the event loop
+        main.setup_logging()
+        async_runtime.main()
+    else:
+        # Setup unified logging (console + file); the health endpoint is already bound
+        main.setup_logging()
+        logger.info("Health endpoint bound %.0f ms after boot.", (_health_bound_at - _BOOT_TS) * 1000)
+        run_scheduler_loop()
@@ -0,0 +1,485 @@
+# shard_pool.py — Optional multi-process league sharding for live scans.
+# Single Responsibility: run Gamma fetching, JSON parsing and opportunity filtering
+# for disjoint groups of leagues in worker processes (one GIL each), publish every
+# price into a shared-memory table, and hand the merged opportunities back to the
+# coordinator — the only process that owns the RiskManager and trader, so budget
+# and duplicate guarantees are unchanged.
+# Enable with SHARD_WORKERS > 0 (or MINUTEBID_SHARD_WORKERS). Benchmark:
+# `python shard_pool.py --workers 0 1 2 4 --leagues 64 --events 200`
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from multiprocessing import connection, shared_memory
+
+import clock
+import polymarket_client
+import scanner
+from config import (
+    SHARD_WORKERS,
+    SHARD_PRICE_TABLE_SLOTS,
+    SHARD_PRICE_TABLE_MAX_LOAD,
+    SHARD_SCAN_TIMEOUT_SECONDS,
+    WIN_PROB_THRESHOLD,
+    MAX_WIN_PROB_THRESHOLD,
+    GAMMA_EVENTS_LIMIT,
+)
+from models import Opportunity
+
+logger = logging.getLogger(__name__)
+
+# Block layout: header (occupied slot count), then slots of
+# seq (odd while a write is in progress), key digest, price, updated (epoch s)
+_HEADER = struct.Struct("<Q")
+_SEQ = struct.Struct("<Q")
+_BODY = struct.Struct("<16sdd")
+_SLOT_SIZE = _SEQ.size + _BODY.size
+_EMPTY = bytes(16)
+_MAX_READ_SPINS = 1000
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+class SharedPriceTable:
+    """
+    Fixed-capacity open-addressing hash table (condition_id -> price, updated_at)
+    in one SharedMemory block. Writers serialise on a process-shared lock;
+    readers are lock-free and retry if a slot's sequence number shows a torn read.
+    Keys are stored as 16-byte blake2b digests, so entries can't be listed — only looked up.
+    There is no per-key delete: once max_load of the slots are occupied, the next
+    write clears the whole table (a new epoch). Live prices are republished by the
+    next scan; condition_ids of finished matches are gone, and probes stay short.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, lock, owner: bool,
+                 max_load: float = SHARD_PRICE_TABLE_MAX_LOAD) -> None:
+        self._shm = shm
+        self._buf = shm.buf
+        self.slots = slots
+        self._mask = slots - 1
+        self._lock = lock
+        self._owner = owner
+        self._reset_at = max(int(slots * max_load), 1)
+        self.resets = 0
+
+    @classmethod
+    def create(cls, slots: int = SHARD_PRICE_TABLE_SLOTS, ctx=None) -> "SharedPriceTable":
+        if slots <= 0 or slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + slots * _SLOT_SIZE)
+        shm.buf[:] = bytes(len(shm.buf))
+        return cls(shm, slots, (ctx or multiprocessing).Lock(), owner=True)
+
+    @classmethod
+    def attach(cls, handle: tuple) -> "SharedPriceTable":
+        """Open a table created in another process from its handle()."""
+        name, slots, lock = handle
+        # Spawned workers share the creator's resource tracker, which unlinks the
+        # block once, when the creator unlinks it (or exits without doing so)
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, slots, lock, owner=False)
+
+    def handle(self) -> tuple:
+        """Picklable (name, slots, lock) for worker processes."""
+        return self._shm.name, self.slots, self._lock
+
+    def _probe(self, digest: bytes):
+        index = int.from_bytes(digest[:8], "little") & self._mask
+        for _ in range(self.slots):
+            yield _HEADER.size + index * _SLOT_SIZE
+            index = (index + 1) & self._mask
+
+    def __len__(self) -> int:
+        """Occupied slots in the current epoch."""
+        return _HEADER.unpack_from(self._buf, 0)[0]
+
+    def clear(self) -> None:
+        """Start a new epoch: empty every slot (seqlock-safe for concurrent readers)."""
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self) -> None:
+        for index in range(self.slots):
+            offset = _HEADER.size + index * _SLOT_SIZE
+            seq = _SEQ.unpack_from(self._buf, offset)[0]
+            if self._buf[offset + _SEQ.size:offset + _SEQ.size + 16] == _EMPTY:
+                continue
+            _SEQ.pack_into(self._buf, offset, seq + 1)
+            _BODY.pack_into(self._buf, offset + _SEQ.size, _EMPTY, 0.0, 0.0)
+            _SEQ.pack_into(self._buf, offset, seq + 2)
+        _HEADER.pack_into(self._buf, 0, 0)
+        self.resets += 1
+
+    def put_many(self, items, updated: float | None = None) -> int:
+        """Insert / update (condition_id, price) pairs under one lock. Returns entries dropped (table full)."""
+        updated = time.time() if updated is None else updated
+        dropped = 0
+        with self._lock:
+            used = _HEADER.unpack_from(self._buf, 0)[0]
+            if used >= self._reset_at:
+                logger.info("Shared price table at %d/%d slots — starting a new epoch.", used, self.slots)
+                self._clear_locked()
+                used = 0
+            for key, price in items:
+                digest = _digest(key)
+                for offset in self._probe(digest):
+                    stored = self._buf[offset + _SEQ.size:offset + _SEQ.size + 16]
+                    if stored == digest or stored == _EMPTY:
+                        used += stored == _EMPTY
+                        seq = _SEQ.unpack_from(self._buf, offset)[0]
+                        _SEQ.pack_into(self._buf, offset, seq + 1)
+                        _BODY.pack_into(self._buf, offset + _SEQ.size, digest, float(price), updated)
+                        _SEQ.pack_into(self._buf, offset, seq + 2)
+                        break
+                else:
+                    dropped += 1
+            _HEADER.pack_into(self._buf, 0, used)
+        if dropped:
+            logger.warning("Shared price table full (%d slots) — dropped %d prices.", self.slots, dropped)
+        return dropped
+
+    def put(self, key: str, price: float, updated: float | None = None) -> bool:
+        return self.put_many([(key, price)], updated) == 0
+
+    def get_entry(self, key: str) -> tuple[float, float] | None:
+        """(price, updated_at) for a condition_id, or None if never published."""
+        digest = _digest(key)
+        for offset in self._probe(digest):
+            for _ in range(_MAX_READ_SPINS):
+                before = _SEQ.unpack_from(self._buf, offset)[0]
+                stored, price, updated = _BODY.unpack_from(self._buf, offset + _SEQ.size)
+                if not before & 1 and _SEQ.unpack_from(self._buf, offset)[0] == before:
+                    break
+            else:
+                with self._lock:  # A writer died mid-slot or is starving us — read under the lock
+                    stored, price, updated = _BODY.unpack_from(self._buf, offset + _SEQ.size)
+            if stored == _EMPTY:
+                return None
+            if stored == digest:
+                return price, updated
+        return None
+
+    def get(self, key: str) -> float | None:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def close(self) -> None:
+        self._buf.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+def _install_synthetic_gamma(events_per_league: int, start: datetime, seed: int = 11):
+    """
+    Benchmark only: serve model_benchmark payloads instead of calling Gamma (JSON
+    is still parsed) and freeze the clock 3h after `start`, so every process sees
+    the same live window. Returns the previous clock.
+    """
+    import model_benchmark
+
+    pages: dict[str, list[str]] = {}
+
+    def fake_get(url, params=None):
+        value = params.get("series_id") or params.get("tag_slug")
+        if value not in pages:
+            rows = json.loads(model_benchmark.synthetic_payload(
+                events_per_league, leagues=1, seed=seed + zlib.crc32(value.encode()),
+                start=start, spread_minutes=105))
+            for row in rows:  # Event ids are unique per payload, not across leagues
+                row["id"] = f"{value}-{row['id']}"
+                row["title"] = f"{row['title']} ({value})"
+            rows.sort(key=lambda e: e["startDate"])
+            pages[value] = [json.dumps(rows[o:o + GAMMA_EVENTS_LIMIT]) for o in range(0, len(rows), GAMMA_EVENTS_LIMIT)]
+        index = params["offset"] // GAMMA_EVENTS_LIMIT
+        return json.loads(pages[value][index]) if index < len(pages[value]) else []
+
+    polymarket_client._get = fake_get
+    return clock.set_clock(clock.VirtualClock(start + timedelta(minutes=180)))
+
+
+def _worker_main(shard: int, table_handle: tuple, requests, results: connection.Connection,
+                 synthetic: dict | None) -> None:
+    logging.basicConfig(level=logging.WARNING, format=f"%(asctime)s [shard {shard}] %(levelname)s %(name)s: %(message)s")
+    table = SharedPriceTable.attach(table_handle)
+    if synthetic:
+        _install_synthetic_gamma(**synthetic)
+    try:
+        while True:
+            message = requests.get()
+            if message is None:
+                return
+            scan_id, queries, game_states = message
+            started = time.perf_counter()
+            try:
+                if synthetic:
+                    polymarket_client.clear_cache()  # Benchmark measures parsing, not cache hits
+                events, prices = polymarket_client.get_active_soccer_events(queries)
+                table.put_many(prices.items())
+                opportunities = scanner.filter_opportunities(events, prices, game_states)
+                stats = {"leagues": len(queries), "events": len(events), "prices": len(prices),
+                         "ms": round((time.perf_counter() - started) * 1000, 1)}
+                results.send((scan_id, shard, opportunities, stats, None))
+            except Exception as e:
+                results.send((scan_id, shard, [], {}, repr(e)))
+    finally:
+        table.close()
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+class ShardPool:
+    """
+    Owns the worker processes and the shared price table. scan() fans one live
+    scan out to every shard and returns the merged opportunities; executing
+    them (RiskManager, trader) stays with the caller in this process.
+    """
+
+    def __init__(self, workers: int, table_slots: int = SHARD_PRICE_TABLE_SLOTS,
+                 timeout: float = SHARD_SCAN_TIMEOUT_SECONDS, synthetic: dict | None = None) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.timeout = timeout
+        self._synthetic = synthetic
+        self._ctx = multiprocessing.get_context("spawn")  # No fork of a threaded parent
+        self._table_slots = table_slots
+        self.table: SharedPriceTable | None = None
+        self._procs: list = []
+        self._requests: list = []
+        # One result pipe per shard: killing a hung worker can't wedge a lock the other shards share
+        self._results: list[connection.Connection | None] = []
+        self._scan_id = 0
+        self.restarts = 0
+        self.last_stats: dict[int, dict] = {}
+
+    def start(self) -> "ShardPool":
+        self.table = SharedPriceTable.create(self._table_slots, self._ctx)
+        self._requests = [self._ctx.Queue() for _ in range(self.workers)]
+        self._results = [None] * self.workers
+        self._procs = [None] * self.workers
+        for shard in range(self.workers):
+            self._spawn(shard)
+        logger.info("Shard pool started: %d worker processes, %d-slot price table.", self.workers, self.table.slots)
+        return self
+
+    def _spawn(self, shard: int) -> None:
+        reader, writer = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(target=_worker_main, name=f"minutebid-shard-{shard}", daemon=True,
+                                 args=(shard, self.table.handle(), self._requests[shard], writer, self._synthetic))
+        proc.start()
+        writer.close()  # The worker holds the only write end, so its exit shows up as EOF
+        self._procs[shard] = proc
+        self._results[shard] = reader
+
+    def scan(self, game_states: dict | None = None,
+             queries: list[tuple[str, str, str]] | None = None) -> list[Opportunity]:
+        """One live scan across all shards. Shards missing the deadline are left out and restarted."""
+        self._restart_dead()
+        self._scan_id += 1
+        scan_id = self._scan_id
+        if queries is None:
+            groups = polymarket_client.shard_league_queries(self.workers)
+        else:
+            groups = [queries[i::self.workers] for i in range(self.workers)]
+        for shard, group in enumerate(groups):
+            self._requests[shard].put((scan_id, group, game_states or {}))
+
+        collected: list[Opportunity] = []
+        pending = set(range(self.workers))
+        exited = set()
+        deadline = time.monotonic() + self.timeout
+        while pending - exited:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for conn in connection.wait([self._results[s] for s in pending - exited], timeout=remaining):
+                shard = self._results.index(conn)
+                try:
+                    result_id, shard, opportunities, stats, error = conn.recv()
+                except (EOFError, OSError):
+                    exited.add(shard)  # Worker died mid-scan; restarted below
+                    continue
+                if result_id != scan_id:
+                    continue  # Late answer to a scan that already timed out
+                pending.discard(shard)
+                self.last_stats[shard] = stats
+                if error:
+                    logger.error("Shard %d scan failed: %s", shard, error)
+                collected.extend(opportunities)
+        if pending:
+            logger.warning("Shards %s missed the %.0fs scan deadline — restarting them.", sorted(pending), self.timeout)
+            for shard in sorted(pending):
+                self._restart(shard)
+        return self._merge(collected)
+
+    def _merge(self, opportunities: list[Opportunity]) -> list[Opportunity]:
+        """Drop cross-league duplicates; re-check each price against the latest value in the table."""
+        merged, seen = [], set()
+        for opp in opportunities:
+            key = opp.condition_id or (opp.match, opp.outcome)
+            if key in seen:
+                continue
+            seen.add(key)
+            latest = self.table.get(opp.condition_id) if opp.condition_id else None
+            if latest is not None and latest != opp.poly_prob:
+                if not WIN_PROB_THRESHOLD <= latest < MAX_WIN_PROB_THRESHOLD:
+                    continue
+                opp.poly_prob = latest
+            merged.append(opp)
+        logger.info("Shard scan: %d opportunities from %d shards.", len(merged), self.workers)
+        return merged
+
+    def _restart_dead(self) -> None:
+        for shard, proc in enumerate(self._procs):
+            if not proc.is_alive():
+                logger.warning("Shard %d worker exited (code %s) — restarting.", shard, proc.exitcode)
+                self._restart(shard)
+
+    def _restart(self, shard: int) -> None:
+        """Stop a dead or hung worker and spawn a fresh one on a new request queue."""
+        proc = self._procs[shard]
+        if proc.is_alive():
+            proc.terminate()
+            proc.join(1)
+            if proc.is_alive():
+                proc.kill()  # Stopped / wedged in C code: SIGTERM is not enough
+                proc.join(1)
+        # The old queue may hold unread requests (or a lock the worker died with)
+        self._requests[shard].cancel_join_thread()
+        self._requests[shard] = self._ctx.Queue()
+        self._results[shard].close()
+        self.restarts += 1
+        self._spawn(shard)
+
+    def price(self, condition_id: str) -> float | None:
+        """Latest price any shard published for a condition_id."""
+        return self.table.get(condition_id) if self.table else None
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for q in self._requests:
+            q.put(None)
+        for proc in self._procs:
+            if proc is not None:
+                proc.join(timeout)
+                if proc.is_alive():
+                    proc.terminate()
+        for conn in self._results:
+            if conn is not None:
+                conn.close()
+        self._procs, self._results = [], []
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+
+# ---------------------------------------------------------------------------
+# Process-wide pool used by main.run_single_scan / async_runtime
+# ---------------------------------------------------------------------------
+_pool: ShardPool | None = None
+_pool_lock = threading.Lock()
+
+
+def workers_configured() -> int:
+    raw = os.getenv("MINUTEBID_SHARD_WORKERS", "").strip()
+    try:
+        return int(raw) if raw else SHARD_WORKERS
+    except ValueError:
+        logger.warning("Ignoring invalid MINUTEBID_SHARD_WORKERS=%r", raw)
+        return SHARD_WORKERS
+
+
+def get_pool() -> ShardPool | None:
+    """The running pool (started on first use), or None when sharding is off."""
+    global _pool
+    workers = workers_configured()
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ShardPool(workers).start()
+        return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.stop()
+            _pool = None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def run_benchmark(worker_counts: list[int], leagues: int = 64, events: int = 200, scans: int = 3) -> list[dict]:
+    """Scans/s over synthetic leagues for each worker count (0 = today's single process)."""
+    from bench_harness import overrides
+
+    queries = [(f"l{i}", "series_id", str(40000 + i)) for i in range(leagues)]
+    synthetic = {"events_per_league": events, "start": datetime.now(timezone.utc) - timedelta(minutes=180)}
+    rows, baseline = [], None
+    for workers in worker_counts:
+        if workers == 0:
+            original = polymarket_client._get
+            previous_clock = _install_synthetic_gamma(**synthetic)
+            try:
+                with overrides([(polymarket_client, "GAMMA_FETCH_WORKERS", 1)]):
+                    def one_scan():
+                        polymarket_client.clear_cache()
+                        evs, prices = polymarket_client.get_active_soccer_events(queries)
+                        return scanner.filter_opportunities(evs, prices)
+                    one_scan()
+                    started = time.perf_counter()
+                    found = [len(one_scan()) for _ in range(scans)]
+                    elapsed = time.perf_counter() - started
+            finally:
+                polymarket_client._get = original
+                polymarket_client.clear_cache()
+                clock.set_clock(previous_clock)
+        else:
+            pool = ShardPool(workers, synthetic=synthetic, timeout=600).start()
+            try:
+                pool.scan(queries=queries)  # Warm-up: worker imports, payload generation
+                started = time.perf_counter()
+                found = [len(pool.scan(queries=queries)) for _ in range(scans)]
+                elapsed = time.perf_counter() - started
+            finally:
+                pool.stop()
+        rate = scans / elapsed
+        baseline = baseline or rate
+        rows.append({"workers": workers, "scans_per_s": round(rate, 2),
+                     "events_per_s": round(rate * leagues * events), "speedup": round(rate / baseline, 2),
+                     "opportunities": found[-1]})
+    return rows
+
+
+if __name__ == "__main__":
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Benchmark sharded live scans on synthetic leagues.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--leagues", type=int, default=64)
+    parser.add_argument("--events", type=int, default=200, help="Live events per league")
+    parser.add_argument("--scans", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPUs")
+    print(tabulate([r.values() for r in run_benchmark(args.workers, args.leagues, args.events, args.scans)],
+                   headers=["Workers", "Scans/s", "Events/s", "Speedup", "Opportunities"]))
@@ -0,0 +1,411 @@
+# simulation.py — Accelerated virtual-time run of the full scheduler loop.
+# Single Responsibility: replay recorded or synthetic matches through
+# scheduler -> main.run_single_scan -> scanner -> RiskManager -> execution
+# under a clock.VirtualClock, and report throughput, missed windows and scan lag.
+# Gamma, Telegram and state files are swapped out for the run only; orders go to
+# the paper_trading backend, filled against books priced at the simulated price.
+#
+# Usage:
+#   python simulation.py --matches 200 --hours 12
+#   python simulation.py --recorded matches.json
+#
+# Recorded file: JSON list of {"title": str, "startTime": ISO 8601,
+#                              "price_path": [[match_minute, probability], ...]}
+# The leading outcome's price is interpolated linearly between path points.
+
+import argparse
+import bisect
+import json
+import logging
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import clock
+import display
+import execution
+import main
+import paper_trading
+import polymarket_client
+import scheduler
+import state_store
+import telegram_client
+import ticker
+import trader
+from alert_state import AlertStateCache
+from bench_harness import overrides
+from config import (
+    MIN_MINUTE,
+    MAX_MINUTE,
+    WIN_PROB_THRESHOLD,
+    MAX_WIN_PROB_THRESHOLD,
+    MAX_SCHEDULE_HOURS,
+    LIVE_LOOKBACK_MINUTES,
+    SCHEDULE_LOOKBACK_MINUTES,
+    MAX_BET_BUDGET_USD,
+)
+from latency_stats import percentile
+from tabulate import tabulate
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Match data
+# ---------------------------------------------------------------------------
+
+def synthetic_matches(count: int, start: datetime, spread_hours: float,
+                      signal_ratio: float = 0.6, seed: int = 7) -> list[dict]:
+    """
+    Generate count matches kicking off on quarter hours within spread_hours of start.
+    signal_ratio of them see the leader's price climb through WIN_PROB_THRESHOLD
+    somewhere between minute 60 and 105; the rest never reach it.
+    """
+    rng = random.Random(seed)
+    slots = max(int(spread_hours * 4), 1)
+    matches = []
+    for i in range(count):
+        kickoff = start + timedelta(minutes=15 * rng.randrange(slots))
+        opening = rng.uniform(0.45, 0.70)
+        if rng.random() < signal_ratio:
+            cross = rng.uniform(60, 105)
+            path = [[0, opening], [cross, WIN_PROB_THRESHOLD], [cross + 15, 0.99]]
+        else:
+            path = [[0, opening], [100, rng.uniform(opening, WIN_PROB_THRESHOLD - 0.02)]]
+        matches.append({
+            "title": f"Sim Home {i} vs Sim Away {i}",
+            "startTime": kickoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "price_path": path,
+        })
+    return matches
+
+
+def load_recorded(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def price_at(path: list, minute: float) -> float:
+    """Linear interpolation over [[minute, prob], ...], clamped at both ends."""
+    if minute <= path[0][0]:
+        return path[0][1]
+    for (m0, p0), (m1, p1) in zip(path, path[1:]):
+        if minute <= m1:
+            return p0 + (p1 - p0) * (minute - m0) / (m1 - m0) if m1 > m0 else p1
+    return path[-1][1]
+
+
+def _normalize(raw: dict, index: int) -> dict:
+    kickoff = datetime.fromisoformat(raw["startTime"].replace("Z", "+00:00"))
+    return {
+        "id": str(raw.get("id") or f"sim-{index}"),
+        "title": raw.get("title") or f"Sim match {index}",
+        "kickoff": kickoff,
+        "start_time": raw["startTime"],
+        "condition_id": f"sim-cond-{index}",
+        "token_id": f"sim-tok-{index}",
+        "price_path": [list(p) for p in raw["price_path"]],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Stand-in for Gamma + CLOB, driven by the virtual clock
+# ---------------------------------------------------------------------------
+
+class SimulatedMarket:
+    """Serves schedule / live events / token ids / order books at virtual time."""
+
+    def __init__(self, matches: list[dict], sim_clock: clock.VirtualClock) -> None:
+        self.matches = [_normalize(m, i) for i, m in enumerate(matches)]
+        self._by_condition = {m["condition_id"]: m for m in self.matches}
+        self._by_token = {m["token_id"]: m for m in self.matches}
+        self._clock = sim_clock
+        self.max_live = 0
+
+    def _event(self, match: dict) -> dict:
+        return {
+            "id": match["id"],
+            "title": match["title"],
+            "slug": match["id"],
+            "startTime": match["start_time"],
+            "markets": [{
+                "conditionId": match["condition_id"],
+                "question": f"{match['title']} — leader",
+                "clobTokenIds": [match["token_id"]],
+            }],
+        }
+
+    def schedule(self) -> list[dict]:
+        """Same window as polymarket_client.get_soccer_schedule()."""
+        now = self._clock.now()
+        earliest = now - timedelta(minutes=SCHEDULE_LOOKBACK_MINUTES)
+        latest = now + timedelta(hours=MAX_SCHEDULE_HOURS)
+        return [self._event(m) for m in self.matches if earliest <= m["kickoff"] <= latest]
+
+    def active_events(self) -> tuple[list[dict], dict[str, float]]:
+        """Same window as polymarket_client.get_active_soccer_events()."""
+        now = self._clock.now()
+        earliest = now - timedelta(minutes=LIVE_LOOKBACK_MINUTES)
+        latest = now - timedelta(minutes=MIN_MINUTE)
+        events, prices = [], {}
+        for m in self.matches:
+            if earliest <= m["kickoff"] <= latest:
+                events.append(self._event(m))
+                minute = (now - m["kickoff"]).total_seconds() / 60
+                prices[m["condition_id"]] = price_at(m["price_path"], minute)
+        self.max_live = max(self.max_live, len(events))
+        return events, prices
+
+    def token_id(self, condition_id: str) -> str | None:
+        match = self._by_condition.get(condition_id)
+        return match["token_id"] if match else None
+
+    def book(self, token_id: str) -> paper_trading.OrderBook | None:
+        """Paper-trading book with the best ask at the token's current simulated price."""
+        match = self._by_token.get(token_id)
+        if match is None:
+            return None
+        minute = (self._clock.now() - match["kickoff"]).total_seconds() / 60
+        return paper_trading.synthetic_book(round(price_at(match["price_path"], minute), 2))
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+class Simulation:
+    """
+    Runs scheduler.run_scheduler_loop() from start for hours of virtual time.
+    With charge_scan_time the virtual clock also advances by each scan's real
+    duration, so slow scans show up as lag instead of being free.
+    """
+
+    def __init__(self, matches: list[dict], start: datetime, hours: float,
+                 charge_scan_time: bool = False, budget: float = MAX_BET_BUDGET_USD) -> None:
+        self.start = start
+        self.stop_at = start + timedelta(hours=hours)
+        self.clock = clock.VirtualClock(start, stop_at=self.stop_at)
+        self.market = SimulatedMarket(matches, self.clock)
+        self.backend = paper_trading.PaperTradingBackend(books=self.market.book, latency_ms=0, jitter_ms=0)
+        self.charge_scan_time = charge_scan_time
+        self.budget = budget
+        self.scan_times: list[datetime] = []
+        self.scan_seconds: list[float] = []
+        self.first_detection: dict[str, datetime] = {}
+        self.statuses: Counter = Counter()
+        self.messages: list[str] = []
+        self.real_seconds = 0.0
+        self.tickers: list[ticker.FixedRateTicker] = []
+
+    # --- wrappers around the real pipeline -------------------------------
+
+    def _wrap_scan(self, original):
+        def scan(risk_manager=None):
+            self.scan_times.append(self.clock.now())
+            started = time.perf_counter()
+            try:
+                return original(risk_manager=risk_manager)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.scan_seconds.append(elapsed)
+                if self.charge_scan_time:
+                    self.clock.advance(elapsed)
+        return scan
+
+    def _track_ticker(self, original):
+        def make(*args, **kwargs):
+            session_ticker = original(*args, **kwargs)
+            self.tickers.append(session_ticker)
+            return session_ticker
+        return make
+
+    def _wrap_execute(self, original):
+        def execute(opportunities, risk_manager):
+            now = self.clock.now()
+            for opp in opportunities:
+                self.first_detection.setdefault(opp.get("condition_id"), now)
+            results = original(opportunities, risk_manager)
+            self.statuses.update(results)
+            return results
+        return execute
+
+    def _send_message(self, text: str) -> int:
+        self.messages.append(text)
+        return len(self.messages)
+
+    def run(self) -> dict:
+        renderer_holder: dict = {}
+
+        def dashboard(runs, force_new=False):
+            if "r" not in renderer_holder:
+                renderer_holder["r"] = telegram_client.DashboardRenderer(min_edit_interval=0)
+            renderer_holder["r"].push(runs, force_new)
+
+        patches = [
+            (scheduler, "_start_health_server", lambda *a, **k: None),
+            (scheduler, "_prewarm_trader", lambda: None),
+            (scheduler, "load_dotenv", lambda *a, **k: None),
+            (scheduler, "SPORTS_WS_ENABLED", False),
+            (scheduler, "LEAGUE_CATALOG_ENABLED", False),
+            (scheduler, "MEMORY_WATCHDOG_ENABLED", False),
+            (scheduler, "BET_LEDGER_ENABLED", False),
+            (scheduler, "MAX_BET_BUDGET_USD", self.budget),
+            (state_store, "load", lambda *a, **k: None),
+            (state_store, "save", lambda *a, **k: None),
+            (polymarket_client, "get_soccer_schedule", self.market.schedule),
+            (polymarket_client, "get_active_soccer_events", self.market.active_events),
+            (polymarket_client, "get_clob_yes_token_id", self.market.token_id),
+            (telegram_client, "send_message", self._send_message),
+            (telegram_client, "edit_message", lambda text, message_id: True),
+            (telegram_client, "_get_last_dashboard_id", lambda: None),
+            (telegram_client, "_save_dashboard_id", lambda msg_id: None),
+            (telegram_client, "update_scheduler_dashboard", dashboard),
+            (display, "print_results", lambda opportunities: None),
+            (execution, "alert_cache", AlertStateCache(clock=self.clock.time)),
+            (main, "run_single_scan", self._wrap_scan(main.run_single_scan)),
+            (ticker, "FixedRateTicker", self._track_ticker(ticker.FixedRateTicker)),
+            (execution, "execute_opportunities", self._wrap_execute(execution.execute_opportunities)),
+        ]
+        previous_backend = trader.set_backend(self.backend)
+        try:
+            with overrides(patches):
+                previous = clock.set_clock(self.clock)
+                started = time.perf_counter()
+                try:
+                    scheduler.run_scheduler_loop()
+                except clock.SimulationFinished:
+                    pass
+                finally:
+                    self.real_seconds = time.perf_counter() - started
+                    clock.set_clock(previous)
+        finally:
+            trader.set_backend(previous_backend)
+        return self.report()
+
+    # --- metrics ---------------------------------------------------------
+
+    def _actionable_minutes(self, match: dict) -> list[int]:
+        return [m for m in range(MIN_MINUTE, MAX_MINUTE + 1)
+                if WIN_PROB_THRESHOLD <= price_at(match["price_path"], m) < MAX_WIN_PROB_THRESHOLD]
+
+    def report(self) -> dict:
+        virtual_hours = (self.clock.now() - self.start).total_seconds() / 3600
+        signals = detected = missed = uncovered = windows = 0
+        lags = []
+        for match in self.market.matches:
+            window_start = match["kickoff"] + timedelta(minutes=MIN_MINUTE)
+            window_end = match["kickoff"] + timedelta(minutes=MAX_MINUTE)
+            if window_end > self.stop_at:
+                continue  # Window not fully inside the simulated span
+            windows += 1
+            i = bisect.bisect_left(self.scan_times, window_start)
+            if i == len(self.scan_times) or self.scan_times[i] > window_end:
+                uncovered += 1
+
+            minutes = self._actionable_minutes(match)
+            if not minutes:
+                continue
+            signals += 1
+            seen = self.first_detection.get(match["condition_id"])
+            if seen is None:
+                missed += 1
+                continue
+            detected += 1
+            signal_at = match["kickoff"] + timedelta(minutes=minutes[0])
+            lags.append(max((seen - signal_at).total_seconds(), 0.0))
+
+        tick_lags = [lag for t in self.tickers for lag in t.lags]
+        placed = self.statuses.get("placed", 0)
+        return {
+            "matches": len(self.market.matches),
+            "virtual_hours": round(virtual_hours, 2),
+            "real_seconds": round(self.real_seconds, 2),
+            "speedup": round(virtual_hours * 3600 / self.real_seconds) if self.real_seconds else None,
+            "scans": len(self.scan_times),
+            "scans_per_virtual_hour": round(len(self.scan_times) / virtual_hours, 1) if virtual_hours else 0,
+            "scan_ms_p50": _percentile_ms(self.scan_seconds, 50),
+            "scan_ms_p95": _percentile_ms(self.scan_seconds, 95),
+            "scan_ms_max": _percentile_ms(self.scan_seconds, 100),
+            "max_concurrent_live": self.market.max_live,
+            "sessions": sum(1 for m in self.messages if "Waking up for:" in m),
+            "orders_placed": placed,
+            "filled_usd": self.backend.ledger.stats()["filled_usd"],
+            "order_statuses": dict(self.statuses),
+            "windows": windows,
+            "uncovered_windows": uncovered,
+            "signals": signals,
+            "signals_detected": detected,
+            "missed_signals": missed,
+            "scan_lag_s_p50": _percentile(lags, 50),
+            "scan_lag_s_p95": _percentile(lags, 95),
+            "scan_lag_s_max": _percentile(lags, 100),
+            "tick_lag_s_p95": _percentile(tick_lags, 95),
+            "tick_lag_s_max": _percentile(tick_lags, 100),
+            "ticks_skipped": sum(t.skipped for t in self.tickers),
+            "ticks_merged": sum(t.merged for t in self.tickers),
+            "telegram_messages": len(self.messages),
+        }
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    return percentile(values, pct, digits=1)
+
+
+def _percentile_ms(values: list[float], pct: float) -> float | None:
+    return _percentile([v * 1000 for v in values], pct)
+
+
+def print_report(report: dict) -> None:
+    rows = [(k, json.dumps(v) if isinstance(v, dict) else v) for k, v in report.items()]
+    print(tabulate(rows, headers=["Metric", "Value"]))
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scheduler against simulated matches in virtual time.")
+    parser.add_argument("--matches", type=int, default=200, help="Synthetic match count (ignored with --recorded)")
+    parser.add_argument("--spread-hours", type=float, default=8, help="Synthetic kickoffs spread over this many hours")
+    parser.add_argument("--signal-ratio", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--recorded", help="JSON file of recorded matches with price paths")
+    parser.add_argument("--start", help="Virtual start time (ISO 8601). Default: synthetic = now, recorded = 1h before first kickoff")
+    parser.add_argument("--hours", type=float, help="Virtual hours to simulate. Default: until the last window closes")
+    parser.add_argument("--budget", type=float, default=MAX_BET_BUDGET_USD, help="Per-session budget override")
+    parser.add_argument("--charge-scan-time", action="store_true", help="Advance virtual time by real scan duration")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> dict:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    if args.start:
+        start = datetime.fromisoformat(args.start.replace("Z", "+00:00"))
+    else:
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if args.recorded:
+        matches = load_recorded(args.recorded)
+        if not args.start:
+            first = min(datetime.fromisoformat(m["startTime"].replace("Z", "+00:00")) for m in matches)
+            start = first - timedelta(hours=1)
+    else:
+        matches = synthetic_matches(args.matches, start, args.spread_hours, args.signal_ratio, args.seed)
+
+    hours = args.hours
+    if hours is None:
+        last = max(datetime.fromisoformat(m["startTime"].replace("Z", "+00:00")) for m in matches)
+        hours = (last - start).total_seconds() / 3600 + MAX_MINUTE / 60 + 0.5
+
+    report = Simulation(matches, start, hours, args.charge_scan_time, args.budget).run()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,61 @@
+# startup_profile.py — Import-time profile report for the scheduler process.
+# Run: `python startup_profile.py [module] [--top N]`
+# Spawns a fresh interpreter with `-X importtime` so results match a real cold start.
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from tabulate import tabulate
+
+
+def profile_imports(module: str = "scheduler") -> tuple[float, list[tuple[str, int, int]]]:
+    """
+    Import module in a clean subprocess.
+    Returns (wall_seconds, [(module_name, self_us, cumulative_us), ...]).
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return wall, rows
+
+
+def report(module: str = "scheduler", top: int = 20) -> str:
+    wall, rows = profile_imports(module)
+    top_level = [r for r in rows if not r[0].startswith("  ")]
+    heaviest = sorted(rows, key=lambda r: r[2], reverse=True)[:top]
+    total_us = sum(r[2] for r in top_level)
+    out = [
+        f"Import profile for '{module}': {total_us / 1000:.0f} ms in imports, "
+        f"{wall * 1000:.0f} ms interpreter wall time",
+        tabulate(
+            [(name, f"{cum / 1000:.1f}", f"{self_ / 1000:.1f}") for name, self_, cum in heaviest],
+            headers=["Module", "Cumulative ms", "Self ms"],
+        ),
+    ]
+    lazy = [m for m in ("eth_account", "py_clob_client") if any(r[0].strip() == m for r in rows)]
+    if lazy:
+        out.append(f"WARNING: heavy modules imported eagerly: {', '.join(lazy)}")
+    return "\n".join(out)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("module", nargs="?", default="scheduler")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    print(report(args.module, args.top))
@@ -0,0 +1,63 @@
+# state_store.py — Compact on-disk snapshot of scheduler state for instant resume.
+# Single Responsibility: atomically persist / load one JSON document.
+# What goes in the snapshot is decided by scheduler.py.
+
+import json
+import logging
+import os
+from datetime import datetime
+
+from config import SCHEDULER_STATE_FILE
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+_RUN_TIME_FIELDS = ("kickoff", "wakeup_time", "end_time")
+
+
+def save(state: dict, path: str | None = None) -> None:
+    """
+    Write state atomically: temp file in the same directory, fsync, rename.
+    A crash mid-write leaves the previous snapshot intact.
+    """
+    path = path or SCHEDULER_STATE_FILE
+    payload = {"version": STATE_VERSION, **state}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path: str | None = None) -> dict | None:
+    """Return the saved state, or None if missing, corrupt or from another version."""
+    path = path or SCHEDULER_STATE_FILE
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable state snapshot %s: %s", path, e)
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        logger.warning("Ignoring state snapshot with unsupported version.")
+        return None
+    return state
+
+
+def encode_run(run) -> dict:
+    """models.Run (or run dict) -> JSON-safe dict (datetimes as ISO 8601)."""
+    if not isinstance(run, dict):
+        run = run.to_dict()
+    return {k: (v.isoformat() if k in _RUN_TIME_FIELDS and v is not None else v) for k, v in run.items()}
+
+
+def decode_run(data: dict) -> dict:
+    """Inverse of encode_run()."""
+    run = dict(data)
+    for k in _RUN_TIME_FIELDS:
+        if run.get(k):
+            run[k] = datetime.fromisoformat(run[k])
+    return run
@@ -1,17 +1,53 @@
 # telegram_client.py — Sends alerts and status updates to a Telegram Bot.
 
+import asyncio
 import os
 import logging
+import threading
+import time
 import requests
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import clock
+from config import DASHBOARD_MIN_EDIT_INTERVAL_SECONDS
+
 logger = logging.getLogger("telegram")
 
+# Monotonic time until which Telegram asked us to back off (HTTP 429 retry_after)
+_rate_limited_until = 0.0
+
+# Installed by async_runtime.py: sync send_message() calls are routed to it
+_notifier: Optional["AsyncNotifier"] = None
+
+
+def _note_rate_limit(response) -> None:
+    """Remember Telegram's retry_after so the dashboard renderer can hold edits."""
+    global _rate_limited_until
+    if response.status_code != 429:
+        return
+    try:
+        retry_after = float(response.json().get("parameters", {}).get("retry_after", 5))
+    except (ValueError, AttributeError):
+        retry_after = 5.0
+    _rate_limited_until = time.monotonic() + retry_after
+    logger.warning("Telegram rate limit hit — backing off %.0fs", retry_after)
+
+
+def rate_limit_remaining() -> float:
+    """Seconds left on the current Telegram back-off (0 if none)."""
+    return max(0.0, _rate_limited_until - time.monotonic())
+
 def send_message(text: str) -> Optional[int]:
     """
     Sends a generic text message to the configured Telegram chat.
     Returns the message_id if successful, None otherwise.
+    Under async_runtime.py the message is queued on the AsyncNotifier instead
+    and None is returned immediately.
     """
+    if _notifier is not None:
+        _notifier.enqueue(text)
+        return None
     token = os.getenv("TELEGRAM_TOKEN", "").strip()
     chat_id = os.getenv("TELEGRAM_CHAT_ID", "").strip()
     
@@ -29,6 +65,7 @@ def send_message(text: str) -> Optional[int]:
     try:
         response = requests.post(url, json=payload, timeout=10)
         if response.status_code != 200:
+            _note_rate_limit(response)
             logger.error("Telegram API Error (%s): %s", response.status_code, response.text)
         response.raise_for_status()
         return response.json().get("result", {}).get("message_id")
@@ -60,6 +97,7 @@ def edit_message(text: str, message_id: int) -> bool:
             # If the content is the same, Telegram returns 400 "message is not modified"
             if "message is not modified" in response.text:
                 return True
+            _note_rate_limit(response)
             logger.error("Telegram API Error (%s): %s", response.status_code, response.text)
         response.raise_for_status()
         return True
@@ -67,18 +105,56 @@ def edit_message(text: str, message_id: int) -> bool:
         logger.error("Failed to edit Telegram message: %s", e)
         return False
 
-def send_opportunity_alert(opp: dict) -> None:
-    """
-    Formats and sends a bet signal alert based on Polymarket price threshold.
-    """
+def format_opportunity_alert(opp: dict) -> str:
+    """Markdown body for one bet signal."""
     poly_prob = opp.get('poly_prob', 0) * 100
-    msg = f"⚽ *BET SIGNAL*\n\n"
-    msg += f"🏟 *Match:* {opp.get('match', 'Unknown')}\n"
+    msg = f"🏟 *Match:* {opp.get('match', 'Unknown')}\n"
     msg += f"⏱ *Minute:* ~{opp.get('minute', '?')}\n\n"
     msg += f"🔥 *Outcome:* {opp.get('outcome', '?')}\n"
     msg += f"📍 *Polymarket:* {poly_prob:.1f}¢\n"
     msg += f"\n[View on Polymarket]({opp.get('market_url', 'https://polymarket.com')})"
-    send_message(msg)
+    return msg
+
+def _delivered(text: str) -> bool:
+    """send_message() that reports success (queued on the AsyncNotifier counts — it retries 429s)."""
+    return send_message(text) is not None or _notifier is not None
+
+def send_opportunity_alert(opp: dict) -> bool:
+    """
+    Formats and sends a bet signal alert based on Polymarket price threshold.
+    Returns False if Telegram did not accept it.
+    """
+    return _delivered("⚽ *BET SIGNAL*\n\n" + format_opportunity_alert(opp))
+
+_MAX_MESSAGE_CHARS = 4000  # Telegram hard limit is 4096
+
+def send_opportunity_alerts(opps: list[dict]) -> list[dict]:
+    """
+    Sends every signal from one scan as a single message (split only if it
+    would exceed Telegram's length limit). Returns the opportunities whose
+    message was actually delivered (failed batches are left out).
+    """
+    if not opps:
+        return []
+    if len(opps) == 1:
+        return list(opps) if send_opportunity_alert(opps[0]) else []
+
+    header = f"⚽ *{len(opps)} BET SIGNALS*\n\n"
+    separator = "\n\n———\n\n"
+    batches, current, members = [], header, []
+    for opp in opps:
+        block = format_opportunity_alert(opp)
+        if current != header and len(current) + len(separator) + len(block) > _MAX_MESSAGE_CHARS:
+            batches.append((current, members))
+            current, members = header, []
+        current += (separator if current != header else "") + block
+        members.append(opp)
+    batches.append((current, members))
+    delivered = []
+    for text, members in batches:
+        if _delivered(text):
+            delivered.extend(members)
+    return delivered
 
 def send_status_update(status: str) -> None:
     """
@@ -127,62 +203,282 @@ def _save_dashboard_id(msg_id: int):
     with open(DASHBOARD_FILE, "w") as f:
         f.write(str(msg_id))
 
+_BR_TZ = timezone(timedelta(hours=-3))
+MAX_GAMES_DISPLAYED = 15
+
+
+def _countdown_step(seconds_to_next: float) -> int:
+    """
+    Countdown resolution in seconds, tuned to how soon the next wakeup is.
+    Coarse far out (fewer distinct renders = fewer edits), fine when close.
+    """
+    if seconds_to_next > 6 * 3600:
+        return 3600
+    if seconds_to_next > 3600:
+        return 600
+    return 60  # Sub-minute precision is never worth an edit
+
+
+def _format_countdown(seconds: float, step: int) -> str:
+    if seconds <= 0:
+        return "ACTIVE 🔴"
+    seconds = int(seconds // step * step)  # Round down to the render step
+    hours, remainder = divmod(seconds, 3600)
+    minutes = remainder // 60
+    if hours > 0:
+        return f"T-{hours}h" if step >= 3600 else f"T-{hours}h {minutes}m"
+    return f"T-{minutes}m" if minutes else "T-<1m"
+
+
+def render_dashboard_body(runs: list, now: datetime) -> str:
+    """
+    Schedule and countdowns — the part of the dashboard that decides whether
+    an edit is worth sending. Limited to the next MAX_GAMES_DISPLAYED games
+    to stay under Telegram's 4096 character limit.
+    """
+    msg = f"Total games monitored today: {len(runs)}\n\n"
+    if not runs:
+        return msg + "No games currently being monitored. 😴"
+
+    display_runs = runs[:MAX_GAMES_DISPLAYED]
+    upcoming = [(r["wakeup_time"] - now).total_seconds() for r in display_runs]
+    future = [sec for sec in upcoming if sec > 0]
+    step = _countdown_step(min(future)) if future else 60
+
+    for run, diff in zip(display_runs, upcoming):
+        br_wakeup = run["wakeup_time"].astimezone(_BR_TZ)
+        msg += f"🏟 *{run['title']}*\n"
+        msg += f"⏰ Wakeup: {br_wakeup.strftime('%H:%M')} (UTC-3) | ⏳ *{_format_countdown(diff, step)}*\n\n"
+
+    if len(runs) > MAX_GAMES_DISPLAYED:
+        msg += f"_...and {len(runs) - MAX_GAMES_DISPLAYED} more games scheduled._"
+    return msg
+
+
+def _render_dashboard(body: str, now: datetime) -> str:
+    br_now = now.astimezone(_BR_TZ)
+    header = "📅 *MONITORED GAMES DASHBOARD*\n"
+    header += f"Last updated: {br_now.strftime('%H:%M')} (UTC-3)\n"
+    return header + body
+
+
+class DashboardRenderer:
+    """
+    Keeps the dashboard message id and last rendered body in memory and only
+    talks to Telegram when the body actually changes. Updates submitted in
+    bursts are coalesced by a background worker that also honours
+    DASHBOARD_MIN_EDIT_INTERVAL_SECONDS and Telegram 429 back-offs.
+    """
+
+    def __init__(self, min_edit_interval: float = DASHBOARD_MIN_EDIT_INTERVAL_SECONDS) -> None:
+        self._min_edit_interval = min_edit_interval
+        self._message_id = _get_last_dashboard_id()  # Disk read once per process
+        self._last_body: Optional[str] = None
+        self._last_push = 0.0
+        self._pending: Optional[tuple[list, bool]] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.pushes = 0
+        self.skipped = 0
+
+    def submit(self, runs: list, force_new: bool = False) -> None:
+        """Queue a render without blocking. Later submits replace earlier ones."""
+        with self._cond:
+            sticky_force = self._pending[1] if self._pending else False
+            self._pending = (list(runs), force_new or sticky_force)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="dashboard", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+            # Hold until the edit interval and any 429 back-off have passed; keep coalescing meanwhile
+            wait = max(self._last_push + self._min_edit_interval - time.monotonic(), rate_limit_remaining())
+            if wait > 0:
+                time.sleep(wait)
+            with self._cond:
+                runs, force_new = self._pending
+                self._pending = None
+            try:
+                self.push(runs, force_new)
+            except Exception as e:
+                logger.error("Dashboard render failed: %s", e)
+
+    def push(self, runs: list, force_new: bool = False, now: Optional[datetime] = None) -> str:
+        """
+        Render synchronously and send / edit if needed.
+        Returns "unchanged", "edited" or "sent" (or "failed").
+        """
+        rendered = self._render_if_changed(runs, force_new, now)
+        if rendered is None:
+            return "unchanged"
+        body, text = rendered
+        if not force_new and self._message_id and edit_message(text, self._message_id):
+            self._last_body = body
+            return "edited"
+
+        # No message yet, forced fresh post, or edit failed (e.g. message deleted)
+        return self._record_sent(body, send_message(text))
+
+    async def apush(self, runs: list, notifier: "AsyncNotifier", force_new: bool = False,
+                    now: Optional[datetime] = None) -> str:
+        """push() for async_runtime.py: same diffing, delivered through the AsyncNotifier."""
+        rendered = self._render_if_changed(runs, force_new, now)
+        if rendered is None:
+            return "unchanged"
+        body, text = rendered
+        if not force_new and self._message_id and await notifier.edit(text, self._message_id):
+            self._last_body = body
+            return "edited"
+        return self._record_sent(body, await notifier.send(text))
+
+    def _render_if_changed(self, runs: list, force_new: bool, now: Optional[datetime]) -> Optional[tuple[str, str]]:
+        """(body, full text) if a push is due, None if the body is unchanged."""
+        now = now or clock.now()
+        body = render_dashboard_body(runs, now)
+        if not force_new and self._message_id and body == self._last_body:
+            self.skipped += 1
+            return None
+        self._last_push = time.monotonic()
+        self.pushes += 1
+        return body, _render_dashboard(body, now)
+
+    def _record_sent(self, body: str, new_id: Optional[int]) -> str:
+        if not new_id:
+            return "failed"
+        self._message_id = new_id
+        self._last_body = body
+        _save_dashboard_id(new_id)
+        return "sent"
+
+
+_dashboard: Optional[DashboardRenderer] = None
+
+
 def update_scheduler_dashboard(runs: list, force_new: bool = False) -> None:
     """
     Sends or updates a single dashboard message with the current schedule and countdowns.
-    Limits to the next 15 games to avoid Telegram's 4096 character limit.
+    Non-blocking: the render is handed to the shared DashboardRenderer, which
+    skips unchanged content and coalesces bursts.
     If force_new is True, skips editing the previous message and sends a fresh one.
     """
-    from datetime import datetime, timezone, timedelta
-    
-    now = datetime.now(timezone.utc)
-    MAX_GAMES_DISPLAYED = 15
-    
-    msg = "📅 *MONITORED GAMES DASHBOARD*\n"
-    # Convert to Brasilia Time (UTC-3)
-    br_now = now.astimezone(timezone(timedelta(hours=-3)))
-    msg += f"Last updated: {br_now.strftime('%H:%M:%S')} (UTC-3)\n"
-    msg += f"Total games monitored today: {len(runs)}\n\n"
-    
-    if not runs:
-        msg += "No games currently being monitored. 😴"
-    else:
-        # Show only the next N games
-        display_runs = runs[:MAX_GAMES_DISPLAYED]
-        
-        for run in display_runs:
-            wakeup = run['wakeup_time']
-            diff = wakeup - now
-            
-            # Format countdown
-            if diff.total_seconds() <= 0:
-                t_minus = "ACTIVE 🔴"
-            else:
-                hours, remainder = divmod(int(diff.total_seconds()), 3600)
-                minutes, seconds = divmod(remainder, 60)
-                if hours > 0:
-                    t_minus = f"T-{hours}h {minutes}m"
-                else:
-                    t_minus = f"T-{minutes}m {seconds}s"
-            
-            br_wakeup = wakeup.astimezone(timezone(timedelta(hours=-3)))
-            msg += f"🏟 *{run['title']}*\n"
-            msg += f"⏰ Wakeup: {br_wakeup.strftime('%H:%M')} (UTC-3) | ⏳ *{t_minus}*\n\n"
-        
-        if len(runs) > MAX_GAMES_DISPLAYED:
-            msg += f"_...and {len(runs) - MAX_GAMES_DISPLAYED} more games scheduled._"
+    global _dashboard
+    if _dashboard is None:
+        _dashboard = DashboardRenderer()
+    _dashboard.submit(runs, force_new)
 
-    last_id = None if force_new else _get_last_dashboard_id()
-    
-    if last_id:
-        success = edit_message(msg, last_id)
-        if not success:
-            # If edit fails (e.g. message deleted), send a new one
-            new_id = send_message(msg)
-            if new_id:
-                _save_dashboard_id(new_id)
-    else:
-        # Either No ID exists, or we are forcing a fresh post
-        new_id = send_message(msg)
-        if new_id:
-            _save_dashboard_id(new_id)
+
+# ---------------------------------------------------------------------------
+# asyncio delivery (async_runtime.py)
+# ---------------------------------------------------------------------------
+
+class AsyncNotifier:
+    """
+    Telegram delivery as one asyncio task over a pooled httpx.AsyncClient.
+    While installed, the sync send_message() — from the loop or any worker
+    thread — enqueues here and returns at once; run() delivers in order and
+    honours Telegram 429 back-offs without blocking other tasks.
+    """
+
+    def __init__(self, client=None) -> None:
+        self._client = client
+        self._own_client = client is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sent = 0
+        self.failed = 0
+
+    def install(self) -> None:
+        """Bind to the running loop and take over send_message()."""
+        global _notifier
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        _notifier = self
+
+    def uninstall(self) -> None:
+        global _notifier
+        if _notifier is self:
+            _notifier = None
+
+    def enqueue(self, text: str) -> None:
+        """Thread-safe fire-and-forget send."""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, text)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def run(self) -> None:
+        while True:
+            text = await self._queue.get()
+            try:
+                await self.send(text)
+            except Exception as e:
+                logger.error("Queued Telegram message failed: %s", e)
+            finally:
+                self._queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until every queued message has been attempted."""
+        await self._queue.join()
+
+    async def aclose(self) -> None:
+        if self._own_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _http(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(timeout=10)
+        return self._client
+
+    async def _post(self, method: str, payload: dict):
+        token = os.getenv("TELEGRAM_TOKEN", "").strip()
+        chat_id = os.getenv("TELEGRAM_CHAT_ID", "").strip()
+        if not token or not chat_id:
+            return None
+        wait = rate_limit_remaining()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return await self._http().post(f"https://api.telegram.org/bot{token}/{method}",
+                                       json={"chat_id": chat_id, "parse_mode": "Markdown", **payload})
+
+    async def send(self, text: str) -> Optional[int]:
+        """Async send_message(): returns the message_id, or None."""
+        try:
+            response = await self._post("sendMessage", {"text": text})
+            if response is None:
+                logger.warning("Telegram credentials missing in .env. Skipping notification.")
+                return None
+            if response.status_code != 200:
+                _note_rate_limit(response)
+                logger.error("Telegram API Error (%s): %s", response.status_code, response.text)
+            response.raise_for_status()
+            self.sent += 1
+            return response.json().get("result", {}).get("message_id")
+        except Exception as e:
+            self.failed += 1
+            logger.error("Failed to send Telegram message: %s", e)
+            return None
+
+    async def edit(self, text: str, message_id: int) -> bool:
+        """Async edit_message()."""
+        try:
+            response = await self._post("editMessageText", {"message_id": message_id, "text": text})
+            if response is None:
+                return False
+            if response.status_code != 200:
+                if "message is not modified" in response.text:
+                    return True
+                _note_rate_limit(response)
+                logger.error("Telegram API Error (%s): %s", response.status_code, response.text)
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.error("Failed to edit Telegram message: %s", e)
+            return False
@@ -0,0 +1,146 @@
+# sports_ws_stub.py — Local stand-in for the Polymarket Sports WebSocket.
+# Minimal RFC 6455 server (text frames only) so match_clock can be tested offline.
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class LocalSportsWS:
+    """Accepts WebSocket clients on 127.0.0.1 and broadcasts JSON game updates."""
+
+    def __init__(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        self.url = f"ws://127.0.0.1:{self.port}/ws"
+        self._clients = []
+        self._lock = threading.Lock()
+        self.client_connected = threading.Event()
+        self.received = []  # Text frames sent by clients (e.g. subscribe messages)
+        self._closed = False
+
+    def start(self):
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def close(self):
+        self._closed = True
+        self._sock.close()
+        with self._lock:
+            for c in self._clients:
+                try:
+                    c.close()
+                except OSError:
+                    pass
+            self._clients.clear()
+
+    def disconnect_clients(self):
+        """Drop every client to exercise reconnect logic."""
+        with self._lock:
+            for c in self._clients:
+                try:
+                    c.shutdown(socket.SHUT_RDWR)
+                    c.close()
+                except OSError:
+                    pass
+            self._clients.clear()
+        self.client_connected.clear()
+
+    def broadcast(self, payload):
+        frame = self._frame(json.dumps(payload).encode())
+        with self._lock:
+            for c in list(self._clients):
+                try:
+                    c.sendall(frame)
+                except OSError:
+                    self._clients.remove(c)
+
+    # ------------------------------------------------------------------
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return
+            request += chunk
+        key = ""
+        for line in request.decode().split("\r\n"):
+            if line.lower().startswith("sec-websocket-key:"):
+                key = line.split(":", 1)[1].strip()
+        accept = base64.b64encode(hashlib.sha1((key + _GUID).encode()).digest()).decode()
+        conn.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+        with self._lock:
+            self._clients.append(conn)
+        self.client_connected.set()
+        try:
+            while True:
+                opcode, data = self._read_frame(conn)
+                if opcode is None or opcode == 0x8:
+                    break
+                if opcode == 0x1:
+                    self.received.append(data.decode())
+                elif opcode == 0x9:
+                    conn.sendall(self._frame(data, opcode=0xA))
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if conn in self._clients:
+                    self._clients.remove(conn)
+            conn.close()
+
+    @staticmethod
+    def _recv_exact(conn, n):
+        buf = b""
+        while len(buf) < n:
+            chunk = conn.recv(n - len(buf))
+            if not chunk:
+                raise OSError("connection closed")
+            buf += chunk
+        return buf
+
+    def _read_frame(self, conn):
+        try:
+            b1, b2 = self._recv_exact(conn, 2)
+        except OSError:
+            return None, b""
+        length = b2 & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._recv_exact(conn, 2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._recv_exact(conn, 8))[0]
+        mask = self._recv_exact(conn, 4) if b2 & 0x80 else b"\0\0\0\0"
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(conn, length)))
+        return b1 & 0x0F, data
+
+    @staticmethod
+    def _frame(data, opcode=0x1):
+        header = bytes([0x80 | opcode])
+        if len(data) < 126:
+            header += bytes([len(data)])
+        elif len(data) < 65536:
+            header += bytes([126]) + struct.pack(">H", len(data))
+        else:
+            header += bytes([127]) + struct.pack(">Q", len(data))
+        return header + data
@@ -0,0 +1,86 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import execution
+import telegram_client
+from alert_state import AlertStateCache
+
+def _opp(cond, prob, match="A vs B"):
+    return {"match": match, "condition_id": cond, "poly_prob": prob, "outcome": "A", "minute": 80}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class TestAlertStateCache(unittest.TestCase):
+    def test_repeats_suppressed_unless_price_moves(self):
+        cache = AlertStateCache(move_threshold=0.03, ttl=3600)
+        cache.mark_sent(cache.filter_new([_opp("c1", 0.82), _opp("c2", 0.85)]))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.filter_new([_opp("c1", 0.83), _opp("c2", 0.85)]), [])
+        moved = cache.filter_new([_opp("c1", 0.86)])
+        self.assertEqual(cache.filter_new([_opp("c1", 0.86)]), moved)  # Not recorded until sent
+        self.assertEqual([o["condition_id"] for o in moved], ["c1"])
+        self.assertEqual(cache.suppressed, 2)
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = AlertStateCache(move_threshold=0.03, ttl=60, clock=clock)
+        cache.mark_sent([_opp("c1", 0.82)])
+        clock.now = 120
+        self.assertEqual(len(cache.filter_new([_opp("c1", 0.82)])), 1)
+
+class TestBatchedAlerts(unittest.TestCase):
+    def test_one_message_per_scan(self):
+        with mock.patch("telegram_client.send_message") as send:
+            opps = [_opp(f"c{i}", 0.85, f"M{i}") for i in range(5)]
+            sent = telegram_client.send_opportunity_alerts(opps)
+        self.assertEqual(sent, opps)
+        self.assertEqual(send.call_count, 1)
+        self.assertIn("5 BET SIGNALS", send.call_args.args[0])
+
+    def test_long_batches_split_under_telegram_limit(self):
+        opps = [_opp(f"c{i}", 0.85, "X" * 300) for i in range(30)]
+        with mock.patch("telegram_client.send_message") as send:
+            sent = telegram_client.send_opportunity_alerts(opps)
+        self.assertEqual(sent, opps)
+        self.assertGreater(send.call_count, 1)
+        self.assertTrue(all(len(c.args[0]) <= 4096 for c in send.call_args_list))
+
+    def test_scans_do_not_realert_same_signal(self):
+        execution.alert_cache.clear()
+        self.addCleanup(execution.alert_cache.clear)
+        with mock.patch("execution.telegram_client") as tg:
+            tg.send_opportunity_alerts.side_effect = lambda signals: signals
+            execution.execute_opportunities([_opp("c1", 0.85), _opp("c2", 0.9)], None)
+            execution.execute_opportunities([_opp("c1", 0.85), _opp("c2", 0.9)], None)
+        self.assertEqual(tg.send_opportunity_alerts.call_count, 1)
+
+    def test_failed_send_is_alerted_again(self):
+        execution.alert_cache.clear()
+        self.addCleanup(execution.alert_cache.clear)
+        # send_message returns None when Telegram refuses (e.g. a 429 flood limit)
+        with mock.patch("telegram_client.send_message", return_value=None) as send:
+            execution.execute_opportunities([_opp("c1", 0.85)], None)
+            self.assertEqual(len(execution.alert_cache), 0)
+            send.return_value = 42
+            execution.execute_opportunities([_opp("c1", 0.85)], None)
+            execution.execute_opportunities([_opp("c1", 0.85)], None)
+        self.assertEqual(send.call_count, 2)
+
+    def test_partial_delivery_keeps_failed_batch(self):
+        opps = [_opp(f"c{i}", 0.85, "X" * 300) for i in range(30)]
+        with mock.patch("telegram_client.send_message", side_effect=[1] + [None] * 10):
+            sent = telegram_client.send_opportunity_alerts(opps)
+        self.assertTrue(0 < len(sent) < len(opps))
+        self.assertEqual(sent, opps[:len(sent)])
+
+if __name__ == '__main__':
+    unittest.main()
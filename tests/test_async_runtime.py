@@ -0,0 +1,214 @@
+import sys
+import os
+import asyncio
+import json
+import unittest
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import httpx
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import async_runtime
+import clock
+import paper_trading
+import polymarket_client
+import telegram_client
+from alert_state import AlertStateCache
+from fetch_cache import AsyncSingleFlightCache
+from models import Event
+from simulation import SimulatedMarket
+
+class TestAsyncSingleFlightCache(unittest.TestCase):
+    def test_concurrent_misses_share_one_fetch(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def scenario():
+            cache = AsyncSingleFlightCache()
+            results = await asyncio.gather(*(cache.get_or_fetch("k", fetch, 60) for _ in range(5)))
+            cached = await cache.get_or_fetch("k", fetch, 60)
+            return results, cached
+
+        results, cached = asyncio.run(scenario())
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(cached, "value")
+        self.assertEqual(len(calls), 1)
+
+class TestAsyncGamma(unittest.TestCase):
+    def setUp(self):
+        polymarket_client.clear_cache()
+        self.addCleanup(polymarket_client.clear_cache)
+        for p in (mock.patch("polymarket_client.GAMMA_EVENTS_LIMIT", 10),
+                  mock.patch("polymarket_client.LEAGUE_SERIES_IDS", {"epl": "1", "liga": "2"}),
+                  mock.patch("polymarket_client.LEAGUE_TAG_SLUGS", {})):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_matches_sync_client_over_paged_leagues(self):
+        now = datetime.now(timezone.utc)
+        kickoff = (now - timedelta(minutes=85)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        events = {
+            "1": [{"id": f"a{i}", "title": f"A{i} vs B{i}", "startTime": kickoff,
+                   "markets": [{"conditionId": f"c{i}", "bestAsk": "0.9"}]} for i in range(15)],
+            "2": [{"id": "z", "title": "Y vs Z", "startTime": kickoff, "markets": []}],
+        }
+
+        def page(params):
+            offset, limit = int(params["offset"]), int(params["limit"])
+            return events[params["series_id"]][offset:offset + limit]
+
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.url.params["offset"])
+            return httpx.Response(200, json=page(dict(request.url.params)))
+
+        async def scenario():
+            polymarket_client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+            try:
+                return await polymarket_client.aget_active_soccer_events()
+            finally:
+                await polymarket_client.aclose_async_client()
+
+        async_events, async_prices = asyncio.run(scenario())
+        with mock.patch("polymarket_client._get", side_effect=lambda url, params=None: page(params)):
+            sync_events, sync_prices = polymarket_client.get_active_soccer_events()
+
+        self.assertEqual(len(async_events), 16)
+        self.assertEqual(sorted(e["id"] for e in async_events), sorted(e["id"] for e in sync_events))
+        self.assertEqual(len(async_prices), 15)
+        self.assertEqual(async_prices, sync_prices)
+        self.assertEqual(sorted(requests_seen), ["0", "0", "10"])
+
+class TestAsyncNotifier(unittest.TestCase):
+    def test_sync_send_message_is_queued_and_delivered(self):
+        posted = []
+
+        def handler(request):
+            posted.append(json.loads(request.content)["text"])
+            return httpx.Response(200, json={"ok": True, "result": {"message_id": len(posted)}})
+
+        async def scenario():
+            notifier = telegram_client.AsyncNotifier(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+            notifier.install()
+            task = asyncio.create_task(notifier.run())
+            try:
+                self.assertIsNone(telegram_client.send_message("from the loop"))
+                await asyncio.to_thread(telegram_client.send_message, "from a worker thread")
+                await notifier.drain()
+            finally:
+                notifier.uninstall()
+                task.cancel()
+            return notifier.sent
+
+        with mock.patch.dict(os.environ, {"TELEGRAM_TOKEN": "t", "TELEGRAM_CHAT_ID": "c"}):
+            sent = asyncio.run(scenario())
+        self.assertEqual(sent, 2)
+        self.assertEqual(posted, ["from the loop", "from a worker thread"])
+        self.assertIsNone(telegram_client._notifier)
+
+class TestAsyncRuntime(unittest.TestCase):
+    def test_session_scans_places_orders_and_closes(self):
+        # Kickoff such that the 80–115 min session window closes ~1.5s from now, price 0.90
+        kickoff = datetime.now(timezone.utc) - timedelta(minutes=115) + timedelta(seconds=1.5)
+        market = SimulatedMarket([{"title": "Home vs Away", "startTime": kickoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                   "price_path": [[0, 0.90], [200, 0.90]]}], clock.SystemClock())
+        backend = paper_trading.PaperTradingBackend(books=market.book, latency_ms=0, jitter_ms=0)
+        runtime = async_runtime.AsyncRuntime(scan_interval=0.05, health_host="127.0.0.1", health_port=0)
+
+        async def schedule():
+            return market.schedule()
+
+        async def active():
+            return market.active_events()
+
+        async def scenario():
+            task = asyncio.create_task(runtime.run())
+            deadline = asyncio.get_running_loop().time() + 10
+            while runtime.metrics["sessions"] == 0 or runtime.sessions:
+                self.assertLess(asyncio.get_running_loop().time(), deadline)
+                await asyncio.sleep(0.05)
+            reader, writer = await asyncio.open_connection("127.0.0.1", runtime.health_port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            runtime.stop()
+            await task
+            return response
+
+        with ExitStack() as stack:
+            for target, value in (("async_runtime.SPORTS_WS_ENABLED", False),
+                                  ("async_runtime.LEAGUE_CATALOG_ENABLED", False),
+                                  ("async_runtime.MEMORY_WATCHDOG_ENABLED", False),
+                                  ("async_runtime.BET_LEDGER_ENABLED", False),
+                                  ("scheduler.BET_LEDGER_ENABLED", False),
+                                  ("scheduler._prewarm_trader", lambda: None),
+                                  ("state_store.load", lambda: None),
+                                  ("state_store.save", lambda state: None),
+                                  ("polymarket_client.aget_soccer_schedule", schedule),
+                                  ("polymarket_client.aget_active_soccer_events", active),
+                                  ("polymarket_client.get_clob_yes_token_id", market.token_id),
+                                  ("trader._backend", backend),
+                                  ("execution.alert_cache", AlertStateCache()),
+                                  ("telegram_client._get_last_dashboard_id", lambda: None),
+                                  ("telegram_client._save_dashboard_id", lambda msg_id: None),
+                                  ("telegram_client.AsyncNotifier.send", mock.AsyncMock(return_value=1)),
+                                  ("telegram_client.AsyncNotifier.edit", mock.AsyncMock(return_value=True))):
+                stack.enter_context(mock.patch(target, value))
+            response = asyncio.run(scenario())
+
+        self.assertEqual(runtime.metrics["sessions"], 1)
+        self.assertGreater(runtime.metrics["scans"], 0)
+        self.assertEqual(runtime.metrics["placed"], 1)  # Same token never bought twice per session
+        self.assertEqual(len(backend.ledger.fills()), 1)
+        self.assertIn(b"200 OK", response)
+        metrics = json.loads(response.split(b"\r\n\r\n", 1)[1])
+        self.assertEqual(metrics["open_sessions"], [])
+        self.assertIsNone(telegram_client._notifier)
+
+    def test_kickoff_move_keeps_the_open_session(self):
+        runtime = async_runtime.AsyncRuntime()
+        now = clock.now()
+
+        async def scenario():
+            runtime._sessions_changed = asyncio.Event()
+            runtime._discover_now = asyncio.Event()
+            runtime._schedule_changed = asyncio.Event()
+            runtime.schedule.apply([Event("e1", "A vs. B", kickoff=now - timedelta(minutes=100))])
+            await asyncio.sleep(0.05)
+            (key, session), = runtime.sessions.items()
+            session["risk"].record_bet("tok-1")
+
+            # Delayed kickoff: same match, later window — the open session follows it
+            changes = runtime.schedule.apply([Event("e1", "A vs. B", kickoff=now - timedelta(minutes=95))])
+            await asyncio.sleep(0.05)
+            self.assertEqual([c.kind for c in changes], ["moved"])
+            self.assertEqual(len(runtime.sessions), 1)
+            self.assertEqual(len(runtime._session_tasks), 1)
+            (new_key, moved), = runtime.sessions.items()
+            self.assertNotEqual(new_key, key)
+            self.assertIs(moved["risk"], session["risk"])
+            self.assertEqual(moved["run"].end_time, now + timedelta(minutes=20))
+            self.assertEqual(moved["risk"].approve("tok-1"), (False, "duplicate"))
+            for task in list(runtime._session_tasks.values()):
+                task.cancel()
+            await asyncio.gather(*runtime._session_tasks.values(), return_exceptions=True)
+            return runtime.sessions
+
+        with ExitStack() as stack:
+            for target, value in (("scheduler.BET_LEDGER_ENABLED", False),
+                                  ("state_store.save", lambda state: None),
+                                  ("telegram_client.send_status_update", lambda text: None)):
+                stack.enter_context(mock.patch(target, value))
+            self.assertEqual(asyncio.run(scenario()), {})
+
+if __name__ == '__main__':
+    unittest.main()
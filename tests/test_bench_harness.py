@@ -0,0 +1,29 @@
+import sys
+import os
+import types
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_harness import overrides
+
+class TestOverrides(unittest.TestCase):
+    def test_restores_on_error(self):
+        target = types.SimpleNamespace(a=1, b=2)
+        with self.assertRaises(RuntimeError):
+            with overrides([(target, "a", 10), (target, "b", 20)]):
+                self.assertEqual((target.a, target.b), (10, 20))
+                raise RuntimeError("boom")
+        self.assertEqual((target.a, target.b), (1, 2))
+
+    def test_unknown_attribute_fails_loudly(self):
+        target = types.SimpleNamespace(a=1)
+        with self.assertRaises(AttributeError):
+            with overrides([(target, "a", 10), (target, "typo", 0)]):
+                pass
+        self.assertEqual(target.a, 1)
+        self.assertFalse(hasattr(target, "typo"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import execution
+from bet_ledger import BetLedger, Reconciler
+from models import Opportunity
+from paper_trading import PaperTradingBackend
+from risk_manager import RiskManager
+
+def _opp(i, match="Arsenal vs. Chelsea"):
+    return Opportunity(match, 82, f"Will team {i} win?", 0.85, "https://polymarket.com/event/x", f"t{i}", f"c{i}")
+
+RESPONSE = {"orderID": "o1", "status": "matched", "makingAmount": "1.000000", "takingAmount": "1.176471"}
+
+class LedgerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "bets.sqlite3")
+        self.ledger = self.open()
+
+    def open(self):
+        ledger = BetLedger(self.path)
+        self.addCleanup(ledger.close)
+        return ledger
+
+class TestBetLedger(LedgerTestCase):
+    def test_record_and_query(self):
+        self.ledger.record(_opp(1), "t1", 1.0, "placed", session="s1", response=RESPONSE)
+        self.ledger.record(_opp(2, "Lazio vs. Roma"), "t2", 1.0, "failed", session="s2", error="no match")
+        self.assertTrue(self.ledger.flush())
+
+        bets = self.ledger.bets()
+        self.assertEqual([b["status"] for b in bets], ["placed", "failed"])
+        self.assertEqual((bets[0]["order_id"], bets[0]["filled_shares"], bets[0]["fill_price"]), ("o1", 1.176471, 0.85))
+        self.assertEqual([b["token_id"] for b in self.ledger.bets(match="lazio")], ["t2"])
+        self.assertEqual(len(self.ledger.bets(session="s1", condition_id="c1")), 1)
+        self.assertEqual(self.ledger.bets(since=datetime.now(timezone.utc) + timedelta(hours=1)), [])
+        summary = self.ledger.summary()
+        self.assertEqual((summary["attempts"], summary["placed"], summary["failed"], summary["staked"]), (2, 1, 1, 1.0))
+
+    def test_duplicate_guard_survives_restart(self):
+        first = RiskManager(5.0, 1.0, ledger=self.ledger, session="s1")
+        self.assertEqual(first.reserve("t1"), (True, "ok"))
+        first.commit("t1")
+        self.ledger.record(_opp(1), "t1", 1.0, "placed", session="s1", response=RESPONSE)
+        # Queued but not yet written still counts
+        self.assertTrue(self.ledger.has_bet("t1"))
+        self.ledger.close()
+
+        reopened = self.open()
+        second = RiskManager(5.0, 1.0, ledger=reopened, session="s2")
+        self.assertEqual(second.reserve("t1"), (False, "duplicate"))
+        self.assertEqual(second.reserve("t9"), (True, "ok"))
+
+    def test_failed_attempts_do_not_block_retries(self):
+        self.ledger.record(_opp(1), "t1", 1.0, "failed", error="no match")
+        self.ledger.flush()
+        self.assertFalse(self.ledger.has_bet("t1"))
+
+    def test_execution_writes_through_risk_manager(self):
+        backend = PaperTradingBackend(latency_ms=0, jitter_ms=0)
+        risk = RiskManager(5.0, 1.0, ledger=self.ledger, session="s1")
+        with mock.patch("execution.telegram_client"), \
+             mock.patch("execution.polymarket_client.get_clob_yes_token_id", side_effect=lambda c: "tok-" + c), \
+             mock.patch("execution.trader._backend", backend):
+            results = execution.execute_opportunities([_opp(1), _opp(2)], risk)
+        self.assertEqual(results, ["placed", "placed"])
+        self.ledger.flush()
+        bets = self.ledger.bets(session="s1")
+        self.assertEqual(sorted(b["token_id"] for b in bets), ["tok-c1", "tok-c2"])
+        self.assertTrue(all(b["order_id"].startswith("paper-") and b["filled_shares"] for b in bets))
+
+    def test_upgrades_a_version_1_ledger(self):
+        self.ledger.close()
+        path = os.path.join(self.tmp.name, "v1.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.executescript("CREATE TABLE bets (id INTEGER PRIMARY KEY, placed_at TEXT NOT NULL, session TEXT, "
+                           "match TEXT NOT NULL, outcome TEXT, minute INTEGER, condition_id TEXT, "
+                           "token_id TEXT NOT NULL, price REAL, stake REAL NOT NULL, status TEXT NOT NULL, "
+                           "order_id TEXT, error TEXT, filled_shares REAL, fill_price REAL, fill_status TEXT, "
+                           "resolution TEXT, payout REAL, reconciled_at TEXT); PRAGMA user_version = 1;")
+        conn.execute("INSERT INTO bets (placed_at, match, token_id, stake, status) VALUES ('2026-03-01', 'A', 't0', 1, 'placed')")
+        conn.commit()
+        conn.close()
+
+        ledger = BetLedger(path)
+        self.addCleanup(ledger.close)
+        ledger.record(_opp(1), "t1", 1.0, "placed", wallet="2", response=RESPONSE)
+        ledger.flush()
+        self.assertTrue(ledger.has_bet("t0"))
+        self.assertEqual([b["token_id"] for b in ledger.bets(wallet="2")], ["t1"])
+
+    def test_unstamped_ledgers_are_upgraded(self):
+        self.ledger.close()
+        for name, wallet_column in (("v0.sqlite3", ""), ("v0-current.sqlite3", "wallet TEXT, ")):
+            path = os.path.join(self.tmp.name, name)
+            conn = sqlite3.connect(path)
+            conn.executescript(f"CREATE TABLE bets (id INTEGER PRIMARY KEY, placed_at TEXT NOT NULL, session TEXT, "
+                               f"{wallet_column}match TEXT NOT NULL, outcome TEXT, minute INTEGER, "
+                               "condition_id TEXT, token_id TEXT NOT NULL, price REAL, stake REAL NOT NULL, "
+                               "status TEXT NOT NULL, order_id TEXT, error TEXT, filled_shares REAL, "
+                               "fill_price REAL, fill_status TEXT, resolution TEXT, payout REAL, reconciled_at TEXT);")
+            conn.close()
+            ledger = BetLedger(path)
+            self.addCleanup(ledger.close)
+            ledger.record(_opp(1), "t1", 1.0, "placed", wallet="1", response=RESPONSE)
+            ledger.flush()
+            self.assertEqual([b["token_id"] for b in ledger.bets(wallet="1")], ["t1"])
+
+class TestReconciler(LedgerTestCase):
+    def test_batched_fills_and_resolutions(self):
+        for i in range(120):
+            self.ledger.record(_opp(i), f"t{i}", 1.0, "placed",
+                               response={**RESPONSE, "orderID": f"o{i}", "status": "matched"})
+        self.ledger.flush()
+
+        trade_calls, market_calls = [], []
+
+        def trades(after):
+            trade_calls.append(after)
+            return [{"taker_order_id": f"o{i}", "size": "1.2", "price": "0.83", "status": "CONFIRMED"}
+                    for i in range(120)] + [{"taker_order_id": "someone-else", "size": "9", "price": "0.5"}]
+
+        def markets(condition_ids):
+            market_calls.append(list(condition_ids))
+            out = []
+            for cid in condition_ids:
+                i = int(cid[1:])
+                if i % 3 == 2:
+                    continue  # Still trading
+                prices = ["1", "0"] if i % 3 == 0 else ["0", "1"]
+                out.append({"conditionId": cid, "closed": True, "outcomePrices": json.dumps(prices),
+                            "clobTokenIds": json.dumps([f"t{i}", f"n{i}"]), "umaResolutionStatus": "resolved"})
+            return out
+
+        result = Reconciler(self.ledger, batch=50, fetch_trades=trades, fetch_markets=markets).reconcile_once()
+        self.assertEqual(len(trade_calls), 1)
+        self.assertEqual([len(c) for c in market_calls], [50, 50, 20])
+        self.assertEqual((result["fills"], result["resolved"], result["requests"]), (120, 80, 4))
+
+        won = self.ledger.bets(token_id="t0")[0]
+        self.assertEqual((won["fill_status"], won["filled_shares"], won["resolution"], won["payout"]),
+                         ("CONFIRMED", 1.2, "won", 1.2))
+        self.assertEqual(self.ledger.bets(token_id="t1")[0]["resolution"], "lost")
+        summary = self.ledger.summary()
+        self.assertEqual((summary["open"], summary["won"], summary["lost"]), (40, 40, 40))
+        self.assertEqual(summary["pnl"], round(40 * 1.2 - 80, 2))
+
+        # Confirmed fills are not re-requested; only still-open markets are
+        trade_calls.clear()
+        market_calls.clear()
+        Reconciler(self.ledger, batch=50, fetch_trades=trades, fetch_markets=markets).reconcile_once()
+        self.assertEqual(trade_calls, [])
+        self.assertEqual([len(c) for c in market_calls], [40])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import os
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import execution
+from risk_manager import RiskManager
+
+def _opp(i):
+    return {"match": f"M{i}", "condition_id": f"c{i}", "token_id": f"t{i}", "poly_prob": 0.85}
+
+class TestExecuteOpportunities(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch("execution.telegram_client"),
+            mock.patch("execution.polymarket_client.get_clob_yes_token_id", side_effect=lambda c: "tok-" + c),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_alert_only_places_no_orders(self):
+        with mock.patch("execution.trader.place_order") as place:
+            results = execution.execute_opportunities([_opp(1), _opp(2)], None)
+        self.assertEqual(results, ["alerted", "alerted"])
+        place.assert_not_called()
+
+    def test_orders_run_concurrently_within_budget(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def fake_order(token_id, stake):
+            with lock:
+                in_flight.append(token_id)
+                peak.append(len(in_flight))
+            release.wait(timeout=0.2)
+            with lock:
+                in_flight.remove(token_id)
+            return {"orderID": token_id}
+
+        rm = RiskManager(max_budget=3.0, stake_per_bet=1.0)
+        with mock.patch("execution.trader.place_order", side_effect=fake_order):
+            results = execution.execute_opportunities([_opp(i) for i in range(6)], rm)
+
+        self.assertEqual(results.count("placed"), 3)
+        self.assertEqual(results.count("skipped:budget_exceeded"), 3)
+        self.assertGreater(max(peak), 1)
+        self.assertEqual(rm.spent, 3.0)
+
+    def test_alert_does_not_wait_for_orders(self):
+        alert_sent = threading.Event()
+        saw_alert = []
+        execution.telegram_client.send_opportunity_alerts.side_effect = lambda signals: alert_sent.set() or signals
+
+        def slow_order(token_id, stake):
+            saw_alert.append(alert_sent.wait(timeout=2))  # Every order worker is busy meanwhile
+            return {"orderID": token_id}
+
+        opps = [dict(_opp(i), condition_id=f"alert-c{i}") for i in range(execution.ORDER_WORKERS)]
+        rm = RiskManager(max_budget=10.0, stake_per_bet=1.0)
+        with mock.patch("execution.trader.place_order", side_effect=slow_order):
+            execution.execute_opportunities(opps, rm)
+        self.assertEqual(saw_alert, [True] * len(opps))
+
+    def test_failed_order_releases_budget(self):
+        rm = RiskManager(max_budget=1.0, stake_per_bet=1.0)
+        with mock.patch("execution.trader.place_order", side_effect=Exception("no match")):
+            results = execution.execute_opportunities([_opp(1)], rm)
+        self.assertEqual(results, ["failed"])
+        self.assertEqual(rm.remaining, 1.0)
+
+    def test_auth_error_blocks_token(self):
+        rm = RiskManager(max_budget=5.0, stake_per_bet=1.0)
+        with mock.patch("execution.trader.place_order", side_effect=Exception("401 Unauthorized")):
+            execution.execute_opportunities([_opp(1)], rm)
+        self.assertEqual(rm.approve("tok-c1"), (False, "duplicate"))
+        self.assertEqual(rm.spent, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
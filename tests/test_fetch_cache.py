@@ -0,0 +1,120 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import polymarket_client
+from fetch_cache import SingleFlightCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class TestSingleFlightCache(unittest.TestCase):
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = SingleFlightCache(clock=clock)
+        calls = []
+        fetch = lambda: calls.append(1) or len(calls)
+
+        self.assertEqual(cache.get_or_fetch("k", fetch, ttl=10), 1)
+        clock.now = 9
+        self.assertEqual(cache.get_or_fetch("k", fetch, ttl=10), 1)
+        clock.now = 11
+        self.assertEqual(cache.get_or_fetch("k", fetch, ttl=10), 2)
+
+    def test_purge_expired(self):
+        clock = FakeClock()
+        cache = SingleFlightCache(clock=clock)
+        cache.get_or_fetch("old", lambda: 1, ttl=5)
+        cache.get_or_fetch("new", lambda: 2, ttl=50)
+        clock.now = 10
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_none_is_not_cached(self):
+        cache = SingleFlightCache()
+        results = iter([None, [1]])
+        self.assertIsNone(cache.get_or_fetch("k", lambda: next(results), ttl=10))
+        self.assertEqual(cache.get_or_fetch("k", lambda: next(results), ttl=10), [1])
+
+    def test_concurrent_callers_share_one_fetch(self):
+        cache = SingleFlightCache()
+        calls = []
+        started = threading.Event()
+
+        def slow_fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return ["events"]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", slow_fetch, ttl=10)))
+                   for _ in range(8)]
+        threads[0].start()
+        started.wait(1)
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["events"]] * 8)
+        self.assertEqual(cache.coalesced, 7)
+
+    def test_errors_propagate_to_waiters_and_are_not_cached(self):
+        cache = SingleFlightCache()
+        def boom():
+            raise RuntimeError("down")
+        with self.assertRaises(RuntimeError):
+            cache.get_or_fetch("k", boom, ttl=10)
+        self.assertEqual(cache.get_or_fetch("k", lambda: "ok", ttl=10), "ok")
+
+class TestSharedLeagueFetch(unittest.TestCase):
+    def setUp(self):
+        polymarket_client.clear_cache()
+        self.addCleanup(polymarket_client.clear_cache)
+        self.event = {"id": "1", "title": "A vs B", "startTime": "2026-03-01T15:00:00Z",
+                      "description": "long text we never read",
+                      "markets": [{"conditionId": "c1", "bestAsk": "0.5", "image": "x.png"}]}
+        self.leagues = len(polymarket_client.LEAGUE_SERIES_IDS) + len(polymarket_client.LEAGUE_TAG_SLUGS)
+
+    def test_repeated_callers_share_one_request_per_league_and_window(self):
+        with mock.patch("polymarket_client._get", return_value=[self.event]) as get:
+            polymarket_client.get_soccer_schedule()
+            polymarket_client.get_soccer_schedule()
+            polymarket_client.get_active_soccer_events()
+            polymarket_client.get_active_soccer_events()
+        self.assertEqual(get.call_count, 2 * self.leagues)
+
+    def test_live_query_is_time_bounded_and_projected(self):
+        with mock.patch("polymarket_client._get", return_value=[self.event]) as get:
+            events, prices = polymarket_client.get_active_soccer_events()
+        params = get.call_args.kwargs["params"]
+        self.assertIn("start_date_max", params)
+        self.assertIn("end_date_min", params)
+        self.assertLess(params["end_date_min"], params["start_date_max"])
+        self.assertNotIn("description", events[0])
+        self.assertNotIn("image", events[0]["markets"][0])
+        self.assertEqual(prices, {"c1": 0.5})
+
+    def test_token_lookup_keeps_only_the_token(self):
+        market = {"tokens": [{"outcome": "No", "token_id": "n1"}, {"outcome": "Yes", "token_id": "y1"}]}
+        polymarket_client.clear_resolved_tokens()
+        self.addCleanup(polymarket_client.clear_resolved_tokens)
+        with mock.patch("polymarket_client._get", return_value=market) as get:
+            self.assertEqual(polymarket_client.get_clob_yes_token_id("c9"), "y1")
+            self.assertEqual(polymarket_client.get_clob_yes_token_id("c9"), "y1")
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(len(polymarket_client._cache), 0)  # No CLOB market dict held
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import latency_benchmark
+from latency_benchmark import Scenario
+
+class TestLatencyBenchmark(unittest.TestCase):
+    def test_crossings_become_orders_and_reports_compare(self):
+        result = latency_benchmark.run_scenario(Scenario(matches=3, telegram_seconds=0, clob_latency_ms=10),
+                                                rounds=1, scan_interval=0.2, window=0.3)
+        self.assertEqual((result["crossings"], result["traded"], result["missed"]), (3, 3, 0))
+        t2t = result["tick_to_trade_ms"]
+        self.assertGreater(t2t["p50"], 0)
+        self.assertLessEqual(t2t["p50"], t2t["max"])
+        # Detection happens before the order reaches the CLOB
+        self.assertLessEqual(result["detect_ms"]["max"], t2t["max"])
+        self.assertGreater(result["gamma_requests"], 0)
+
+        report = {"settings": {}, "scenarios": {"one": result}}
+        baseline = {"settings": {}, "scenarios": {"one": {**result, "tick_to_trade_ms": {**t2t, "p50": t2t["p50"] * 2}}}}
+        rows = latency_benchmark.compare(report, baseline)
+        self.assertEqual(rows[0][:2], ("one", "tick_to_trade p50"))
+        self.assertEqual(rows[0][4], -50.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from latency_stats import percentile
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = [5.0, 1.0, 3.0, 2.0, 4.0]
+        self.assertEqual(percentile(values, 50), 3.0)
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 100), 5.0)
+        # Median of 1..20 is the 10th value (a rounded linear index would pick the 11th)
+        self.assertEqual(percentile(range(1, 21), 50), 10)
+        self.assertEqual(percentile(range(1, 21), 95), 19)
+        self.assertEqual(percentile(range(1, 11), 95), 10)
+
+    def test_empty_and_rounding(self):
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([0.123456], 95, digits=1), 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import league_catalog
+import polymarket_client
+
+SPORTS = [
+    {"sport": "epl", "tags": "1,100350,82", "series": "10188"},
+    {"sport": "bra", "tags": "1,100350", "series": "20001"},
+    {"sport": "mls", "tags": "1,100350", "series": "20002"},
+    {"sport": "nba", "tags": "1,745", "series": "10345"},  # not soccer
+]
+SERIES = [
+    {"id": "10188", "title": "EPL", "liquidity": "900000", "volume24hr": 5},
+    {"id": "20001", "title": "Brasileirao", "liquidity": "50000", "volume24hr": 1},
+    {"id": "20002", "title": "MLS", "liquidity": "120000", "volume24hr": 2},
+]
+
+class TestLeagueCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "catalog.json")
+        league_catalog._catalog = None
+        self.addCleanup(setattr, league_catalog, "_catalog", None)
+        self.addCleanup(polymarket_client.set_catalog_leagues, {})
+
+    def test_discover_filters_soccer_and_ranks_by_liquidity(self):
+        with mock.patch("polymarket_client.get_sports_metadata", return_value=SPORTS), \
+             mock.patch("polymarket_client.get_series_page", return_value=SERIES):
+            leagues = league_catalog.discover()
+        self.assertEqual([l["series_id"] for l in leagues], ["10188", "20002", "20001"])
+        self.assertEqual(leagues[1]["title"], "MLS")
+
+    def test_request_budget_is_respected(self):
+        full_page = [{"id": str(i), "liquidity": 1} for i in range(polymarket_client.GAMMA_EVENTS_LIMIT)]
+        with mock.patch("polymarket_client.get_sports_metadata", return_value=SPORTS), \
+             mock.patch("polymarket_client.get_series_page", return_value=full_page) as series:
+            league_catalog.discover(request_budget=4)
+        self.assertEqual(series.call_count, 3)
+
+    def test_refresh_persists_and_activates_catalog(self):
+        with mock.patch("polymarket_client.get_sports_metadata", return_value=SPORTS), \
+             mock.patch("polymarket_client.get_series_page", return_value=SERIES):
+            count = league_catalog.refresh_if_stale(self.path)
+        self.assertEqual(count, 3)
+        self.assertTrue(os.path.exists(self.path))
+        queried = {v for _, _, v in polymarket_client._league_queries()}
+        self.assertTrue({"20001", "20002"} <= queried)
+        # EPL is already configured — not queried twice
+        self.assertEqual([v for _, _, v in polymarket_client._league_queries()].count("10188"), 1)
+
+        # Fresh catalog on disk is reused without any Gamma request
+        league_catalog._catalog = None
+        with mock.patch("polymarket_client.get_sports_metadata") as sports:
+            league_catalog.refresh_if_stale(self.path)
+        sports.assert_not_called()
+
+    def test_failed_refresh_keeps_previous_catalog(self):
+        league_catalog.save([{"key": "mls", "series_id": "20002", "title": "", "liquidity": 1.0, "volume24hr": 0.0}],
+                            self.path)
+        league_catalog._catalog["refreshed_at"] = time.time() - 10 * 86400
+        with mock.patch("polymarket_client.get_sports_metadata", return_value=None):
+            self.assertEqual(league_catalog.refresh_if_stale(self.path), 1)
+
+class TestManyLeagues(unittest.TestCase):
+    def test_schedule_covers_hundreds_of_leagues(self):
+        polymarket_client.clear_cache()
+        self.addCleanup(polymarket_client.clear_cache)
+        self.addCleanup(polymarket_client.set_catalog_leagues, {})
+        polymarket_client.set_catalog_leagues({f"l{i}": str(30000 + i) for i in range(300)})
+
+        def fake_get(url, params=None):
+            sid = params.get("series_id") or params.get("tag_slug")
+            return [{"id": sid, "title": f"Home {sid} vs Away {sid}", "startTime": "2099-01-01T00:00:00Z"}]
+
+        with mock.patch("polymarket_client._get", side_effect=fake_get) as get, \
+             mock.patch("polymarket_client.MAX_SCHEDULE_HOURS", 10 ** 6):
+            matches = polymarket_client.get_soccer_schedule()
+        self.assertEqual(get.call_count, 306)
+        self.assertEqual(len(matches), 306)
+
+if __name__ == '__main__':
+    unittest.main()
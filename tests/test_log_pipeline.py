@@ -0,0 +1,51 @@
+import sys
+import os
+import glob
+import gzip
+import json
+import logging
+import queue
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import log_pipeline
+
+def _record(msg, level=logging.INFO):
+    return logging.LogRecord("scan", level, __file__, 1, msg, None, None)
+
+class TestLogPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "scan.log")
+
+    def test_rotated_files_are_gzip_compressed_and_capped(self):
+        handler = log_pipeline.build_file_handler(self.path, max_bytes=200, backup_count=2)
+        self.addCleanup(handler.close)
+        for i in range(50):
+            handler.emit(_record(f"line {i} " + "x" * 40))
+        rotated = sorted(glob.glob(self.path + ".*.gz"))
+        self.assertEqual(len(rotated), 2)
+        with gzip.open(rotated[0], "rt", encoding="utf-8") as f:
+            self.assertIn("line", f.read())
+
+    def test_json_lines(self):
+        handler = log_pipeline.build_file_handler(self.path, json_lines=True)
+        handler.emit(_record("Found 3 opportunities"))
+        handler.close()
+        with open(self.path, encoding="utf-8") as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry["msg"], "Found 3 opportunities")
+        self.assertEqual(entry["level"], "INFO")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = log_pipeline.DroppingQueueHandler(queue.Queue(maxsize=2))
+        for i in range(5):
+            handler.emit(_record(f"m{i}"))
+        self.assertEqual(handler.dropped, 3)
+
+if __name__ == '__main__':
+    unittest.main()
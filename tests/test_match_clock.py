@@ -0,0 +1,99 @@
+import sys
+import os
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import match_clock
+import scanner
+from sports_ws_stub import LocalSportsWS
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+class TestParseGameMessage(unittest.TestCase):
+    def test_parses_elapsed_and_score(self):
+        keys, state = match_clock.parse_game_message(
+            {"gameId": 42, "slug": "epl-ars-che", "elapsed": "90+3", "period": "2H", "score": "2-1", "live": True}
+        )
+        self.assertEqual(keys, [("slug", "epl-ars-che"), ("game", "42")])
+        self.assertEqual(state["minute"], 93)
+        self.assertEqual((state["home_score"], state["away_score"]), (2, 1))
+        self.assertFalse(state["ended"])
+
+    def test_ignores_non_game_messages(self):
+        self.assertIsNone(match_clock.parse_game_message({"type": "pong"}))
+
+class TestScannerUsesGameStates(unittest.TestCase):
+    def setUp(self):
+        now = datetime.now(timezone.utc)
+        # Wall clock says minute 80, but the live clock is at minute 60 (late kickoff / halftime)
+        self.event = {
+            "id": "1", "slug": "epl-a-b", "title": "A vs B",
+            "startTime": (now - timedelta(minutes=80)).isoformat(),
+            "markets": [{"conditionId": "c1", "question": "A"}],
+        }
+        self.prices = {"c1": 0.9}
+        self.now = now
+
+    def test_live_minute_overrides_estimate(self):
+        states = {"slug": {"epl-a-b": {"minute": 60, "period": "2H", "live": True, "ended": False, "updated_at": self.now}}}
+        self.assertEqual(scanner.filter_opportunities([self.event], self.prices, states), [])
+
+    def test_live_minute_in_window(self):
+        states = {"event": {"1": {"minute": 86, "period": "2H", "live": True, "ended": False, "updated_at": self.now}}}
+        opps = scanner.filter_opportunities([self.event], self.prices, states)
+        self.assertEqual(len(opps), 1)
+        self.assertEqual(opps[0]["minute"], 86)
+
+    def test_stale_state_falls_back_to_estimate(self):
+        old = self.now - timedelta(hours=1)
+        states = {"slug": {"epl-a-b": {"minute": 10, "period": "1H", "live": True, "ended": False, "updated_at": old}}}
+        opps = scanner.filter_opportunities([self.event], self.prices, states)
+        self.assertEqual(opps[0]["minute"], 80)
+
+    def test_ended_match_is_skipped(self):
+        states = {"slug": {"epl-a-b": {"minute": 90, "period": "FT", "live": False, "ended": True, "updated_at": self.now}}}
+        self.assertEqual(scanner.filter_opportunities([self.event], self.prices, states), [])
+
+    def test_ids_only_match_their_own_namespace(self):
+        # gameId 1 belongs to another match; it must not be read as Gamma event id 1
+        states = {"game": {"1": {"minute": 60, "period": "2H", "live": True, "ended": False, "updated_at": self.now}}}
+        opps = scanner.filter_opportunities([self.event], self.prices, states)
+        self.assertEqual(opps[0]["minute"], 80)
+
+class TestMatchClockFeed(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalSportsWS().start()
+        self.addCleanup(self.server.close)
+
+    def test_feed_consumes_updates_and_reconnects(self):
+        with mock.patch("match_clock.SPORTS_WS_RECONNECT_SECONDS", 0.1):
+            feed = match_clock.MatchClockFeed(self.server.url, subscribe_message='{"subscribe": "soccer"}')
+            feed.start()
+            self.addCleanup(feed.stop)
+
+            self.assertTrue(self.server.client_connected.wait(5))
+            self.assertTrue(_wait_for(lambda: self.server.received))
+            self.assertEqual(self.server.received[0], '{"subscribe": "soccer"}')
+
+            self.server.broadcast({"slug": "epl-a-b", "elapsed": "77", "period": "2H", "score": "1-0"})
+            self.assertTrue(_wait_for(lambda: "epl-a-b" in feed.table.snapshot()["slug"]))
+            self.assertEqual(feed.table.snapshot()["slug"]["epl-a-b"]["minute"], 77)
+
+            self.server.disconnect_clients()
+            self.assertTrue(self.server.client_connected.wait(5))
+            self.server.broadcast([{"slug": "epl-a-b", "elapsed": "78", "period": "2H"}])
+            self.assertTrue(_wait_for(lambda: feed.table.snapshot()["slug"]["epl-a-b"]["minute"] == 78))
+
+if __name__ == '__main__':
+    unittest.main()
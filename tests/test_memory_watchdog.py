@@ -0,0 +1,99 @@
+import sys
+import os
+import json
+import threading
+import unittest
+import urllib.request
+from http.server import HTTPServer
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import memory_watchdog
+import scheduler
+from memory_watchdog import MemoryWatchdog
+
+MB = 1024 * 1024
+
+class _Fake:
+    """Scripted RSS reader + monotonic clock."""
+    def __init__(self, rss_mb=50.0):
+        self.rss_mb = rss_mb
+        self.now = 0.0
+
+    def rss(self):
+        return int(self.rss_mb * MB)
+
+    def clock(self):
+        return self.now
+
+class TestMemoryWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.fake = _Fake()
+        self.wd = MemoryWatchdog(budget_mb=100, shed_ratio=0.8, cooldown=300,
+                                 rss_reader=self.fake.rss, clock=self.fake.clock)
+
+    def test_reads_real_rss(self):
+        rss = memory_watchdog.read_rss_bytes()
+        if rss is not None:
+            self.assertGreater(rss, MB)
+
+    def test_sheds_near_budget_with_cooldown(self):
+        calls = []
+        self.wd.register_shedder("cache", lambda: calls.append("cache"))
+        self.wd.register_shedder("broken", mock.Mock(side_effect=RuntimeError("boom")))
+
+        self.wd.sample()  # 50 MB — under the 80 MB threshold
+        self.assertEqual(calls, [])
+        self.fake.rss_mb = 85
+        with self.assertLogs("memory_watchdog", level="WARNING"):
+            self.wd.sample()
+        self.assertEqual(calls, ["cache"])
+        self.fake.now += 60
+        self.wd.sample()  # Still high but inside the cooldown
+        self.assertEqual(self.wd.sheds, 1)
+        self.fake.now += 300
+        self.wd.sample()
+        self.assertEqual(self.wd.sheds, 2)
+
+    def test_trend_flags_steady_growth(self):
+        with mock.patch("memory_watchdog.MEMORY_LOG_EVERY_SAMPLES", 1):
+            for _ in range(30):
+                self.wd.sample()
+                self.fake.now += 120
+                self.fake.rss_mb += 0.5  # 15 MB/h
+            self.assertAlmostEqual(self.wd.trend_mb_per_hour(), 15.0, places=1)
+            with self.assertLogs("memory_watchdog", level="WARNING") as logs:
+                self.wd.sample()
+        self.assertIn("possible leak", logs.output[0])
+
+    def test_trend_needs_half_an_hour(self):
+        for _ in range(5):
+            self.wd.sample()
+            self.fake.now += 60
+        self.assertIsNone(self.wd.trend_mb_per_hour())
+
+    def test_session_growth_is_recorded(self):
+        with self.wd.session("A vs B"):
+            self.fake.rss_mb += 12
+            self.fake.now += 2100
+            self.assertEqual(self.wd.status()["open_session"], {"title": "A vs B"})
+        record = self.wd.status()["sessions"][0]
+        self.assertEqual((record["title"], record["growth_mb"], record["duration_s"]), ("A vs B", 12.0, 2100))
+        self.assertIsNone(self.wd.status()["open_session"])
+
+class TestHealthRoute(unittest.TestCase):
+    def test_memory_endpoint(self):
+        server = HTTPServer(("127.0.0.1", 0), scheduler._HealthHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        memory_watchdog.get_watchdog().sample()
+        body = urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/memory").read()
+        data = json.loads(body)
+        self.assertEqual(data["budget_mb"], memory_watchdog.get_watchdog().budget_mb)
+        self.assertIn("allocated_blocks", data["last_sample"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import model_benchmark
+from models import Event, Market, Opportunity, Run
+
+RAW = {"id": 42, "title": "Arsenal vs. Chelsea", "slug": "epl-ars-che", "startTime": "2026-03-01T15:00:00Z",
+       "description": "never read", "gameId": 9001,
+       "markets": [{"conditionId": "0xabc", "question": "Will Arsenal win?", "bestAsk": "0.81",
+                    "clobTokenIds": '["111", "222"]', "image": "x.png"}]}
+
+class TestEvent(unittest.TestCase):
+    def test_parses_only_used_fields(self):
+        event = Event.from_gamma(RAW)
+        self.assertEqual(event.id, "42")
+        self.assertEqual(event.kickoff, datetime(2026, 3, 1, 15, 0, tzinfo=timezone.utc))
+        self.assertEqual(event.game_id, "9001")
+        market = event.markets[0]
+        self.assertEqual((market.condition_id, market.best_ask, market.token_id), ("0xabc", 0.81, "111"))
+        self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_legacy_dict_reads(self):
+        event = Event.from_gamma(RAW)
+        self.assertEqual(event["title"], "Arsenal vs. Chelsea")
+        self.assertEqual(event.get("startTime"), "2026-03-01T15:00:00Z")
+        self.assertEqual(event.get("startDate", "n/a"), "n/a")
+        self.assertNotIn("description", event)
+        self.assertNotIn("image", event["markets"][0])
+        self.assertEqual(event.markets[0].token_id, "111")
+        with self.assertRaises(KeyError):
+            event["markets"][0]["clobTokenIds"]  # Only the YES token is kept
+        with self.assertRaises(KeyError):
+            event["description"]
+
+    def test_strings_are_interned_across_parses(self):
+        a, b = Event.from_gamma(dict(RAW)), Event.from_gamma(dict(RAW, title="".join(["Arsenal vs. ", "Chelsea"])))
+        self.assertIs(a.title, b.title)
+        self.assertIs(a.markets[0].condition_id, b.markets[0].condition_id)
+
+    def test_equality_and_hashing_use_identity_keys(self):
+        self.assertEqual(Event.from_gamma(RAW), Event.from_gamma(dict(RAW, description="changed")))
+        self.assertEqual(len({Market("c1"), Market("c1", best_ask=0.5), Market("c2")}), 2)
+        now = datetime.now(timezone.utc)
+        self.assertEqual(Run("A vs B", None, now, now), Run.from_dict({"title": "A vs B", "wakeup_time": now, "end_time": now}))
+        self.assertNotEqual(Event.from_gamma(RAW), RAW)
+
+    def test_opportunity_reads_like_the_old_dict(self):
+        opp = Opportunity("A vs B", 80, "Will A win?", 0.85, "https://polymarket.com/event/x")
+        self.assertEqual(opp["minute"], 80)
+        self.assertIsNone(opp.get("token_id"))
+        self.assertEqual(opp.get("token_id", "fallback"), "fallback")
+
+class TestBenchmark(unittest.TestCase):
+    def test_models_are_smaller_and_faster_than_dicts(self):
+        report = model_benchmark.run(events=500, leagues=5)
+        self.assertLess(report["model_bytes_per_event"], report["dict_bytes_per_event"])
+        self.assertLess(report["dict_bytes_per_event"], report["raw_bytes_per_event"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import sys
+import os
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import execution
+import order_router
+import trader
+from order_router import OrderRouter, RateLimiter
+from risk_manager import RiskManager
+
+def _creds(suffix=""):
+    return {f"{var}{suffix}": f"{var.lower()}{suffix}-value" for var in order_router.CREDENTIAL_VARS}
+
+class FakeClient:
+    def __init__(self, creds):
+        self.key = creds["CLOB_API_KEY"]
+        self.orders = []
+
+    def create_market_order(self, args):
+        return args
+
+    def post_order(self, order, order_type):
+        self.orders.append(order.token_id)
+        return {"orderID": f"{self.key}-{order.token_id}", "status": "matched"}
+
+class TestCredentials(unittest.TestCase):
+    def test_numbered_sets_and_incomplete_ones_skipped(self):
+        env = {**_creds(), **_creds("_2"), "CLOB_PK_3": "only-a-key"}
+        wallets = order_router.load_credentials(env)
+        self.assertEqual(sorted(wallets), ["1", "2"])
+        self.assertEqual(wallets["2"]["CLOB_API_KEY"], "clob_api_key_2-value")
+
+    def test_credentials_configured_with_any_wallet(self):
+        with mock.patch.object(trader, "_backend", trader.LiveClobBackend()), \
+             mock.patch.dict(os.environ, {**_creds("_2"), "CLOB_PK": ""}):
+            self.assertTrue(trader.is_credentials_configured())
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_sustained_rate(self):
+        now = [0.0]
+        limiter = RateLimiter(rate=2.0, burst=2, monotonic=lambda: now[0])
+        self.assertEqual([limiter.reserve(), limiter.reserve()], [0.0, 0.0])
+        self.assertEqual(limiter.reserve(), 0.5)
+        now[0] = 1.0
+        self.assertEqual(limiter.reserve(), 0.0)
+
+    def test_penalize_rests_the_key(self):
+        now = [0.0]
+        limiter = RateLimiter(rate=1.0, burst=5, monotonic=lambda: now[0])
+        limiter.penalize(10)
+        self.assertEqual(limiter.wait_estimate(), 11.0)
+
+class TestOrderRouter(unittest.TestCase):
+    def setUp(self):
+        self.factory_calls = []
+
+        def factory(creds):
+            self.factory_calls.append(creds["CLOB_API_KEY"])
+            return FakeClient(creds)
+
+        env = {**_creds(), **_creds("_2"), **_creds("_3")}
+        self.router = OrderRouter.from_env(env, client_factory=factory)
+        self.backend = trader.LiveClobBackend(router=self.router)
+
+    def test_concurrent_orders_spread_over_wallets(self):
+        barrier = threading.Barrier(3)
+        leased = []
+
+        def order():
+            with self.router.lease() as wallet:
+                leased.append(wallet.name)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=order) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(leased), ["1", "2", "3"])
+
+    def test_clients_are_built_once_per_wallet(self):
+        for i in range(6):
+            self.backend.place_order(f"tok{i}", 1.0, wallet=str(i % 3 + 1))
+        self.assertEqual(len(self.factory_calls), 3)
+        self.assertEqual([w["orders"] for w in self.router.status()], [2, 2, 2])
+
+    def test_rate_limited_wallet_is_rested_and_avoided(self):
+        wallet = self.router.wallets["1"]
+        with self.assertRaises(RuntimeError):
+            with self.router.lease("1"):
+                raise RuntimeError("PolyApiException[status_code=429, error_message=Too Many Requests]")
+        self.assertEqual(wallet.rate_limited, 1)
+        self.assertGreater(wallet.limiter.wait_estimate(), 5)
+        self.assertEqual(self.router.names()[-1], "1")
+
+class TestPerWalletBudget(unittest.TestCase):
+    def test_reservations_alternate_and_respect_both_caps(self):
+        rm = RiskManager(max_budget=5.0, stake_per_bet=1.0, wallet_budget=2.0)
+        for i in range(4):
+            self.assertEqual(rm.reserve(f"t{i}", wallets=["a", "b"]), (True, "ok"))
+        self.assertEqual([rm.wallet_of(f"t{i}") for i in range(4)], ["a", "b", "a", "b"])
+        self.assertEqual(rm.reserve("t4", wallets=["a", "b"]), (False, "wallet_budget_exceeded"))
+        # A third wallet has room, but the session cap still binds after one more
+        self.assertEqual(rm.reserve("t4", wallets=["a", "b", "c"]), (True, "ok"))
+        self.assertEqual(rm.reserve("t5", wallets=["c"]), (False, "budget_exceeded"))
+
+        for i in range(5):
+            rm.commit(f"t{i}")
+        self.assertEqual(rm.wallet_spent, {"a": 2.0, "b": 2.0, "c": 1.0})
+        restored = RiskManager.restore(rm.snapshot())
+        self.assertEqual(restored.wallet_spent, {"a": 2.0, "b": 2.0, "c": 1.0})
+        self.assertEqual(restored.reserve("t9", wallets=["a"]), (False, "budget_exceeded"))
+
+    def test_released_reservation_frees_wallet_budget(self):
+        rm = RiskManager(max_budget=5.0, stake_per_bet=1.0, wallet_budget=1.0)
+        self.assertTrue(rm.reserve("t1", wallets=["a"])[0])
+        rm.release("t1")
+        self.assertEqual(rm.reserve("t2", wallets=["a"]), (True, "ok"))
+
+    def test_execution_routes_orders_to_assigned_wallets(self):
+        env = {**_creds(), **_creds("_2")}
+        router = OrderRouter.from_env(env, client_factory=FakeClient)
+        rm = RiskManager(max_budget=5.0, stake_per_bet=1.0, wallet_budget=2.0)
+        opps = [{"match": f"M{i}", "condition_id": f"c{i}", "token_id": f"t{i}", "poly_prob": 0.85} for i in range(5)]
+        with mock.patch.object(trader, "_backend", trader.LiveClobBackend(router=router)), \
+             mock.patch("execution.telegram_client"), \
+             mock.patch("execution.polymarket_client.get_clob_yes_token_id", side_effect=lambda c: "tok-" + c):
+            results = execution.execute_opportunities(opps, rm)
+        self.assertEqual(sorted(results), ["placed"] * 4 + ["skipped:wallet_budget_exceeded"])
+        self.assertEqual(rm.wallet_spent, {"1": 2.0, "2": 2.0})
+        self.assertEqual(sorted(len(w.client().orders) for w in router.wallets.values()), [2, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import paper_trading
+import trader
+from paper_trading import FillLedger, OrderBook, PaperOrderError, PaperTradingBackend
+
+class TestOrderBook(unittest.TestCase):
+    def test_fok_walks_levels_and_consumes_liquidity(self):
+        book = OrderBook([{"price": "0.90", "size": "10"}, [0.80, 5]])
+        shares, avg = book.fill_fok(6.0)  # 5 @ 0.80 = $4, then $2 @ 0.90
+        self.assertAlmostEqual(shares, 5 + 2 / 0.9)
+        self.assertAlmostEqual(avg, 6.0 / shares)
+        self.assertEqual(len(book.asks), 1)
+        self.assertAlmostEqual(book.depth_usd, 9.0 - 2.0)
+
+    def test_fok_is_all_or_nothing(self):
+        book = OrderBook([[0.85, 2]])
+        with self.assertRaises(PaperOrderError) as ctx:
+            book.fill_fok(5.0)
+        self.assertEqual(str(ctx.exception), "no match")
+        self.assertEqual(book.asks, [[0.85, 2.0]])
+
+class TestPaperBackend(unittest.TestCase):
+    def test_fills_and_rejects_are_ledgered(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fills.jsonl")
+            books = paper_trading.RecordedBooks({"tok": {"asks": [[0.85, 100]]}})
+            backend = PaperTradingBackend(books=books, latency_ms=0, jitter_ms=0, ledger=FillLedger(path))
+
+            resp = backend.place_order("tok", 1.0)
+            self.assertEqual(resp["status"], "matched")
+            with self.assertRaises(PaperOrderError) as ctx:
+                backend.place_order("unknown", 1.0)
+            self.assertEqual(str(ctx.exception), "Invalid token id")
+
+            stats = backend.ledger.stats()
+            self.assertEqual((stats["orders"], stats["fills"], stats["rejects"]), (2, 1, 1))
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual([line["status"] for line in lines], ["matched", "rejected"])
+
+    def test_trader_routes_through_installed_backend(self):
+        backend = PaperTradingBackend(latency_ms=0, jitter_ms=0)
+        previous = trader.set_backend(backend)
+        try:
+            with mock.patch.dict(os.environ, {"CLOB_PK": ""}):
+                self.assertTrue(trader.is_credentials_configured())
+            self.assertEqual(trader.place_order("any", 1.0)["status"], "matched")
+            self.assertEqual(trader.place_order("any", 1.0, wallet="w2")["status"], "matched")
+        finally:
+            trader.set_backend(previous)
+        self.assertEqual([f["wallet"] for f in backend.ledger.fills()], [None, "w2"])
+
+    def test_env_selects_paper_backend(self):
+        previous = trader.set_backend(None)
+        try:
+            with mock.patch.dict(os.environ, {"MINUTEBID_EXECUTION_BACKEND": "paper"}), \
+                 mock.patch("paper_trading.PAPER_LEDGER_FILE", ""):
+                self.assertEqual(trader.get_backend().name, "paper")
+        finally:
+            trader.set_backend(previous)
+
+class TestBurst(unittest.TestCase):
+    def test_risk_guard_holds_under_burst(self):
+        sentinel = object()
+        previous = trader.set_backend(sentinel)
+        self.addCleanup(trader.set_backend, previous)
+        report = paper_trading.run_burst(orders=300, tokens=60, budget=20.0, latency_ms=1, jitter_ms=0)
+        self.assertEqual(report["statuses"]["placed"], 20)
+        self.assertTrue(report["budget_respected"])
+        self.assertEqual(report["duplicate_fills"], 0)
+        self.assertEqual(sum(report["statuses"].values()), 300)
+        self.assertIs(trader.set_backend(previous), sentinel)  # Restored after the burst
+
+if __name__ == '__main__':
+    unittest.main()
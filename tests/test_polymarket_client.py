@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import polymarket_client
+
+def _event(i, kickoff):
+    ts = kickoff.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"id": str(i), "title": f"Team {i} vs Team {i}b", "startTime": ts, "startDate": ts, "markets": []}
+
+class FakeGamma:
+    """Serves a sorted list of events with limit/offset paging."""
+    def __init__(self, events):
+        self.events = events
+        self.offsets = []
+
+    def __call__(self, url, params=None):
+        self.offsets.append(params["offset"])
+        return self.events[params["offset"]:params["offset"] + params["limit"]]
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        polymarket_client.clear_cache()
+        self.addCleanup(polymarket_client.clear_cache)
+        patches = [
+            mock.patch("polymarket_client.GAMMA_EVENTS_LIMIT", 10),
+            mock.patch("polymarket_client.LEAGUE_SERIES_IDS", {"epl": "1"}),
+            mock.patch("polymarket_client.LEAGUE_TAG_SLUGS", {}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.now = datetime.now(timezone.utc)
+
+    def test_schedule_covers_every_page_within_horizon(self):
+        events = [_event(i, self.now + timedelta(hours=1, minutes=i)) for i in range(25)]
+        gamma = FakeGamma(events)
+        with mock.patch("polymarket_client._get", side_effect=gamma):
+            matches = polymarket_client.get_soccer_schedule()
+        self.assertEqual(len(matches), 25)
+        self.assertEqual(gamma.offsets, [0, 10, 20])
+
+    def test_pages_are_handled_in_league_order(self):
+        # The first league answers last; its pages must still be handled first
+        def pages(param, value, window, horizon):
+            time.sleep(0.1 if value == "1" else 0)
+            yield [value]
+
+        handled = []
+        with mock.patch("polymarket_client.LEAGUE_SERIES_IDS", {"epl": "1", "laliga": "2", "seriea": "3"}), \
+             mock.patch("polymarket_client.iter_event_pages", side_effect=pages):
+            polymarket_client._for_each_league_page("schedule", self.now, handled.extend)
+        self.assertEqual(handled, ["1", "2", "3"])
+
+    def test_stops_after_page_past_horizon(self):
+        near = [_event(i, self.now + timedelta(hours=1)) for i in range(5)]
+        far = [_event(i, self.now + timedelta(days=10)) for i in range(5, 40)]
+        gamma = FakeGamma(near + far)
+        with mock.patch("polymarket_client._get", side_effect=gamma):
+            pages = list(polymarket_client.iter_event_pages(
+                "series_id", "1", "schedule", self.now + timedelta(hours=48)))
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(gamma.offsets, [0])
+
+    def test_pages_are_yielded_lazily(self):
+        gamma = FakeGamma([_event(i, self.now) for i in range(30)])
+        with mock.patch("polymarket_client._get", side_effect=gamma):
+            pages = polymarket_client.iter_event_pages("series_id", "1", "live")
+            next(pages)
+            self.assertEqual(gamma.offsets, [0])
+
+    def test_failed_page_ends_iteration(self):
+        with mock.patch("polymarket_client._get", return_value=None):
+            self.assertEqual(list(polymarket_client.iter_event_pages("series_id", "1", "live")), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.server import HTTPServer
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import profiler
+import scheduler
+from profiler import ScanProfiler
+
+def _busy():
+    return sum(i * i for i in range(20000))
+
+class TestParseSpec(unittest.TestCase):
+    def test_specs(self):
+        self.assertEqual(profiler.parse_spec("scans:5"), {"mode": "cpu", "scans": 5})
+        self.assertEqual(profiler.parse_spec("memory:session"), {"mode": "memory", "session": True})
+        self.assertIsNone(profiler.parse_spec("scans:0"))
+        self.assertIsNone(profiler.parse_spec("bogus"))
+
+class TestScanProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.prof = ScanProfiler(out_dir=self.tmp.name)
+
+    def test_disarmed_scan_writes_nothing(self):
+        with self.prof.scan():
+            _busy()
+        self.assertEqual(self.prof.list_files(), [])
+
+    def test_cpu_capture_spans_next_n_scans(self):
+        self.prof.arm("cpu", scans=2)
+        with self.prof.scan():
+            _busy()
+        self.assertEqual(self.prof.list_files(), [])
+        self.assertEqual(self.prof.status()["active"]["scans_done"], 1)
+        with self.prof.scan():
+            _busy()
+        files = self.prof.list_files()
+        self.assertEqual(sorted(f.rsplit(".", 1)[1] for f in files), ["prof", "txt"])
+        report = self.prof.read_file([f for f in files if f.endswith(".txt")][0]).decode()
+        self.assertIn("2 scan(s)", report)
+        self.assertIn("_busy", report)
+        self.assertIsNone(self.prof.status()["armed"])
+        self.assertIsNone(self.prof.status()["active"])
+
+    def test_memory_session_capture(self):
+        self.prof.arm("memory", session=True)
+        with self.prof.scan():
+            pass  # Session captures only start at a session boundary
+        self.assertIsNotNone(self.prof.status()["armed"])
+        kept = []
+        with self.prof.session():
+            for _ in range(3):
+                with self.prof.scan():
+                    kept.append(bytearray(200_000))
+        files = self.prof.list_files()
+        self.assertTrue(any(f.endswith(".tracemalloc") for f in files))
+        report = self.prof.read_file([f for f in files if f.endswith(".txt")][0]).decode()
+        self.assertIn("session memory growth, 3 scan(s)", report)
+        self.assertIn("test_profiler.py", report)
+
+class TestHttpRoutes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch("profiler._profiler", ScanProfiler(out_dir=self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled_without_token(self):
+        with mock.patch.dict(os.environ, {"MINUTEBID_PROFILE_TOKEN": ""}):
+            self.assertEqual(profiler.handle_http("GET", "/profile", {})[0], 404)
+
+    def test_arm_download_and_traversal_via_health_server(self):
+        server = HTTPServer(("127.0.0.1", 0), scheduler._HealthHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_port}"
+
+        with mock.patch.dict(os.environ, {"MINUTEBID_PROFILE_TOKEN": "s3cret"}):
+            self.assertEqual(urllib.request.urlopen(base + "/").read(), b"OK")
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(base + "/profile?token=wrong")
+            self.assertEqual(ctx.exception.code, 403)
+
+            req = urllib.request.Request(base + "/profile?token=s3cret&mode=cpu&scans=1", method="POST")
+            self.assertIn(b'"scans": 1', urllib.request.urlopen(req).read())
+            with profiler.scan():
+                _busy()
+            name = profiler.get_profiler().last_files[0]
+            body = urllib.request.urlopen(f"{base}/profile/files/{name}?token=s3cret").read()
+            self.assertGreater(len(body), 0)
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(f"{base}/profile/files/..%2Fconfig.py?token=s3cret")
+            self.assertEqual(ctx.exception.code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import os
+import threading
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from risk_manager import RiskManager
+
+class TestRiskManagerReservations(unittest.TestCase):
+    def test_reserve_commit_release(self):
+        rm = RiskManager(max_budget=2.0, stake_per_bet=1.0)
+        self.assertEqual(rm.reserve("t1"), (True, "ok"))
+        # Reserved token counts as duplicate while in flight
+        self.assertEqual(rm.reserve("t1"), (False, "duplicate"))
+        self.assertEqual(rm.remaining, 1.0)
+
+        rm.commit("t1")
+        self.assertEqual(rm.spent, 1.0)
+        self.assertEqual(rm.bets_placed, 1)
+
+        self.assertEqual(rm.reserve("t2"), (True, "ok"))
+        rm.release("t2")
+        self.assertEqual(rm.remaining, 1.0)
+        self.assertEqual(rm.approve("t2"), (True, "ok"))
+
+    def test_reservations_hold_budget(self):
+        rm = RiskManager(max_budget=2.0, stake_per_bet=1.0)
+        self.assertTrue(rm.reserve("a")[0])
+        self.assertTrue(rm.reserve("b")[0])
+        self.assertEqual(rm.reserve("c"), (False, "budget_exceeded"))
+
+    def test_concurrent_reserve_never_exceeds_cap(self):
+        rm = RiskManager(max_budget=5.0, stake_per_bet=1.0)
+        barrier = threading.Barrier(20)
+        granted = []
+
+        def worker(i):
+            barrier.wait()
+            if rm.reserve(f"token-{i}")[0]:
+                granted.append(i)
+                rm.commit(f"token-{i}")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(granted), 5)
+        self.assertEqual(rm.spent, 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
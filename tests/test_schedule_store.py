@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scheduler
+from models import Event, Run
+from schedule_store import ScheduleStore
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+def _event(event_id, minutes, title=None):
+    return Event(event_id, title or f"Home {event_id} vs. Away", kickoff=NOW + timedelta(minutes=minutes))
+
+class TestScheduleStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ScheduleStore(80, 35, horizon_hours=48)
+        self.seen = []
+        self.store.subscribe(self.seen.append)
+
+    def test_deltas_keep_unchanged_runs(self):
+        self.store.apply([_event("1", 60), _event("2", 10), _event("3", 30)], NOW)
+        kept = self.store.get("3")
+        self.assertEqual([r.event_id for r in self.store.runs()], ["2", "3", "1"])
+
+        # 2 is delayed past 1, 3 is unchanged, 1 disappears, 4 is new
+        changes = self.store.apply([_event("2", 90), _event("3", 30), _event("4", 20)], NOW)
+        self.assertEqual(sorted((c.kind, c.run.event_id) for c in changes),
+                         [("added", "4"), ("cancelled", "1"), ("moved", "2")])
+        self.assertIs(self.store.get("3"), kept)
+        self.assertEqual([r.event_id for r in self.store.runs()], ["4", "3", "2"])
+        self.assertEqual(len(self.seen), 2)
+
+        # Nothing changed: no event, same list object
+        runs = self.store.runs()
+        self.assertEqual(self.store.apply([_event("2", 90), _event("3", 30), _event("4", 20)], NOW), [])
+        self.assertIs(self.store.runs(), runs)
+        self.assertEqual(len(self.seen), 2)
+
+    def test_open_windows_survive_fetches_and_expire(self):
+        self.store.apply([_event("live", -90), _event("later", 30)], NOW)
+        self.assertEqual(self.store.active(NOW).event_id, "live")
+        self.assertEqual(self.store.next_wakeup(NOW), NOW + timedelta(minutes=110))
+
+        # A fetch without the live match only cancels the one that has not started
+        changes = self.store.apply([_event("other", 40)], NOW)
+        self.assertEqual(sorted((c.kind, c.run.event_id) for c in changes),
+                         [("added", "other"), ("cancelled", "later")])
+        # An empty (failed) fetch cancels nothing
+        self.assertEqual(self.store.apply([], NOW), [])
+
+        changes = self.store.expire(NOW + timedelta(minutes=26))
+        self.assertEqual([(c.kind, c.run.event_id) for c in changes], [("expired", "live")])
+        self.assertIsNone(self.store.active(NOW + timedelta(minutes=26)))
+
+    def test_snapshot_runs_without_event_ids_are_adopted(self):
+        legacy = Run("Home 1 vs. Away", NOW, NOW + timedelta(minutes=80), NOW + timedelta(minutes=115))
+        self.store.restore([legacy], NOW)
+        changes = self.store.apply([_event("1", 0)], NOW)
+        self.assertEqual([c.kind for c in changes], ["updated"])
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.runs()[0].event_id, "1")
+
+    def test_get_upcoming_runs_matches_store(self):
+        matches = [{"id": "9", "title": "A vs. B", "startTime": "2099-01-01T15:00:00Z"},
+                   {"id": "8", "title": "C vs. D", "startTime": None}]
+        self.assertEqual(scheduler.get_upcoming_runs(matches), [])  # Beyond the horizon / no kickoff
+        soon = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        runs = scheduler.get_upcoming_runs([{"id": "7", "title": "E vs. F", "startTime": soon}])
+        self.assertEqual([(r.title, r.event_id) for r in runs], [("E vs. F", "7")])
+
+if __name__ == '__main__':
+    unittest.main()
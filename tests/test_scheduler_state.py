@@ -0,0 +1,108 @@
+import sys
+import os
+import json
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scheduler
+import state_store
+from risk_manager import RiskManager
+
+class _StopLoop(Exception):
+    pass
+
+class TestStateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "state.json")
+
+    def test_round_trip_and_atomic_replace(self):
+        now = datetime.now(timezone.utc)
+        run = {"title": "A vs B", "kickoff": now, "wakeup_time": now, "end_time": now}
+        state_store.save({"runs": [state_store.encode_run(run)]}, self.path)
+        loaded = state_store.load(self.path)
+        self.assertEqual(state_store.decode_run(loaded["runs"][0]), run)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_corrupt_or_foreign_snapshot_is_ignored(self):
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(state_store.load(self.path))
+        with open(self.path, "w") as f:
+            json.dump({"version": 999}, f)
+        self.assertIsNone(state_store.load(self.path))
+
+class TestRiskSnapshot(unittest.TestCase):
+    def test_in_flight_reservations_restore_as_spent(self):
+        rm = RiskManager(max_budget=5.0, stake_per_bet=1.0)
+        rm.reserve("a")
+        rm.commit("a")
+        rm.reserve("b")  # crash while this order was in flight
+        restored = RiskManager.restore(rm.snapshot())
+        self.assertEqual(restored.spent, 2.0)
+        self.assertEqual(restored.approve("a"), (False, "duplicate"))
+        self.assertEqual(restored.approve("b"), (False, "duplicate"))
+
+class TestResume(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = os.path.join(self.tmp.name, "state.json")
+        for target, value in [
+            ("state_store.SCHEDULER_STATE_FILE", path),
+            ("scheduler.SPORTS_WS_ENABLED", False),
+            ("scheduler.LEAGUE_CATALOG_ENABLED", False),
+            ("scheduler.BET_LEDGER_ENABLED", False),
+        ]:
+            p = mock.patch(target, value)
+            p.start()
+            self.addCleanup(p.stop)
+        for target in ("scheduler._start_health_server", "scheduler.telegram_client", "scheduler._prewarm_trader"):
+            p = mock.patch(target)
+            p.start()
+            self.addCleanup(p.stop)
+
+        now = datetime.now(timezone.utc)
+        self.run_dict = {"title": "A vs B", "kickoff": now - timedelta(minutes=85),
+                         "wakeup_time": now - timedelta(minutes=5), "end_time": now + timedelta(minutes=30)}
+        risk = RiskManager(max_budget=5.0, stake_per_bet=1.0)
+        risk.record_bet("tok-1")
+        state_store.save({
+            "last_discovery_time": time.time() - 60,
+            "last_dashboard_update": time.time(),
+            "last_dashboard_repost": time.time(),
+            "runs": [state_store.encode_run(self.run_dict)],
+            "session": {**state_store.encode_run(self.run_dict), "risk": risk.snapshot()},
+            "resolved_tokens": {"c1": "tok-1"},
+        })
+
+    def test_resumes_live_session_without_discovery(self):
+        scans = []
+
+        def fake_scan(risk_manager=None):
+            scans.append(risk_manager)
+            raise _StopLoop()
+
+        with mock.patch("scheduler.polymarket_client.get_soccer_schedule") as discover, \
+             mock.patch("scheduler.main.run_single_scan", side_effect=fake_scan), \
+             mock.patch("scheduler.time.sleep", side_effect=_StopLoop):
+            started = time.monotonic()
+            with self.assertRaises(_StopLoop):
+                scheduler.run_scheduler_loop()
+
+        discover.assert_not_called()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(len(scans), 1)
+        self.assertEqual(scans[0].spent, 1.0)
+        self.assertEqual(scans[0].approve("tok-1"), (False, "duplicate"))
+        self.assertEqual(scheduler.polymarket_client.resolved_tokens().get("c1"), "tok-1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import sys
+import os
+import pickle
+import signal
+import unittest
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import clock
+import polymarket_client
+import scanner
+import shard_pool
+from models import Opportunity
+
+QUERIES = [(f"l{i}", "series_id", str(40000 + i)) for i in range(6)]
+
+
+def _read_in_child(handle, key, out):
+    table = shard_pool.SharedPriceTable.attach(handle)
+    out.put(table.get(key))
+    table.put("0xchild", 0.91)
+    table.close()
+
+
+class TestSharedPriceTable(unittest.TestCase):
+    def setUp(self):
+        self.ctx = multiprocessing.get_context("spawn")
+        self.table = shard_pool.SharedPriceTable.create(slots=8, ctx=self.ctx)
+        self.addCleanup(self.table.close)
+
+    def test_put_get_and_overwrite(self):
+        self.table.put_many([("0xa", 0.81), ("0xb", 0.9)], updated=100.0)
+        self.table.put("0xa", 0.85, updated=200.0)
+        self.assertEqual(self.table.get_entry("0xa"), (0.85, 200.0))
+        self.assertEqual(self.table.get("0xb"), 0.9)
+        self.assertIsNone(self.table.get("0xmissing"))
+
+    def test_full_table_drops_instead_of_overwriting(self):
+        dropped = self.table.put_many([(f"0x{i}", 0.5) for i in range(10)])
+        self.assertEqual(dropped, 2)
+        self.assertEqual(sum(self.table.get(f"0x{i}") is not None for i in range(10)), 8)
+
+    def test_full_table_starts_a_new_epoch(self):
+        self.table.put_many([(f"0xold{i}", 0.5) for i in range(4)])  # max_load 0.5 of 8 slots
+        self.assertEqual(len(self.table), 4)
+        self.table.put("0xnew", 0.9)
+        self.assertEqual(self.table.resets, 1)
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual(self.table.get("0xnew"), 0.9)
+        self.assertIsNone(self.table.get("0xold0"))
+
+    def test_visible_across_processes(self):
+        self.table.put("0xa", 0.83)
+        out = self.ctx.Queue()
+        child = self.ctx.Process(target=_read_in_child, args=(self.table.handle(), "0xa", out))
+        child.start()
+        self.assertEqual(out.get(timeout=30), 0.83)
+        child.join(30)
+        self.assertEqual(self.table.get("0xchild"), 0.91)
+
+    def test_rejects_non_power_of_two(self):
+        with self.assertRaises(ValueError):
+            shard_pool.SharedPriceTable.create(slots=12)
+
+
+class TestShardPool(unittest.TestCase):
+    def test_sharding_is_stable_and_complete(self):
+        groups = polymarket_client.shard_league_queries(3)
+        self.assertEqual(groups, polymarket_client.shard_league_queries(3))
+        self.assertEqual(sorted(q for g in groups for q in g), sorted(polymarket_client._league_queries()))
+
+    def test_opportunities_pickle(self):
+        opp = Opportunity("A vs B", 80, "Will A win?", 0.85, "https://polymarket.com/event/x", "t1", "0xa")
+        self.assertEqual(pickle.loads(pickle.dumps(opp)), opp)
+
+    def test_sharded_scan_matches_in_process_scan(self):
+        synthetic = {"events_per_league": 60, "start": datetime.now(timezone.utc) - timedelta(minutes=180)}
+        original_get = polymarket_client._get
+        previous_clock = shard_pool._install_synthetic_gamma(**synthetic)
+        try:
+            polymarket_client.clear_cache()
+            events, prices = polymarket_client.get_active_soccer_events(QUERIES)
+            expected = scanner.filter_opportunities(events, prices)
+        finally:
+            polymarket_client._get = original_get
+            polymarket_client.clear_cache()
+            clock.set_clock(previous_clock)
+        self.assertTrue(expected)
+
+        pool = shard_pool.ShardPool(2, table_slots=1 << 12, timeout=60, synthetic=synthetic).start()
+        try:
+            merged = pool.scan(queries=QUERIES)
+            self.assertEqual(sorted(merged, key=lambda o: o.condition_id),
+                             sorted(expected, key=lambda o: o.condition_id))
+            self.assertEqual(pool.price(expected[0].condition_id), expected[0].poly_prob)
+            self.assertEqual(sum(s["leagues"] for s in pool.last_stats.values()), len(QUERIES))
+        finally:
+            pool.stop()
+
+    @unittest.skipUnless(hasattr(signal, "SIGSTOP"), "needs SIGSTOP")
+    def test_hung_worker_is_replaced(self):
+        synthetic = {"events_per_league": 5, "start": datetime.now(timezone.utc) - timedelta(minutes=180)}
+        pool = shard_pool.ShardPool(2, table_slots=1 << 12, timeout=60, synthetic=synthetic).start()
+        try:
+            expected = pool.scan(queries=QUERIES)
+            hung = pool._procs[0]
+            os.kill(hung.pid, signal.SIGSTOP)
+            pool.timeout = 2
+            pool.scan(queries=QUERIES)
+            self.assertEqual(pool.restarts, 1)
+            self.assertFalse(hung.is_alive())
+            pool.timeout = 60
+            self.assertEqual(len(pool.scan(queries=QUERIES)), len(expected))
+            self.assertEqual(len(pool.last_stats), 2)
+        finally:
+            pool.stop()
+
+    def test_disabled_by_default(self):
+        os.environ.pop("MINUTEBID_SHARD_WORKERS", None)
+        self.assertIsNone(shard_pool.get_pool())
+
+
+if __name__ == '__main__':
+    unittest.main()
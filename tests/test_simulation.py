@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import clock
+import scanner
+import simulation
+
+START = datetime(2026, 3, 7, 12, 0, tzinfo=timezone.utc)
+
+class TestVirtualClock(unittest.TestCase):
+    def test_sleep_advances_instantly_and_stops_at_limit(self):
+        vc = clock.VirtualClock(START, stop_at=START + timedelta(minutes=5))
+        started = time.monotonic()
+        vc.sleep(120)
+        vc.sleep(120)
+        self.assertEqual(vc.now(), START + timedelta(minutes=4))
+        with self.assertRaises(clock.SimulationFinished):
+            vc.sleep(120)
+        self.assertEqual(vc.now(), START + timedelta(minutes=5))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_scanner_reads_installed_clock(self):
+        event = {"id": "1", "title": "A vs B", "startTime": "2026-03-07T12:00:00Z",
+                 "markets": [{"conditionId": "c1", "question": "A wins", "clobTokenIds": ["t1"]}]}
+        previous = clock.set_clock(clock.VirtualClock(START + timedelta(minutes=80)))
+        try:
+            opps = scanner.filter_opportunities([event], {"c1": 0.85})
+        finally:
+            clock.set_clock(previous)
+        self.assertEqual(len(opps), 1)
+        self.assertEqual(opps[0]["minute"], 80)
+
+class TestSimulation(unittest.TestCase):
+    def test_overlapping_matches_run_in_virtual_time(self):
+        matches = simulation.synthetic_matches(40, START, spread_hours=2, seed=3)
+        started = time.monotonic()
+        report = simulation.Simulation(matches, START, hours=4.5).run()
+
+        self.assertLess(time.monotonic() - started, 10.0)
+        self.assertIsInstance(clock.get_clock(), clock.SystemClock)
+        self.assertEqual(report["virtual_hours"], 4.5)
+        self.assertGreater(report["scans"], 0)
+        self.assertGreater(report["orders_placed"], 0)
+        self.assertEqual(report["signals_detected"] + report["missed_signals"], report["signals"])
+        self.assertEqual(report["windows"], 40)
+
+    def test_price_path_interpolation(self):
+        path = [[0, 0.5], [80, 0.8], [100, 1.0]]
+        self.assertEqual(simulation.price_at(path, -5), 0.5)
+        self.assertAlmostEqual(simulation.price_at(path, 40), 0.65)
+        self.assertAlmostEqual(simulation.price_at(path, 90), 0.9)
+        self.assertEqual(simulation.price_at(path, 130), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import sys
+import os
+import subprocess
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+import startup_profile
+
+class TestLazyImports(unittest.TestCase):
+    def test_scheduler_import_skips_crypto_stack(self):
+        code = ("import sys, scheduler; "
+                "print(any(m.split('.')[0] in ('eth_account', 'py_clob_client') for m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+    def test_importing_main_attaches_no_log_handlers(self):
+        code = "import logging, main; print(len(logging.getLogger().handlers))"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "0")
+
+    def test_prewarm_loads_trader_dependencies(self):
+        code = "import sys, trader; trader.prewarm(); print('py_clob_client.client' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "True")
+
+    def test_profile_report(self):
+        text = startup_profile.report("scheduler", top=5)
+        self.assertIn("Import profile for 'scheduler'", text)
+        self.assertNotIn("WARNING", text)
+
+if __name__ == '__main__':
+    unittest.main()
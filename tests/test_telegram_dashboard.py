@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import telegram_client
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+def _runs(*hours_ahead):
+    return [{"title": f"M{i}", "wakeup_time": NOW + timedelta(hours=h)} for i, h in enumerate(hours_ahead)]
+
+class TestDashboardRenderer(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch("telegram_client._get_last_dashboard_id", return_value=None),
+            mock.patch("telegram_client._save_dashboard_id"),
+            mock.patch("telegram_client.send_message", return_value=101),
+            mock.patch("telegram_client.edit_message", return_value=True),
+        ]
+        self.mocks = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+        self.send, self.edit = self.mocks[2], self.mocks[3]
+
+    def test_only_meaningful_changes_are_pushed(self):
+        r = telegram_client.DashboardRenderer(min_edit_interval=0)
+        runs = _runs(8.5)
+        self.assertEqual(r.push(runs, now=NOW), "sent")
+        # 10 minutes later the hour-granularity countdown is unchanged — no API call
+        self.assertEqual(r.push(runs, now=NOW + timedelta(minutes=10)), "unchanged")
+        self.assertEqual(r.push(runs, now=NOW + timedelta(hours=1)), "edited")
+        self.assertEqual(self.send.call_count, 1)
+        self.assertEqual(self.edit.call_count, 1)
+
+    def test_countdown_granularity_follows_next_wakeup(self):
+        far = telegram_client.render_dashboard_body(_runs(8), NOW)
+        self.assertIn("T-8h*", far)
+        near = telegram_client.render_dashboard_body(_runs(0.5), NOW)
+        self.assertIn("T-30m", near)
+        self.assertNotIn("s*", near)
+
+    def test_failed_edit_falls_back_to_new_message(self):
+        r = telegram_client.DashboardRenderer(min_edit_interval=0)
+        r.push(_runs(8), now=NOW)
+        self.edit.return_value = False
+        self.assertEqual(r.push(_runs(2), now=NOW), "sent")
+
+    def test_bursts_are_coalesced(self):
+        r = telegram_client.DashboardRenderer(min_edit_interval=0.3)
+        r.push(_runs(8), now=NOW)  # Establish message; next push must wait 0.3s
+        for h in (7, 6, 5, 4):
+            r.submit(_runs(h))
+        deadline = time.time() + 3
+        while r.pushes < 2 and time.time() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.1)
+        self.assertEqual(r.pushes, 2)
+        self.assertIn("M0", self.edit.call_args.args[0])
+
+    def test_rate_limit_is_recorded(self):
+        resp = mock.Mock(status_code=429)
+        resp.json.return_value = {"parameters": {"retry_after": 30}}
+        telegram_client._note_rate_limit(resp)
+        self.addCleanup(setattr, telegram_client, "_rate_limited_until", 0.0)
+        self.assertGreater(telegram_client.rate_limit_remaining(), 25)
+
+if __name__ == '__main__':
+    unittest.main()
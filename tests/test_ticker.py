@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import clock
+from ticker import FixedRateTicker
+
+START = datetime(2026, 3, 1, 15, 0, tzinfo=timezone.utc)
+
+class TestFixedRateTicker(unittest.TestCase):
+    def setUp(self):
+        self.vc = clock.VirtualClock(START)
+        previous = clock.set_clock(self.vc)
+        self.addCleanup(clock.set_clock, previous)
+
+    def _offsets(self, ticks):
+        return [(t.started - START).total_seconds() for t in ticks]
+
+    def test_work_time_does_not_stretch_the_period(self):
+        ticks = []
+        for tick in FixedRateTicker(100, end=START + timedelta(seconds=350)):
+            ticks.append(tick)
+            self.vc.advance(30)  # Scan + dashboard time
+        self.assertEqual(self._offsets(ticks), [0, 100, 200, 300])
+        self.assertEqual(self.vc.now(), START + timedelta(seconds=350))  # Returns exactly at end
+
+    def test_skip_drops_missed_slots(self):
+        t = FixedRateTicker(100, end=START + timedelta(seconds=500), policy="skip")
+        ticks = []
+        for tick in t:
+            ticks.append(tick)
+            self.vc.advance(250 if tick.index == 0 else 1)
+        self.assertEqual(self._offsets(ticks), [0, 300, 400])
+        self.assertEqual(t.skipped, 2)
+        self.assertEqual(max(t.lags), 0)
+
+    def test_merge_runs_one_catch_up_tick(self):
+        t = FixedRateTicker(100, end=START + timedelta(seconds=500), policy="merge")
+        ticks = []
+        for tick in t:
+            ticks.append(tick)
+            self.vc.advance(250 if tick.index == 0 else 1)
+        self.assertEqual(self._offsets(ticks), [0, 250, 300, 400])
+        self.assertEqual((ticks[1].index, ticks[1].merged, ticks[1].lag_s), (2, 1, 50.0))
+        self.assertEqual(t.stats()["lag_s_max"], 50.0)
+
+    def test_no_tick_starts_after_end(self):
+        t = FixedRateTicker(100, end=START + timedelta(seconds=150), policy="merge")
+        ticks = []
+        for tick in t:
+            ticks.append(tick)
+            self.vc.advance(400)
+        self.assertEqual(len(ticks), 1)
+        self.assertEqual(self.vc.now(), START + timedelta(seconds=400))
+
+    def test_late_start_fires_immediately_on_the_grid(self):
+        self.vc.advance(130)
+        t = FixedRateTicker(100, end=START + timedelta(seconds=300), anchor=START)
+        ticks = list(t)
+        self.assertEqual(self._offsets(ticks), [130, 200])
+        self.assertEqual(ticks[0].lag_s, 30.0)
+
+if __name__ == '__main__':
+    unittest.main()
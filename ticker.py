@@ -0,0 +1,113 @@
+# ticker.py — Fixed-rate scan ticker for match sessions.
+# Single Responsibility: yield scan ticks on an absolute grid (anchor + k * interval)
+# up to a hard end time, so scan duration and dashboard work never stretch the
+# period. Ticks missed by an overrunning scan are skipped or merged into one
+# catch-up tick (never stacked), and every tick's lag behind its deadline is recorded.
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple
+
+import clock
+from latency_stats import percentile
+from config import SCAN_OVERRUN_POLICY
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("skip", "merge")
+
+
+class Tick(NamedTuple):
+    index: int          # Grid slot: deadline = anchor + index * interval
+    deadline: datetime
+    started: datetime
+    lag_s: float        # started - deadline
+    merged: int         # Missed slots folded into this tick (merge policy)
+
+
+class FixedRateTicker:
+    """
+    for tick in FixedRateTicker(120, end=run["end_time"]): scan()
+
+    The first tick fires immediately (the latest grid slot at or before now).
+    After each tick, if the work ran past the next deadline(s):
+      skip  — drop the missed slots and wait for the next future deadline;
+      merge — run one catch-up tick at once, then continue on the grid.
+    No tick starts at or after `end`, and iteration returns exactly at `end`.
+    """
+
+    def __init__(self, interval: float, end: datetime, anchor: datetime | None = None,
+                 policy: str = SCAN_OVERRUN_POLICY) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.interval = interval
+        self.end = end
+        self.anchor = anchor or clock.now()
+        self.policy = policy
+        self.ticks = 0
+        self.skipped = 0
+        self.merged = 0
+        self.lags: list[float] = []
+
+    def deadline(self, index: int) -> datetime:
+        return self.anchor + timedelta(seconds=index * self.interval)
+
+    def _slot_at(self, now: datetime) -> int:
+        """Latest grid slot whose deadline is <= now."""
+        return max(math.floor((now - self.anchor).total_seconds() / self.interval), 0)
+
+    def _last_missed(self, now: datetime) -> int:
+        """Latest grid slot whose deadline is strictly before now."""
+        return math.ceil((now - self.anchor).total_seconds() / self.interval) - 1
+
+    def _sleep_until(self, target: datetime) -> None:
+        remaining = (target - clock.now()).total_seconds()
+        if remaining > 0:
+            clock.sleep(remaining)
+
+    def __iter__(self) -> Iterator[Tick]:
+        index, merged = self._slot_at(clock.now()), 0
+        while True:
+            deadline = self.deadline(index)
+            if deadline >= self.end:
+                self._sleep_until(self.end)
+                return
+            self._sleep_until(deadline)
+            started = clock.now()
+            if started >= self.end:
+                return
+            lag = (started - deadline).total_seconds()
+            self.ticks += 1
+            self.lags.append(lag)
+            yield Tick(index, deadline, started, lag, merged)
+
+            # Work for this tick is done — place the next one on the grid
+            index, merged = index + 1, 0
+            now = clock.now()
+            behind = self._last_missed(now)
+            if behind >= index:
+                missed = behind - index + 1  # Slots index..behind are already past
+                overrun = (now - self.deadline(index)).total_seconds()
+                if self.policy == "skip":
+                    self.skipped += missed
+                    index = behind + 1
+                else:
+                    merged = missed - 1
+                    self.merged += merged
+                    index = behind
+                logger.warning("Scan overran the next %.0fs slot by %.1fs — %s %d tick(s).",
+                               self.interval, overrun, "skipped" if self.policy == "skip" else "merged", missed)
+
+    def stats(self) -> dict:
+        lags = sorted(self.lags)
+        return {
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "merged": self.merged,
+            "lag_s_p50": percentile(lags, 50),
+            "lag_s_p95": percentile(lags, 95),
+            "lag_s_max": percentile(lags, 100),
+        }
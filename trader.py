@@ -1,103 +1,206 @@
 # trader.py — Places CLOB market orders on Polymarket.
 # Single Responsibility: authenticate and submit one FOK order per call.
+# Orders go through a pluggable backend: LiveClobBackend, or paper_trading.py for
+# simulated fills (EXECUTION_BACKEND / MINUTEBID_EXECUTION_BACKEND="paper").
+# Live orders are spread across every configured wallet by order_router.py.
 # All credential reads from env vars; never hardcoded.
+# eth_account / py_clob_client take >1s to import (py_ecc pairing tables), so they
+# are imported lazily on the first order or by prewarm() — never at process start.
 
 import logging
 import os
-
-from eth_account import Account
-from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import ApiCreds, MarketOrderArgs, OrderType
+import threading
 
 _SIDE_BUY = "BUY"  # py-clob-client >=0.16: expects string 'BUY' or 'SELL'
 
-from config import CLOB_HOST, CLOB_CHAIN_ID
+import order_router
+from config import CLOB_CHAIN_ID, EXECUTION_BACKEND
 
 logger = logging.getLogger(__name__)
 
+_prewarm_lock = threading.Lock()
+_prewarmed = False
+
+
+def prewarm() -> None:
+    """
+    Import the crypto / CLOB stack ahead of the first order.
+    Safe to call from a background thread and more than once.
+    """
+    global _prewarmed
+    with _prewarm_lock:
+        if _prewarmed:
+            return
+        import eth_account  # noqa: F401
+        import py_clob_client.client  # noqa: F401
+        import py_clob_client.clob_types  # noqa: F401
+        _prewarmed = True
+    logger.info("Trader pre-warm complete (eth_account, py_clob_client loaded).")
+
 
 def log_credential_fingerprint() -> None:
-    """Log non-sensitive credential fingerprint so every order attempt is traceable in Fly logs."""
-    pk = os.getenv("CLOB_PK", "").strip()
-    api_key = os.getenv("CLOB_API_KEY", "").strip()
-    try:
-        address = Account.from_key(pk).address if pk else "MISSING"
-    except Exception as e:
-        address = f"INVALID({e})"
-    logger.info(
-        "CRED FINGERPRINT | wallet=%s | api_key_prefix=%s... | chain=%s",
-        address,
-        api_key[:8] if len(api_key) >= 8 else api_key,
-        CLOB_CHAIN_ID,
-    )
-
-
-def _build_client() -> ClobClient:
-    """Build an authenticated CLOB client from environment credentials."""
-    pk = os.getenv("CLOB_PK", "").strip()
-    api_key = os.getenv("CLOB_API_KEY", "").strip()
-    api_secret = os.getenv("CLOB_API_SECRET", "").strip()
-    api_passphrase = os.getenv("CLOB_API_PASSPHRASE", "").strip()
-
-    missing = [name for name, val in [
-        ("CLOB_PK", pk),
-        ("CLOB_API_KEY", api_key),
-        ("CLOB_API_SECRET", api_secret),
-        ("CLOB_API_PASSPHRASE", api_passphrase),
-    ] if not val]
-
-    if missing:
-        raise EnvironmentError(f"Missing CLOB credentials: {', '.join(missing)}")
-
-    return ClobClient(
-        host=CLOB_HOST,
-        chain_id=CLOB_CHAIN_ID,
-        key=pk,
-        creds=ApiCreds(
-            api_key=api_key,
-            api_secret=api_secret,
-            api_passphrase=api_passphrase,
-        ),
-    )
-
-
-def place_order(token_id: str, stake_usdc: float) -> dict:
+    """Log a non-sensitive fingerprint of every configured wallet so orders are traceable in Fly logs."""
+    wallets = order_router.load_credentials()
+    if not wallets:
+        logger.info("CRED FINGERPRINT | wallet=MISSING | chain=%s", CLOB_CHAIN_ID)
+    for name, creds in wallets.items():
+        wallet = order_router.Wallet(name, creds)
+        logger.info("CRED FINGERPRINT | wallet %s=%s | api_key_prefix=%s... | chain=%s",
+                    name, wallet.address, wallet.api_key_prefix, CLOB_CHAIN_ID)
+
+
+class LiveClobBackend:
+    """
+    Real Polymarket CLOB via py-clob-client. Orders are spread over every
+    configured credential set by order_router.OrderRouter (one warm client
+    and one rate limit per key).
     """
-    Place a Fill-or-Kill market order on the Polymarket CLOB.
+
+    name = "live"
+    requires_credentials = True
+
+    def __init__(self, router: "order_router.OrderRouter | None" = None) -> None:
+        self._router = router
+        self._router_lock = threading.Lock()
+
+    @property
+    def router(self) -> "order_router.OrderRouter":
+        """Built from the environment on first use (raises EnvironmentError without credentials)."""
+        with self._router_lock:
+            if self._router is None:
+                self._router = order_router.OrderRouter.from_env()
+                logger.info("Order router ready — %d wallet(s).", len(self._router.wallets))
+            return self._router
+
+    def wallet_names(self) -> list[str]:
+        try:
+            return self.router.names()
+        except EnvironmentError:
+            return []
+
+    def warm(self) -> int:
+        """Build every wallet's client ahead of the first order. Returns the wallet count."""
+        try:
+            wallets = list(self.router.wallets.values())
+        except EnvironmentError:
+            return 0
+        for leased in wallets:
+            leased.client()
+        return len(wallets)
+
+    def place_order(self, token_id: str, stake_usdc: float, wallet: str | None = None) -> dict:
+        from py_clob_client.clob_types import MarketOrderArgs, OrderType
+
+        with self.router.lease(wallet) as leased:
+            client = leased.client()
+            order = client.create_market_order(
+                MarketOrderArgs(
+                    token_id=token_id,
+                    amount=stake_usdc,
+                    side=_SIDE_BUY,
+                )
+            )
+            resp = client.post_order(order, OrderType.FOK)
+        logger.info("Order placed — wallet=%s (api_key %s...) token_id=%s stake=$%.2f response=%s",
+                    leased.name, leased.api_key_prefix, token_id, stake_usdc, resp)
+        return resp
+
+    def get_trades(self, after: int | None = None) -> list[dict]:
+        """Own trades since `after` (epoch seconds) across all wallets; py-clob-client follows next_cursor."""
+        from py_clob_client.clob_types import TradeParams
+
+        trades = []
+        for leased in self.router.wallets.values():
+            trades.extend(leased.client().get_trades(TradeParams(after=after)))
+        return trades
+
+
+# ---------------------------------------------------------------------------
+# Active execution backend — live CLOB by default, paper_trading on request
+# ---------------------------------------------------------------------------
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_name() -> str:
+    """Configured backend: MINUTEBID_EXECUTION_BACKEND env var, else config.EXECUTION_BACKEND."""
+    return (os.getenv("MINUTEBID_EXECUTION_BACKEND", "").strip() or EXECUTION_BACKEND).lower()
+
+
+def get_backend():
+    """The backend place_order() submits to (built from config on first use)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if backend_name() == "paper":
+                import paper_trading
+                _backend = paper_trading.from_config()
+                logger.warning("PAPER TRADING — orders are simulated, no USDC is spent.")
+            else:
+                _backend = LiveClobBackend()
+        return _backend
+
+
+def set_backend(backend):
+    """Install an execution backend (anything with place_order(token_id, stake_usdc)). Returns the previous one."""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    return previous
+
+
+def place_order(token_id: str, stake_usdc: float, wallet: str | None = None) -> dict:
+    """
+    Place a Fill-or-Kill market order through the active backend.
 
     Args:
         token_id:   CLOB token ID for the YES outcome (clobTokenIds[0]).
         stake_usdc: Amount in USDC to spend (e.g. 1.0 = $1.00).
+        wallet:     Wallet name from wallet_names() (RiskManager's assignment);
+                    None lets the backend choose.
 
     Returns:
-        Order response dict from py-clob-client (contains 'orderID', 'status').
+        Order response dict (contains 'orderID', 'status').
 
     Raises:
-        EnvironmentError: if any CLOB credential is missing.
+        EnvironmentError: if any CLOB credential is missing (live backend).
         Exception:        on network failure or order rejection.
     """
-    log_credential_fingerprint()
-    client = _build_client()
+    if wallet is None:
+        return get_backend().place_order(token_id, stake_usdc)
+    return get_backend().place_order(token_id, stake_usdc, wallet=wallet)
+
+
+def warm_clients() -> int:
+    """Build the active backend's CLOB clients now (after prewarm()), not on the first order."""
+    backend = get_backend()
+    return backend.warm() if hasattr(backend, "warm") else 0
 
-    order = client.create_market_order(
-        MarketOrderArgs(
-            token_id=token_id,
-            amount=stake_usdc,
-            side=_SIDE_BUY,
-        )
-    )
 
-    resp = client.post_order(order, OrderType.FOK)
-    logger.info("Order placed — token_id=%s stake=$%.2f response=%s", token_id, stake_usdc, resp)
-    return resp
+def wallet_names() -> list[str]:
+    """Wallets the active backend routes orders over, least loaded first ([] = single account)."""
+    backend = get_backend()
+    return backend.wallet_names() if hasattr(backend, "wallet_names") else []
+
+
+def get_trades(after: int | None = None) -> list[dict]:
+    """
+    Trades the active backend has filled since `after` (epoch seconds), in the
+    CLOB /data/trades shape (taker_order_id, asset_id, size, price, status).
+    Used by bet_ledger.Reconciler; backends without a trade history return [].
+    """
+    backend = get_backend()
+    if not hasattr(backend, "get_trades"):
+        return []
+    return backend.get_trades(after)
 
 
 def is_credentials_configured() -> bool:
     """
-    Returns True if all four CLOB env vars are present.
+    Returns True if at least one complete CLOB credential set is present, or
+    if the active backend needs none (paper trading).
     Used by main.py to decide whether to attempt betting.
     """
-    return all(
-        os.getenv(k, "").strip()
-        for k in ("CLOB_PK", "CLOB_API_KEY", "CLOB_API_SECRET", "CLOB_API_PASSPHRASE")
-    )
+    if not getattr(get_backend(), "requires_credentials", True):
+        return True
+    return bool(order_router.load_credentials())